@@ -82,18 +82,34 @@ class NonStandardEncoder(json.JSONEncoder):
     """
 
     def default(self, obj):
-        if isinstance(obj, (np.int_, np.intc, np.intp, np.int8,
-                            np.int16, np.int32, np.int64, np.uint8,
-                            np.uint16, np.uint32, np.uint64)):
+        if isinstance(obj, np.integer):
             return int(obj)
-        elif isinstance(obj, (np.float_, np.float16, np.float32,
-                              np.float64)):
+        elif isinstance(obj, np.floating):
             return float(obj)
+        elif isinstance(obj, np.bool_):
+            return bool(obj)
         elif isinstance(obj, (np.ndarray,)):
             return obj.tolist()
         return json.JSONEncoder.default(self, obj)
 
 
+def format_size(size) -> str:
+    """
+    Formats a number of bytes in human readable units.
+
+    Examples
+    --------
+    >>> format_size(3 * 1024 ** 3)
+    '3.0 GB'
+    """
+    size, unit = float(size), "B"
+    for unit in ["B", "KB", "MB", "GB", "TB", "PB"]:
+        if size < 1024 or unit == "PB":
+            break
+        size /= 1024
+    return "%.1f %s" % (size, unit)
+
+
 def write_ini(dictionary, file):
     """
     Writes a ``.ini`` file (``toml`` without the usual `"` marks around the strings). The ``dictionary`` should be a
@@ -0,0 +1,230 @@
+"""
+============
+Disk Usage
+============
+Cached accounting of the disk usage (bytes and inodes) of the output directories of the simulations in a
+``SimulationLog``. The usage of every directory in each tree is stored next to the simulation log (``<log>.usage``)
+along with the directory's modification time, so that refreshing a tree only has to ``stat`` its directories and
+list again the ones which changed, instead of every file as ``du`` would.
+
+Notes
+-----
+A directory's modification time changes when entries are added to, removed from or renamed within it, but not when an
+existing file is rewritten in place. Files which grow without any change to their directory are only accounted for
+after a forced refresh.
+"""
+import json
+import logging
+import os
+import pathlib as pt
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from PyHPC.PyHPC_Core.configuration import read_config
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Disk Usage Index =================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+class DiskUsageIndex:
+    """
+    Index of the disk usage of a set of directory trees.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log. The index is stored at ``<path>.usage``.
+
+    Notes
+    -----
+    The index has the form
+
+    .. code-block:: python
+
+        {"trees": {"<root>": {"bytes": int, "inodes": int}},
+         "directories": {"<directory>": {"mtime_ns": int, "bytes": int, "inodes": int, "subdirectories": [...]}}}
+
+    where the ``directories`` entries hold the usage of the files directly within each directory (and the directory
+    itself) and the ``trees`` entries the totals of each refreshed root directory.
+    """
+
+    def __init__(self, path):
+        #: The path to the index file.
+        self.path = pt.Path(path).with_name(pt.Path(path).name + ".usage")
+        self._data = None
+
+    def __repr__(self):
+        return "DiskUsageIndex @ %s" % self.path
+
+    def __contains__(self, directory):
+        return str(directory) in self.data["trees"]
+
+    @property
+    def data(self) -> dict:
+        """The raw index data (read from disk on first access)."""
+        if self._data is None:
+            try:
+                with open(self.path, "r") as index_file:
+                    self._data = json.load(index_file)
+            except FileNotFoundError:
+                self._data = {"trees": {}, "directories": {}}
+            except json.JSONDecodeError:
+                modlog.warning("Failed to read the disk usage index %s. It will be rebuilt." % self.path)
+                self._data = {"trees": {}, "directories": {}}
+        return self._data
+
+    def save(self):
+        """
+        Writes the index to disk.
+
+        Returns
+        -------
+        None
+        """
+        temp_path = self.path.with_name(".%s.tmp" % self.path.name)
+        with open(temp_path, "w") as index_file:
+            json.dump(self.data, index_file)
+        os.replace(temp_path, self.path)
+
+    def refresh(self, directories, force=False) -> list:
+        """
+        Updates the usage of each of the ``directories`` (and their sub-directories). Every directory in the trees is
+        checked, but only those whose modification time has changed since they were last indexed (or all of them if
+        ``force=True``) are listed again. The index is saved if anything changed.
+
+        Parameters
+        ----------
+        directories : list of str
+            The root directories to refresh.
+        force : bool
+            If ``True``, every directory is listed again.
+
+        Returns
+        -------
+        list of str
+            The root directories whose usage changed.
+        """
+        roots = [str(directory) for directory in directories]
+        cached = self.data["directories"]
+        workers = CONFIG["Computation"]["Parallel"]["max_thread_workers"] if CONFIG["Computation"]["Parallel"][
+            "threading"] else 1
+
+        #  Checking the trees level by level
+        # ------------------------------------------------------------------------------------------------------------ #
+        visited, updated, level = {}, 0, list(dict.fromkeys(roots))
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            while len(level):
+                entries = list(executor.map(lambda directory: self._scan(directory, force), level))
+                next_level = []
+                for directory, entry in zip(level, entries):
+                    if entry is None:
+                        continue  # -> doesn't exist.
+                    if entry is not cached.get(directory):
+                        updated += 1
+                    visited[directory] = entry
+                    next_level += [os.path.join(directory, name) for name in entry["subdirectories"]]
+                level = next_level
+
+        #  Updating the index
+        # ------------------------------------------------------------------------------------------------------------ #
+        # - Dropping the directories of the trees which no longer exist -#
+        prefixes = tuple(root + os.sep for root in roots)
+        for directory in [d for d in cached if (d in roots or d.startswith(prefixes)) and d not in visited]:
+            del cached[directory]
+            updated += 1
+        cached.update(visited)
+
+        changed = []
+        for root in roots:
+            total = self._total(root) if root in visited else None
+            if self.data["trees"].get(root) != total:
+                changed.append(root)
+                if total is None:
+                    self.data["trees"].pop(root, None)
+                else:
+                    self.data["trees"][root] = total
+
+        modlog.debug("Refreshed %s trees (%s directories) in %s; %s changed." % (
+            len(roots), len(visited), self, len(changed)))
+        if updated or len(changed):
+            self.save()
+        return changed
+
+    def _scan(self, directory, force=False):
+        """Produces the entry of ``directory``, reusing its cached entry if it is up to date. ``None`` if missing."""
+        current = self.data["directories"].get(directory)
+
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        if not force and current is not None and current["mtime_ns"] == mtime_ns:
+            return current
+
+        size, inodes, subdirectories = 0, 1, []
+        with os.scandir(directory) as scanner:
+            for entry in scanner:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.name)
+                    else:
+                        size += entry.stat(follow_symlinks=False).st_size
+                        inodes += 1
+                except OSError:
+                    modlog.debug("Failed to stat %s." % entry.path)
+
+        return {"mtime_ns": mtime_ns, "bytes": size, "inodes": inodes, "subdirectories": sorted(subdirectories)}
+
+    def _total(self, directory) -> dict:
+        """Sums the usage of the tree at ``directory`` from the indexed directories."""
+        total, stack = {"bytes": 0, "inodes": 0}, [directory]
+        while len(stack):
+            current = stack.pop()
+            entry = self.data["directories"].get(current)
+            if entry is None:
+                continue
+            total["bytes"] += entry["bytes"]
+            total["inodes"] += entry["inodes"]
+            stack += [os.path.join(current, name) for name in entry["subdirectories"]]
+        return total
+
+    def total(self, directories) -> tuple:
+        """
+        The total usage of the trees at ``directories`` when they were last refreshed.
+
+        Returns
+        -------
+        tuple of int or None
+            The ``(bytes, inodes)`` of the indexed trees, or ``None`` if none of them are indexed.
+        """
+        usages = [usage for usage in (self.usage(directory) for directory in directories) if usage is not None]
+        if not len(usages):
+            return None
+        return sum(usage[0] for usage in usages), sum(usage[1] for usage in usages)
+
+    def usage(self, directory) -> tuple:
+        """
+        The usage of the tree at ``directory`` when it was last refreshed.
+
+        Returns
+        -------
+        tuple of int or None
+            The ``(bytes, inodes)`` of the tree, or ``None`` if the tree isn't indexed (or didn't exist).
+        """
+        total = self.data["trees"].get(str(directory))
+        return (total["bytes"], total["inodes"]) if total is not None else None
+
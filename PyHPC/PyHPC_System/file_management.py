@@ -16,8 +16,9 @@ from PyHPC.PyHPC_Utils.remote_utils import rclone_listdir
 import pathlib as pt
 import threading as t
 import warnings
-from PyHPC.PyHPC_Core.utils import time_function
+from PyHPC.PyHPC_Core.utils import format_size, time_function
 import json
+from concurrent.futures import ThreadPoolExecutor
 from time import perf_counter
 import numpy as np
 from colorama import Fore, Style
@@ -425,6 +426,143 @@ def mt_get_item_from_rclone(location_path,
     screen_lock.release()
 
 
+#  IO Operations - deletion
+# ----------------------------------------------------------------------------------------------------------------- #
+class DeletionReport:
+    """
+    Accounting of the files and directories removed by ``delete_paths`` (or which would be removed in a dry run).
+
+    Parameters
+    ----------
+    dry_run : bool
+        ``True`` if nothing was actually removed.
+    """
+
+    def __init__(self, dry_run=False):
+        #: ``True`` if nothing was actually removed.
+        self.dry_run = dry_run
+        #: The number of files (and links) removed.
+        self.files = 0
+        #: The number of directories removed.
+        self.directories = 0
+        #: The total size of the removed files in bytes.
+        self.bytes = 0
+        #: The paths which didn't exist.
+        self.missing = []
+        #: The ``(path, message)`` pairs of the items which couldn't be removed.
+        self.errors = []
+
+    def __repr__(self):
+        return "DeletionReport(dry_run=%s, files=%s, directories=%s, bytes=%s, errors=%s)" % (
+            self.dry_run, self.files, self.directories, self.bytes, len(self.errors))
+
+    def __str__(self):
+        return "%s %s files and %s directories (%s)%s." % (
+            "Would delete" if self.dry_run else "Deleted", self.files, self.directories, format_size(self.bytes),
+            "; %s failed" % len(self.errors) if len(self.errors) else "")
+
+
+def _clear_directory(directory, dry_run=False):
+    """
+    Removes the files of ``directory`` (not its sub-directories). Returns the number and total size of the files, the
+    sub-directories and the errors.
+    """
+    files, size, subdirectories, errors = 0, 0, [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                        continue
+
+                    size += entry.stat(follow_symlinks=False).st_size
+                    if not dry_run:
+                        os.unlink(entry.path)
+                    files += 1
+                except OSError as error:
+                    errors.append((entry.path, str(error)))
+    except OSError as error:
+        errors.append((directory, str(error)))
+
+    return files, size, subdirectories, errors
+
+
+def delete_paths(paths, dry_run=False, max_workers=None):
+    """
+    Deletes the files and directory trees at ``paths``. The trees are traversed level by level with ``os.scandir`` and
+    the files of each level are removed by a bounded pool of threads.
+
+    Parameters
+    ----------
+    paths : list of str
+        The files and directories to delete. Paths within another of the ``paths`` are only deleted once.
+    dry_run : bool
+        If ``True``, nothing is removed and the report accounts for what would be.
+    max_workers : int, optional
+        The maximum number of threads. Defaults to ``CONFIG["Computation"]["Parallel"]["max_thread_workers"]`` if
+        threading is enabled and ``1`` otherwise.
+
+    Returns
+    -------
+    DeletionReport
+        The number and size of the files and the number of directories removed.
+    """
+    if max_workers is None:
+        max_workers = CONFIG["Computation"]["Parallel"]["max_thread_workers"] if CONFIG["Computation"]["Parallel"][
+            "threading"] else 1
+
+    report = DeletionReport(dry_run=dry_run)
+
+    #  Sorting the paths
+    # ----------------------------------------------------------------------------------------------------------------- #
+    level, roots = [], []
+    # - Sorted by component so that each tree is contiguous. -#
+    for path in sorted(set(os.path.abspath(path) for path in paths), key=lambda path: path.split(os.sep)):
+        if len(roots) and path.startswith(roots[-1] + os.sep):
+            continue  # -> already removed with its parent.
+
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                level.append(path)
+                roots.append(path)
+            else:
+                report.bytes += os.lstat(path).st_size
+                if not dry_run:
+                    os.unlink(path)
+                report.files += 1
+        except FileNotFoundError:
+            report.missing.append(path)
+        except OSError as error:
+            report.errors.append((path, str(error)))
+
+    #  Removing the trees
+    # ----------------------------------------------------------------------------------------------------------------- #
+    directories = []
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        while len(level):
+            directories += level
+            next_level = []
+            for files, size, subdirectories, errors in executor.map(lambda d: _clear_directory(d, dry_run), level):
+                report.files += files
+                report.bytes += size
+                report.errors += errors
+                next_level += subdirectories
+            level = next_level
+
+    # - The directories are now empty and are removed deepest first. -#
+    for directory in reversed(directories):
+        try:
+            if not dry_run:
+                os.rmdir(directory)
+            report.directories += 1
+        except OSError as error:
+            report.errors.append((directory, str(error)))
+
+    modlog.info("%s (%s paths, %s missing)" % (report, len(paths), len(report.missing)))
+    return report
+
+
 if __name__ == '__main__':
     print(get_remote_location(os.path.join(CONFIG["System"]["Directories"]["figures_directory"], "Fig1")))
     print(get_local_location("PyHPC/Analyses/Figures/Fig1.png"))
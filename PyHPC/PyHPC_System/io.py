@@ -1,15 +1,18 @@
 import os
 import pathlib as pt
+import subprocess
 import sys
 
 sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
-import json
 import logging
 from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
 import threading as t
 import warnings
 import toml
 from PyHPC.PyHPC_Utils.text_display_utilities import get_options
+from PyHPC.PyHPC_System.software import get_ramses_software
+from PyHPC.PyHPC_System.job_status import record_submission
 from datetime import datetime
 
 # generating screen locking #
@@ -78,8 +81,35 @@ def write_command_string(command: str, *args, **kwargs) -> str:
 # -------------------------------------------------------------------------------------------------------------------- #
 #  Batch Management ================================================================================================== #
 # -------------------------------------------------------------------------------------------------------------------- #
-def write_slurm_file(command_string, slurm_config=None, name=None, **kwargs):
+def write_slurm_file(command_string, slurm_config=None, name=None, array=None, **kwargs):
+    """
+    Writes a SLURM batch script to ``<slurm_directory>/<name>.SLURM`` from the template ``command_string``.
+
+    Parameters
+    ----------
+    command_string : str
+        The template of the script. ``%(batch_options)s`` is replaced with the ``#SBATCH`` lines and the other fields
+        with the ``kwargs``.
+    slurm_config : dict, optional
+        The SLURM settings. If not specified, the user is queried for them, starting from ``SLURM.config``.
+    name : str, optional
+        The name of the script.
+    array : str or list of int, optional
+        If specified, the script is submitted as a job array with these task ids (e.g. ``"0-9%4"`` or
+        ``[0, 1, 2, 7]``, see ``format_array_spec``). Each task writes its own ``.out`` and ``.err`` files.
+    kwargs : optional
+        The fields of the template.
 
+    Returns
+    -------
+    None
+        ``False`` if the default SLURM configuration couldn't be read.
+
+    Notes
+    -----
+    The ``--array`` option given to ``sbatch`` overrides the one in the script, so that individual tasks of an array
+    can be resubmitted with ``sbatch --array=<ids> <script>``.
+    """
     #  Intro Debugging
     # ----------------------------------------------------------------------------------------------------------------- #
     modlog.debug("Writing slurm file with name parameter %s." % name)
@@ -125,6 +155,10 @@ def write_slurm_file(command_string, slurm_config=None, name=None, **kwargs):
     path = os.path.join(CONFIG["System"]["Directories"]["SLURM_output_directory"], pt.Path(filename).stem,
                         slurm_config["files"]["format"]["v"] % {"name": name,
                                                                 "date": date})
+    if array is not None:
+        slurm_script += "#SBATCH --array=%s\n" % (array if isinstance(array, str) else format_array_spec(array))
+        path += "_%a"  # -> the array task id.
+
     slurm_script += "#SBATCH -o %s.out\n" % path
     slurm_script += "#SBATCH -e %s.err" % path
 
@@ -154,6 +188,285 @@ def write_slurm_file(command_string, slurm_config=None, name=None, **kwargs):
     return None
 
 
+def chunk_ranges(count: int, chunk_size: int) -> list:
+    """
+    Splits ``count`` items into contiguous chunks of at most ``chunk_size`` items (e.g. the snapshots imaged by each
+    task of a job array).
+
+    Parameters
+    ----------
+    count : int
+        The number of items.
+    chunk_size : int
+        The maximum number of items in each chunk.
+
+    Returns
+    -------
+    list of tuple
+        The ``(start, stop)`` indices of each chunk.
+
+    Examples
+    --------
+    >>> chunk_ranges(10, 4)
+    [(0, 4), (4, 8), (8, 10)]
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be at least 1, not %s." % chunk_size)
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def format_array_spec(task_ids, max_concurrent=None) -> str:
+    """
+    Writes the ``--array`` specification of the job array tasks ``task_ids``, with runs of consecutive ids as ranges.
+
+    Parameters
+    ----------
+    task_ids : list of int
+        The task ids.
+    max_concurrent : int, optional
+        The maximum number of tasks to run at once.
+
+    Returns
+    -------
+    str
+        The specification.
+
+    Examples
+    --------
+    >>> format_array_spec([0, 1, 2, 3, 7, 9, 10])
+    '0-3,7,9-10'
+    >>> format_array_spec(range(20), max_concurrent=4)
+    '0-19%4'
+    """
+    task_ids = sorted(set(int(task_id) for task_id in task_ids))
+    if not len(task_ids):
+        raise ValueError("A job array needs at least one task.")
+
+    runs = [[task_ids[0], task_ids[0]]]
+    for task_id in task_ids[1:]:
+        if task_id == runs[-1][1] + 1:
+            runs[-1][1] = task_id
+        else:
+            runs.append([task_id, task_id])
+
+    spec = ",".join("%s" % start if start == stop else "%s-%s" % (start, stop) for start, stop in runs)
+    return spec + ("%%%s" % max_concurrent if max_concurrent else "")
+
+
+def parse_array_spec(spec: str) -> list:
+    """
+    Reads the task ids of an ``--array`` specification.
+
+    Parameters
+    ----------
+    spec : str
+        The specification (ranges, single ids and ``start-stop:step`` ranges separated by commas, with an optional
+        ``%<max concurrent>`` suffix).
+
+    Returns
+    -------
+    list of int
+        The sorted task ids.
+
+    Examples
+    --------
+    >>> parse_array_spec("0-3,7,9-13:2%4")
+    [0, 1, 2, 3, 7, 9, 11, 13]
+    """
+    task_ids = set()
+    for part in spec.split("%")[0].split(","):
+        bounds, _, step = part.partition(":")
+        start, _, stop = bounds.partition("-")
+        task_ids.update(range(int(start), int(stop or start) + 1, int(step or 1)))
+    return sorted(task_ids)
+
+
+def incomplete_array_tasks(marker_directory, task_count: int) -> list:
+    """
+    Finds the tasks of a job array which haven't completed, i.e. which haven't written their ``<task id>.done``
+    marker to ``marker_directory``.
+
+    Parameters
+    ----------
+    marker_directory : str
+        The directory of the completion markers.
+    task_count : int
+        The number of tasks in the array (with ids ``0`` to ``task_count - 1``).
+
+    Returns
+    -------
+    list of int
+        The ids of the incomplete tasks.
+    """
+    try:
+        markers = set(os.listdir(marker_directory))
+    except FileNotFoundError:
+        markers = set()
+    return [task_id for task_id in range(task_count) if "%s.done" % task_id not in markers]
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#  Job Submission ==================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def submit_job(slurm_file, after=None, dependency="afterok", array=None, record=None, object_rec=None,
+               stage=None) -> str:
+    """
+    Submits a SLURM script with ``sbatch --parsable`` and returns its job id.
+
+    Parameters
+    ----------
+    slurm_file : str
+        The SLURM script.
+    after : list of str, optional
+        The job ids the job depends on.
+    dependency : str
+        The type of the dependency on the jobs of ``after`` (``afterok`` to only start once they have all completed
+        successfully, ``afterany`` to start once they have ended, etc.).
+    array : str or list of int, optional
+        The tasks to submit if the script is a job array (see ``format_array_spec``).
+    record : InitCon or SimRec, optional
+        The simulation log record to log the submission (``SLURM-RUN``, with its ``job_id``) to.
+    object_rec : str, optional
+        The output of ``record`` the job produces or works on.
+    stage : str, optional
+        The stage of the pipeline the job runs (``ramses``, ``image``, etc.), logged with the submission. The state of
+        the ``ramses`` jobs is synced into the simulation log (see ``PyHPC_System.job_status``).
+
+    Returns
+    -------
+    str
+        The job id.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        ramses_job = submit_job("run.SLURM", record=nml_log, object_rec=output_directory, stage="ramses")
+        image_job = submit_job("images.SLURM", after=[ramses_job])
+    """
+    command = ["sbatch", "--parsable"]
+    if after:
+        command.append("--dependency=%s:%s" % (dependency, ":".join(str(job_id) for job_id in after)))
+    if array is not None:
+        command.append("--array=%s" % (array if isinstance(array, str) else format_array_spec(array)))
+    command.append(str(slurm_file))
+
+    modlog.debug("Submitting %s." % " ".join(command))
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise PyHPC_Error("Failed to submit %s: sbatch was not found." % slurm_file)
+    if result.returncode != 0:
+        raise PyHPC_Error("Failed to submit %s: %s" % (slurm_file, result.stderr.strip()))
+
+    job_id = result.stdout.strip().split(";")[0]  # -> <job id>[;<cluster>].
+    modlog.debug("Submitted %s as job %s." % (slurm_file, job_id))
+
+    if record is not None:
+        kwargs = {"object_rec": object_rec} if object_rec is not None else {}
+        if after:
+            kwargs["dependency"] = "%s:%s" % (dependency, ":".join(str(job_id) for job_id in after))
+        if stage is not None:
+            kwargs["stage"] = stage
+        record.log("Submitted %s as job %s." % (slurm_file, job_id), "SLURM-RUN", job_id=job_id, **kwargs)
+        record_submission(record, job_id, stage, object_rec=object_rec)
+    return job_id
+
+
+class JobChain:
+    """
+    A pipeline of SLURM jobs (e.g. initial conditions -> RAMSES -> imaging -> animation) submitted at once, each stage
+    depending on the stages before it.
+
+    Parameters
+    ----------
+    dependency : str
+        The type of the dependencies between the stages (see ``submit_job``).
+
+    Examples
+    --------
+    .. code-block:: python
+
+        chain = JobChain()
+        chain.add("ic", "clustep.SLURM", record=simlog.ics[ic])
+        chain.add("ramses", "run.SLURM", record=nml_log, object_rec=output_directory)
+        chain.add("images", "images.SLURM")
+        chain.add("movie", "movie.SLURM")
+        job_ids = chain.submit()  # -> {"ic": "1001", "ramses": "1002", ...}
+    """
+
+    def __init__(self, dependency="afterok"):
+        #: The type of the dependencies between the stages.
+        self.dependency = dependency
+        #: The stages, in the order they are submitted.
+        self.stages = {}
+        #: The job ids of the submitted stages.
+        self.job_ids = {}
+
+    def __repr__(self):
+        return "<JobChain %s>" % " -> ".join(self.stages.keys())
+
+    def add(self, name: str, slurm_file, after=None, array=None, record=None, object_rec=None, stage=None):
+        """
+        Adds a stage to the chain.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        slurm_file : str
+            The SLURM script of the stage.
+        after : list of str, optional
+            The names of the stages this stage depends on. Defaults to the previous stage, so that stages added one
+            after the other form a chain. ``[]`` for a stage which doesn't depend on any other.
+        array, record, object_rec : optional
+            See ``submit_job``.
+        stage : str, optional
+            The stage of the pipeline the job runs (see ``submit_job``). Defaults to ``name``.
+
+        Returns
+        -------
+        None
+        """
+        if name in self.stages:
+            raise PyHPC_Error("The chain %s already has a stage %s." % (self, name))
+        if after is None:
+            after = list(self.stages.keys())[-1:]
+        for previous in after:
+            if previous not in self.stages:
+                raise PyHPC_Error("The stage %s depends on %s, which isn't an earlier stage of %s." % (
+                    name, previous, self))
+
+        self.stages[name] = {"slurm_file": slurm_file, "after": list(after), "array": array, "record": record,
+                             "object_rec": object_rec, "stage": stage if stage is not None else name}
+
+    def submit(self) -> dict:
+        """
+        Submits the stages which haven't been submitted yet, in order.
+
+        Returns
+        -------
+        dict
+            The job id of each stage.
+
+        Notes
+        -----
+        If a submission fails, the stages already submitted keep their job ids (in ``job_ids``) and stay queued, so
+        that calling ``submit`` again only submits the rest of the chain.
+        """
+        for name, stage in self.stages.items():
+            if name in self.job_ids:
+                continue
+            self.job_ids[name] = submit_job(stage["slurm_file"],
+                                            after=[self.job_ids[dependency] for dependency in stage["after"]],
+                                            dependency=self.dependency,
+                                            array=stage["array"],
+                                            record=stage["record"],
+                                            object_rec=stage["object_rec"],
+                                            stage=stage["stage"])
+        return dict(self.job_ids)
+
+
 # -------------------------------------------------------------------------------------------------------------------- #
 # Configuration Management =========================================================================================== #
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -167,24 +480,12 @@ def write_ramses_nml(settings: dict, output_location: str) -> bool:
     # ----------------------------------------------------------------------------------------------------------------- #
     software, ic_file, mem_mode = settings["META"]["software"]["v"], settings["META"]["ic_file"]["v"], \
                                   settings["META"]["Memory"]["mode"]["v"]
-    print(ic_file)
     modlog.debug("software=%s, ic_file=%s, mem_mode=%s." % (software, ic_file, mem_mode))
 
-    with open(os.path.join(pt.Path(__file__).parents[1], "bin", "lib", "imp", "types.json"), "r") as type_file:
-        types = json.load(type_file)
-
     #  Software system work
     # ----------------------------------------------------------------------------------------------------------------- #
-    if software not in types["software"]["RAMSES"]:
-        raise ValueError("The software %s does not match any of the implemented softwares!" % software)
-
-    # - Managing locations
-    for k, v in types["software"]["RAMSES"][software]["header_control"].items():
-        settings[k]["enabled"]["v"] = v
-        modlog.debug("Enabled %s" % k if v else "Disabled %s" % k)
-
-    # - managing the IC location -#
-    exec(types["software"]["RAMSES"][software]["ic_exec"])
+    # - Managing the headers and the IC location (see PyHPC_System.software) -#
+    get_ramses_software(software).apply(settings, ic_file)
 
     # - managing the memory type -#
     for setting in ["ngrid", "npart"]:
@@ -0,0 +1,329 @@
+"""
+==========
+Job Status
+==========
+Syncs the states of the SLURM jobs recorded in a ``SimulationLog`` into the ``meta`` of the simulations and outputs
+they run. Only the jobs which produce the records (the ``ramses`` stage) are tracked, so that the jobs which work on an
+output afterwards (imaging, etc.) don't replace the state of its run. They are written to ``meta.job_id`` (and
+``meta.job_stage``) when they are submitted (see ``record_submission`` and ``PyHPC_System.io.submit_job``), so that
+the jobs to sync are found without reading the action logs.
+
+The states of all of the jobs are fetched together: a single ``squeue`` call for every job which is still queued, and a
+single ``sacct --parsable2`` call for the ones which have left the queue, however many jobs there are. The results are
+cached for ``CONFIG["System"]["SLURM"]["status_ttl"]`` seconds, and jobs which have reached a final state
+(``COMPLETED``, ``FAILED``, ``TIMEOUT``, etc.) aren't polled again.
+
+Each synced record has ``meta.job_id`` and ``meta.job_state``, and each change of state is logged (``SLURM-STATE``).
+"""
+import logging
+import pathlib as pt
+import subprocess
+import time
+import warnings
+from datetime import datetime
+
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+#: The stage of the jobs which produce the simulations and their outputs (the ``stage`` of their ``SLURM-RUN`` entries).
+producing_stage = "ramses"
+
+#: The states a job doesn't leave.
+final_states = frozenset(["COMPLETED", "FAILED", "TIMEOUT", "CANCELLED", "OUT_OF_MEMORY", "NODE_FAIL", "PREEMPTED",
+                          "BOOT_FAIL", "DEADLINE"])
+
+#: The order in which the states of the tasks of a job array take precedence for the state of the whole array.
+_array_precedence = ["RUNNING", "COMPLETING", "CONFIGURING", "PENDING", "REQUEUED", "SUSPENDED", "FAILED", "TIMEOUT",
+                     "OUT_OF_MEMORY", "NODE_FAIL", "BOOT_FAIL", "DEADLINE", "PREEMPTED", "CANCELLED", "COMPLETED"]
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sub Functions ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def _expand_job_id(job_id: str) -> list:
+    """
+    Expands the id of a pending job array (``123_[0-3,7%2]``) to the ids of its tasks.
+
+    Examples
+    --------
+    >>> _expand_job_id("123_[0-2,7%2]")
+    ['123_0', '123_1', '123_2', '123_7']
+    >>> _expand_job_id("124")
+    ['124']
+    """
+    if not job_id.endswith("]") or "_[" not in job_id:
+        return [job_id]
+
+    base, spec = job_id[:-1].split("_[", 1)
+    task_ids = []
+    for part in spec.split("%")[0].split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            task_ids += list(range(int(first), int(last) + 1))
+        elif part:
+            task_ids.append(int(part))
+    return ["%s_%s" % (base, task_id) for task_id in task_ids]
+
+
+def _combine_states(states: list) -> str:
+    """The state of a job array from the states of its tasks (see ``_array_precedence``)."""
+    return min(states, key=lambda state: _array_precedence.index(state) if state in _array_precedence else
+               len(_array_precedence) - 1)
+
+
+def parse_states(output: str, job_ids) -> dict:
+    """
+    Parses the ``<job id>|<state>`` lines written by ``squeue`` or ``sacct``.
+
+    Parameters
+    ----------
+    output : str
+        The output of the command.
+    job_ids : list of str
+        The job ids to find the states of. The id of a job array (``123``) gets the combined state of its tasks.
+
+    Returns
+    -------
+    dict
+        The state of each job of ``job_ids`` which was found.
+
+    Examples
+    --------
+    >>> parse_states("101|RUNNING\\n102_0|COMPLETED\\n102_[1-2]|PENDING\\n103|CANCELLED by 1000", ["101", "102", "103"])
+    {'101': 'RUNNING', '102': 'PENDING', '103': 'CANCELLED'}
+    """
+    rows, arrays = {}, {}
+    for line in output.splitlines():
+        if "|" not in line:
+            continue
+        job_id, state = line.split("|")[:2]
+        if "." in job_id or not state.strip():  # -> the steps of a job (123.batch, etc.).
+            continue
+
+        state = state.split()[0]  # -> "CANCELLED by <uid>".
+        for task_id in _expand_job_id(job_id.strip()):
+            rows[task_id] = state
+            if "_" in task_id:
+                arrays.setdefault(task_id.split("_")[0], []).append(state)
+
+    states = {}
+    for job_id in job_ids:
+        if job_id in rows:
+            states[job_id] = rows[job_id]
+        elif job_id in arrays:
+            states[job_id] = _combine_states(arrays[job_id])
+    return states
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Polling ============================================================================================================ #
+# -------------------------------------------------------------------------------------------------------------------- #
+class JobStatusPoller:
+    """
+    Fetches the states of SLURM jobs in batches and caches them.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        The time (in seconds) the states are cached for. Defaults to ``CONFIG["System"]["SLURM"]["status_ttl"]``.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        poller = JobStatusPoller()
+        poller.poll(["1001", "1002", "1003_4"])  # -> {"1001": "COMPLETED", "1002": "RUNNING", "1003_4": "PENDING"}
+    """
+
+    def __init__(self, ttl=None):
+        #: The time (in seconds) the states are cached for.
+        self.ttl = ttl if ttl is not None else CONFIG["System"]["SLURM"]["status_ttl"]
+        self._states = {}  # -> job id -> (state, time fetched).
+
+    def __repr__(self):
+        return "<JobStatusPoller ttl=%s, %s cached>" % (self.ttl, len(self._states))
+
+    def poll(self, job_ids) -> dict:
+        """
+        Fetches the states of jobs. The ones which aren't cached (or whose cached state has expired) are fetched with
+        one ``squeue`` call and, for those which have left the queue, one ``sacct`` call.
+
+        Parameters
+        ----------
+        job_ids : list of str
+            The job ids.
+
+        Returns
+        -------
+        dict
+            The state of each job which was found.
+        """
+        job_ids = [str(job_id) for job_id in job_ids]
+        now = time.monotonic()
+        stale = [job_id for job_id in dict.fromkeys(job_ids)
+                 if job_id not in self._states or now - self._states[job_id][1] > self.ttl]
+
+        if len(stale):
+            modlog.debug("Fetching the states of %s jobs (%s cached)." % (len(stale), len(job_ids) - len(stale)))
+            states = parse_states(self._query(["squeue", "--noheader", "--array", "--format=%i|%T"], stale), stale)
+
+            missing = [job_id for job_id in stale if job_id not in states]
+            if len(missing):
+                states.update(parse_states(self._query(["sacct", "--parsable2", "--noheader", "--allocations",
+                                                        "--format=JobID,State"], missing), missing))
+
+            for job_id, state in states.items():
+                self._states[job_id] = (state, now)
+
+        return {job_id: self._states[job_id][0] for job_id in job_ids if job_id in self._states}
+
+    def invalidate(self):
+        """Drops the cached states."""
+        self._states = {}
+
+    @staticmethod
+    def _query(command: list, job_ids: list) -> str:
+        """Runs ``command`` for ``job_ids`` and returns its output (empty if it failed)."""
+        command = command + ["--jobs=%s" % ",".join(job_ids)]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True)
+        except FileNotFoundError:
+            raise PyHPC_Error("Failed to fetch the job states: %s was not found." % command[0])
+
+        if result.returncode != 0:
+            # - squeue fails if none of the jobs are still known to it, the rest are looked up with sacct. -#
+            modlog.debug("%s failed: %s" % (command[0], result.stderr.strip()))
+        return result.stdout
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Syncing the simulation log ========================================================================================= #
+# -------------------------------------------------------------------------------------------------------------------- #
+def record_submission(record, job_id, stage, object_rec=None):
+    """
+    Records a submitted job in the ``meta`` of the simulation (or of its output ``object_rec``) it runs, where
+    ``recorded_jobs`` finds it. Only the jobs of the ``producing_stage`` are recorded.
+
+    Parameters
+    ----------
+    record : SimRec
+        The simulation record (or the ``RemoteSimRec`` of a daemon's client).
+    job_id : str
+        The id of the job.
+    stage : str
+        The stage of the pipeline the job runs.
+    object_rec : str, optional
+        The output of ``record`` the job produces.
+
+    Returns
+    -------
+    None
+    """
+    if stage != producing_stage or not hasattr(record, "outputs"):
+        return None  # -> only simulations and their outputs are tracked.
+
+    prefix = ["outputs", object_rec] if object_rec is not None else []
+    record[prefix + ["meta", "job_id"]] = str(job_id)
+    record[prefix + ["meta", "job_stage"]] = stage
+    record[prefix + ["meta", "job_state"]] = None  # -> the state of the new job is synced on the next poll.
+
+
+def recorded_jobs(simlog) -> dict:
+    """
+    Finds the job of the ``producing_stage`` recorded in the ``meta`` of each simulation and output of a simulation log.
+
+    Parameters
+    ----------
+    simlog : SimulationLog
+        The simulation log.
+
+    Returns
+    -------
+    dict
+        The job id of each record, keyed by ``(ic, nml, output)`` (``output`` is ``None`` for the simulation itself).
+    """
+    jobs = {}
+    for simrec in simlog.get_simulation_records().values():
+        targets = [(None, simrec.raw)] + list(simrec.raw.get("outputs", {}).items())
+        for output, record in targets:
+            meta = record.get("meta") or {}
+            if meta.get("job_id") is not None and meta.get("job_stage", producing_stage) == producing_stage:
+                jobs[(simrec.parent.name, simrec.name, output)] = str(meta["job_id"])
+    return jobs
+
+
+def sync_job_states(simlog, poller=None) -> dict:
+    """
+    Writes the states of the jobs recorded in a simulation log into the ``meta`` of their records, with a single write.
+
+    Parameters
+    ----------
+    simlog : SimulationLog
+        The simulation log.
+    poller : JobStatusPoller, optional
+        The poller to fetch the states with (and cache them in).
+
+    Returns
+    -------
+    dict
+        The ``(old state, new state)`` of each record whose job changed state, keyed as in ``recorded_jobs``.
+    """
+    poller = poller if poller is not None else JobStatusPoller()
+    jobs, active = recorded_jobs(simlog), {}
+
+    for key, job_id in jobs.items():
+        meta = _record(simlog, key).get("meta", {})
+        if meta.get("job_id") == job_id and meta.get("job_state") in final_states:
+            continue  # -> the job won't change state again.
+        active[key] = job_id
+
+    if not len(active):
+        return {}
+
+    states = poller.poll(active.values())
+    transitions = {}
+    with simlog.batch():  # -> a single write for all of the changes.
+        for key, job_id in active.items():
+            if job_id not in states:
+                continue
+            ic, nml, output = key
+            simrec = simlog.ics[ic].sims[nml]
+            meta = _record(simlog, key).get("meta")
+            prefix = ["outputs", output] if output is not None else []
+            previous = meta.get("job_state") if meta is not None and meta.get("job_id") == job_id else None
+
+            if previous == states[job_id]:
+                continue
+            if meta is None:
+                simrec[prefix + ["meta"]] = {}
+            simrec[prefix + ["meta", "job_id"]] = job_id
+            simrec[prefix + ["meta", "job_state"]] = states[job_id]
+            simrec[prefix + ["meta", "job_state_time"]] = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
+
+            kwargs = {"object_rec": output} if output is not None else {}
+            simrec.log("Job %s: %s -> %s." % (job_id, previous, states[job_id]), "SLURM-STATE", job_id=job_id,
+                       state=states[job_id], **kwargs)
+            transitions[key] = (previous, states[job_id])
+
+    modlog.debug("Synced %s jobs of %s (%s changed state)." % (len(active), simlog, len(transitions)))
+    return transitions
+
+
+def _record(simlog, key) -> dict:
+    """The raw record of a ``recorded_jobs`` key."""
+    ic, nml, output = key
+    raw = simlog.ics[ic].sims[nml].raw
+    return raw["outputs"][output] if output is not None else raw
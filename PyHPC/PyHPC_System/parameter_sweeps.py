@@ -0,0 +1,323 @@
+"""
+================
+Parameter Sweeps
+================
+Generation of the ``.nml`` files of a grid of RAMSES runs from a base RAMSES configuration and a sweep specification.
+
+A sweep specification is a TOML file (or the equivalent dictionary) such as
+
+.. code-block:: toml
+
+    name = "levelmax_cooling"
+    mode = "product" # product, zip or latin_hypercube.
+    samples = 8 # The number of runs (latin_hypercube only).
+    seed = 0 # The seed of the sampling (latin_hypercube only).
+
+    [parameters]
+    "AMR_PARAMS.levelmax" = ["10", "11", "12"]
+    "PHYSICS_PARAMS.cooling" = [".true.", ".false."]
+
+The parameters are ``.`` separated paths to settings of the RAMSES configuration (``HEADER.setting``, so that
+``HEADER.enabled`` toggles a whole header). In the ``product`` mode every combination of the values is run, in the
+``zip`` mode the i-th values of every parameter are run together and in the ``latin_hypercube`` mode ``samples`` runs
+are drawn by Latin hypercube sampling, from the listed values or from a ``{min = ..., max = ...}`` range (of integers
+if both bounds are integers).
+
+The ``.nml`` files are written with ``write_ramses_nml`` to ``<nml_directory>/<name>/<name>_<i>.nml``, registered in the
+simulation log with a single write (``register_sweep``) and run as one SLURM job array (see ``run_sweep.py``).
+"""
+import copy
+import itertools
+import logging
+import os
+import pathlib as pt
+import random
+import warnings
+from datetime import datetime
+
+import toml
+
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
+from PyHPC.PyHPC_System.io import write_ramses_nml
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+#: The available sweep modes.
+modes = ("product", "zip", "latin_hypercube")
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sweep Specifications =============================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def load_sweep(path) -> dict:
+    """
+    Loads a sweep specification from a TOML file.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path of the specification.
+
+    Returns
+    -------
+    dict
+        The specification, with ``name`` defaulting to the stem of the file and ``mode`` to ``product``.
+    """
+    try:
+        spec = toml.load(path)
+    except FileNotFoundError:
+        raise PyHPC_Error("Failed to find the sweep specification at %s." % path)
+    except toml.TomlDecodeError:
+        raise PyHPC_Error("Failed to correctly load the sweep specification %s in TOML format." % path)
+
+    spec.setdefault("name", pt.Path(path).stem)
+    spec.setdefault("mode", "product")
+    if not isinstance(spec.get("parameters"), dict) or not len(spec["parameters"]):
+        raise PyHPC_Error("The sweep specification %s doesn't have any [parameters]." % path)
+    return spec
+
+
+def sweep_points(parameters: dict, mode="product", samples=None, seed=None) -> list:
+    """
+    Produces the points of a sweep.
+
+    Parameters
+    ----------
+    parameters : dict
+        The values of each parameter: a list, or a ``{"min": ..., "max": ...}`` range in the ``latin_hypercube`` mode.
+    mode : str
+        The mode of the sweep (see ``modes``).
+    samples : int, optional
+        The number of points in the ``latin_hypercube`` mode.
+    seed : int, optional
+        The seed of the ``latin_hypercube`` sampling.
+
+    Returns
+    -------
+    list of dict
+        The ``{parameter: value}`` of each point.
+
+    Examples
+    --------
+    >>> sweep_points({"AMR_PARAMS.levelmax": [10, 11], "PHYSICS_PARAMS.cooling": [".true.", ".false."]})[:2]
+    [{'AMR_PARAMS.levelmax': 10, 'PHYSICS_PARAMS.cooling': '.true.'}, {'AMR_PARAMS.levelmax': 10, 'PHYSICS_PARAMS.cooling': '.false.'}]
+    >>> sweep_points({"AMR_PARAMS.levelmax": [10, 11], "AMR_PARAMS.levelmin": [7, 8]}, mode="zip")
+    [{'AMR_PARAMS.levelmax': 10, 'AMR_PARAMS.levelmin': 7}, {'AMR_PARAMS.levelmax': 11, 'AMR_PARAMS.levelmin': 8}]
+    """
+    modlog.debug("Generating the points of a %s sweep over %s." % (mode, list(parameters.keys())))
+    names = list(parameters.keys())
+
+    if mode == "latin_hypercube":
+        return latin_hypercube(parameters, samples, seed=seed)
+
+    for name, values in parameters.items():
+        if not isinstance(values, (list, tuple)):
+            raise PyHPC_Error("The values of %s must be a list in the %s mode (found %s)." % (name, mode, values))
+
+    if mode == "product":
+        return [dict(zip(names, point)) for point in itertools.product(*parameters.values())]
+    elif mode == "zip":
+        if len(set(len(values) for values in parameters.values())) > 1:
+            raise PyHPC_Error("The parameters of a zip sweep must have the same number of values (found %s)." % (
+                {name: len(values) for name, values in parameters.items()}))
+        return [dict(zip(names, point)) for point in zip(*parameters.values())]
+    else:
+        raise PyHPC_Error("The sweep mode %s is not one of %s." % (mode, modes))
+
+
+def latin_hypercube(parameters: dict, samples: int, seed=None) -> list:
+    """
+    Draws ``samples`` points by Latin hypercube sampling: the range of each parameter is split into ``samples``
+    strata, each of which is sampled exactly once.
+
+    Parameters
+    ----------
+    parameters : dict
+        The values of each parameter: a list (sampled by index) or a ``{"min": ..., "max": ...}`` range. A range
+        with ``int`` bounds is sampled over the integers from ``min`` to ``max`` (inclusive).
+    samples : int
+        The number of points.
+    seed : int, optional
+        The seed of the sampling.
+
+    Returns
+    -------
+    list of dict
+        The ``{parameter: value}`` of each point.
+
+    Examples
+    --------
+    >>> [point["AMR_PARAMS.levelmax"] for point in latin_hypercube({"AMR_PARAMS.levelmax": {"min": 10, "max": 12}}, 3,
+    ...                                                            seed=0)]
+    [10, 12, 11]
+    """
+    if not isinstance(samples, int) or samples < 1:
+        raise PyHPC_Error("A latin_hypercube sweep needs a positive number of samples (found %s)." % samples)
+
+    generator = random.Random(seed)
+    columns = {}
+    for name, values in parameters.items():
+        strata = list(range(samples))
+        generator.shuffle(strata)
+        positions = [(stratum + generator.random()) / samples for stratum in strata]  # -> each in [0, 1).
+
+        if isinstance(values, dict):
+            try:
+                low, high = values["min"], values["max"]
+            except KeyError:
+                raise PyHPC_Error("The range of %s must have a min and a max (found %s)." % (name, values))
+            if isinstance(low, int) and isinstance(high, int):  # -> integer settings (levelmax, etc.).
+                columns[name] = [low + int(position * (high - low + 1)) for position in positions]
+            else:
+                columns[name] = [low + position * (high - low) for position in positions]
+        elif isinstance(values, (list, tuple)) and len(values):
+            columns[name] = [values[int(position * len(values))] for position in positions]
+        else:
+            raise PyHPC_Error("The values of %s must be a list or a range (found %s)." % (name, values))
+
+    return [dict(zip(columns.keys(), point)) for point in zip(*columns.values())]
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Writing the sweep ================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def apply_point(settings: dict, point: dict) -> dict:
+    """
+    Applies a point of a sweep to a RAMSES configuration.
+
+    Parameters
+    ----------
+    settings : dict
+        The base RAMSES configuration (as loaded from ``RAMSES.config``). It isn't changed.
+    point : dict
+        The ``{"HEADER.setting": value}`` of the point.
+
+    Returns
+    -------
+    dict
+        A copy of the configuration with the values of the point.
+    """
+    settings = copy.deepcopy(settings)
+    for name, value in point.items():
+        location = settings
+        for part in name.split("."):
+            if not isinstance(location, dict) or part not in location:
+                raise PyHPC_Error("The parameter %s is not a setting of the RAMSES configuration." % name)
+            location = location[part]
+
+        if not isinstance(location, dict) or "v" not in location:
+            raise PyHPC_Error("The parameter %s is a header, not a setting, of the RAMSES configuration." % name)
+        location["v"] = value
+    return settings
+
+
+def write_sweep(settings: dict, points: list, directory, name: str) -> list:
+    """
+    Writes the ``.nml`` files of a sweep.
+
+    Parameters
+    ----------
+    settings : dict
+        The base RAMSES configuration, including the ``META`` software and initial conditions.
+    points : list of dict
+        The points of the sweep (see ``sweep_points``).
+    directory : str or Path
+        The directory to write the ``.nml`` files to.
+    name : str
+        The name of the sweep. The files are named ``<name>_<i>.nml``.
+
+    Returns
+    -------
+    list of str
+        The paths of the ``.nml`` files, in the order of the points. They are also listed (one per line) in
+        ``<directory>/<name>.sweep``.
+
+    Notes
+    -----
+    Every point is applied before anything is written, so that an invalid sweep doesn't leave part of its files.
+    """
+    configurations = [apply_point(settings, point) for point in points]
+    pt.Path(directory).mkdir(parents=True, exist_ok=True)
+    width = max(len(str(len(points) - 1)), 3)
+
+    nml_paths = []
+    for index, configuration in enumerate(configurations):
+        nml_path = os.path.join(directory, "%s_%0*d.nml" % (name, width, index))
+        write_ramses_nml(configuration, nml_path)
+        nml_paths.append(nml_path)
+
+    with open(os.path.join(directory, "%s.sweep" % name), "w") as listing:
+        listing.write("".join("%s\n" % nml_path for nml_path in nml_paths))
+
+    modlog.debug("Wrote the %s .nml files of the sweep %s to %s." % (len(nml_paths), name, directory))
+    return nml_paths
+
+
+def register_sweep(simlog, ic_file, nml_paths: list, points: list, software: str, output_directory, name: str,
+                   slurm_path=None):
+    """
+    Registers the simulations of a sweep (and their outputs) in the simulation log with a single write.
+
+    Parameters
+    ----------
+    simlog : SimulationLog
+        The simulation log.
+    ic_file : str
+        The initial conditions of the sweep. They are added to the log if they aren't already in it.
+    nml_paths : list of str
+        The ``.nml`` files of the sweep (see ``write_sweep``).
+    points : list of dict
+        The points of the sweep, recorded in the ``meta`` of each simulation under ``sweep``.
+    software : str
+        The RAMSES software of the sweep.
+    output_directory : str or Path
+        The directory holding the outputs of the sweep. Each run writes to ``<output_directory>/<nml stem>``.
+    name : str
+        The name of the sweep.
+    slurm_path : str, optional
+        The SLURM script of the sweep.
+
+    Returns
+    -------
+    list of str
+        The output directory of each run.
+    """
+    ic_file = str(ic_file)
+    date = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
+    outputs = [str(pt.Path(output_directory, pt.Path(nml_path).stem)) for nml_path in nml_paths]
+
+    entries = {}
+    if ic_file not in simlog.ics:
+        entries[ic_file] = {"information": "Auto-generated record from the sweep %s." % name}
+    for nml_path, point, output in zip(nml_paths, points, outputs):
+        entries[(ic_file, nml_path)] = {
+            "information": "Generated ``.nml`` from the sweep %s." % name,
+            "meta"       : {"software": software, "sweep": {"name": name, "parameters": point}}
+        }
+        entries[(ic_file, nml_path, output)] = {"meta": {"path": output, "dateCreated": date}}
+        if slurm_path is not None:
+            entries[(ic_file, nml_path, output)]["meta"]["slurm_path"] = str(slurm_path)
+
+    with simlog.batch():  # -> a single write for the whole sweep.
+        simlog.bulk_add(entries)
+        init_con_log = simlog.ics[ic_file]
+        init_con_log.log("Generated the sweep %s (%s runs)." % (name, len(nml_paths)), action="RAMSES-BUILD")
+        for nml_path, output in zip(nml_paths, outputs):
+            nml_log = init_con_log.sims[nml_path]
+            nml_log.log("Created nml.", action="RAMSES-BUILD")
+            nml_log.log("created slurm file.", action="SLURM-GENERATE", object_rec=output)
+
+    modlog.debug("Registered the %s simulations of the sweep %s in %s." % (len(nml_paths), name, simlog))
+    return outputs
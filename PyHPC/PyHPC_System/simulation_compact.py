@@ -0,0 +1,257 @@
+"""
+=======================
+Compact Simulation Logs
+=======================
+A compact in-memory representation of the raw data of a ``SimulationLog`` for very large logs, enabled with
+``CONFIG["System"]["SimulationLog"]["compact_memory"]`` (or ``SimulationLog(compact=True)``).
+
+Most of the memory of a loaded log is taken by its action logs: a ``dict`` per entry, each with its own copies of the
+same few keys' values (``act``, ``file``, ``object``, etc.). In a compact log
+
+- each action log is an ``ActionLog``, which stores its entries column by column (a list per field) instead of a
+  ``dict`` per entry,
+- the repeated strings (the fields of the action log entries, the ``meta`` values and the keys of the initial
+  conditions, simulations and outputs) are interned, so that equal strings are only stored once.
+
+``ActionLog`` is a ``MutableMapping`` which produces the entry ``dict`` objects on access, so the rest of the log
+(and the serializers, which write it as a plain object) are unaffected and the files written are unchanged.
+"""
+import logging
+import pathlib as pt
+import sys
+import warnings
+from collections.abc import MutableMapping
+
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_System.simulation_storage import LazyLog
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+#: The keys of the records holding child records.
+_containers = ("simulations", "outputs")
+
+#: The fields of the action log entries which ``ActionLog`` stores as columns.
+_fields = ("msg", "act", "lineno", "file", "time", "object", "level")
+_field_set = frozenset(_fields)
+
+_missing = object()  # -> the sentinel of the fields an entry doesn't have.
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sub Functions ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def _intern(value):
+    """Interns ``value`` if it is a string."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def compact_record(record: dict, intern_keys=True) -> dict:
+    """
+    Converts the action logs of ``record`` (an initial condition, simulation or output) and of all of its children to
+    ``ActionLog`` objects and interns its ``meta`` values, in place.
+
+    Parameters
+    ----------
+    record : dict
+        The raw record.
+    intern_keys : bool
+        If ``True``, the ``simulations`` and ``outputs`` containers are also rebuilt with interned keys. This replaces
+        the container objects, so it should only be used on records which nothing else holds yet.
+
+    Returns
+    -------
+    dict
+        The record.
+    """
+    if not isinstance(record, dict):
+        return record
+
+    if isinstance(record.get("action_log"), dict):
+        record["action_log"] = ActionLog(record["action_log"])
+
+    if isinstance(record.get("meta"), dict):
+        meta = record["meta"]
+        for key, value in meta.items():
+            if type(value) is str:
+                meta[key] = sys.intern(value)
+
+    for container in _containers:
+        if isinstance(record.get(container), dict):
+            children = record[container]
+            if intern_keys:
+                record[container] = {_intern(key): compact_record(child) for key, child in children.items()}
+            else:
+                for child in children.values():
+                    compact_record(child, intern_keys=False)
+    return record
+
+
+def compact_log(raw):
+    """
+    Compacts the raw data of a simulation log (see ``compact_record``).
+
+    Parameters
+    ----------
+    raw : dict or LazyLog
+        The raw data of the log.
+
+    Returns
+    -------
+    dict or LazyLog
+        The compacted data. A ``dict`` is rebuilt with interned keys. The initial conditions of a ``LazyLog`` are
+        compacted as they are parsed.
+    """
+    if isinstance(raw, LazyLog):
+        raw.transform = compact_record
+        for key in raw.loaded:
+            compact_record(raw[key], intern_keys=False)
+        return raw
+    return {_intern(key): compact_record(record) for key, record in raw.items()}
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Action Logs ======================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+class ActionLog(MutableMapping):
+    """
+    Columnar store of the entries of an action log. Behaves like the ``{key: entry}`` dictionary it replaces.
+
+    Parameters
+    ----------
+    entries : dict, optional
+        The entries to store.
+
+    Notes
+    -----
+    The entries are rebuilt on each access, so changes to a fetched entry aren't stored; entries should be replaced
+    as a whole (as ``log`` does). Fields other than ``ActionLog.fields`` are kept in a ``dict`` per entry.
+
+    Removing an entry costs a pass over the log, which is bounded by
+    ``CONFIG["System"]["SimulationLog"]["action_log_limit"]``.
+
+    Examples
+    --------
+    >>> log = ActionLog({"k1": {"msg": "Created nml.", "act": "RAMSES-BUILD", "lineno": 12, "note": "x"}})
+    >>> log["k1"]
+    {'msg': 'Created nml.', 'act': 'RAMSES-BUILD', 'lineno': 12, 'note': 'x'}
+    >>> log == {"k1": {"msg": "Created nml.", "act": "RAMSES-BUILD", "lineno": 12, "note": "x"}}
+    True
+    """
+    __slots__ = ("_keys", "_positions", "_columns", "_extra")
+
+    #: The fields stored as columns, in the order the entries are produced with.
+    fields = _fields
+
+    def __init__(self, entries=None):
+        self._keys = []
+        self._positions = {}  # -> key -> position in the columns.
+        self._columns = tuple([] for _ in self.fields)
+        self._extra = {}  # -> key -> the other fields of the entry (or the entry itself if it isn't a dict).
+
+        if not entries:
+            return None
+        if not all(type(entry) is dict for entry in entries.values()):
+            for key, entry in entries.items():
+                self[key] = entry
+            return None
+
+        # - Filled column by column, which is much faster than adding the entries one at a time -#
+        intern = sys.intern
+        self._keys = [intern(key) if type(key) is str else key for key in entries]
+        self._positions = dict(zip(self._keys, range(len(self._keys))))
+        values = list(entries.values())
+        self._columns = tuple([intern(value) if type(value) is str else value
+                               for value in [entry.get(field, _missing) for entry in values]]
+                              for field in self.fields)
+        for key, entry in zip(self._keys, values):
+            extra = entry.keys() - _field_set
+            if len(extra):
+                self._extra[key] = {_intern(field): entry[field] for field in entry if field in extra}
+
+    def __repr__(self):
+        return "ActionLog(%s)" % dict(self.items())
+
+    def __getitem__(self, key):
+        position = self._positions[key]
+        extra = self._extra.get(key)
+        if extra is not None and not isinstance(extra, dict):
+            return extra
+
+        entry = {}
+        for field, column in zip(self.fields, self._columns):
+            value = column[position]
+            if value is not _missing:
+                entry[field] = value
+        if extra:
+            entry.update(extra)
+        return entry
+
+    def __setitem__(self, key, entry):
+        position = self._positions.get(key)
+        if position is None:
+            key = _intern(key)
+            position = self._positions[key] = len(self._keys)
+            self._keys.append(key)
+            for column in self._columns:
+                column.append(_missing)
+
+        if not isinstance(entry, dict):
+            self._extra[key] = entry
+            for column in self._columns:
+                column[position] = _missing
+            return None
+
+        for field, column in zip(self.fields, self._columns):
+            column[position] = _intern(entry.get(field, _missing))
+
+        extra = {_intern(field): value for field, value in entry.items() if field not in _field_set}
+        if len(extra):
+            self._extra[key] = extra
+        else:
+            self._extra.pop(key, None)
+
+    def __delitem__(self, key):
+        position = self._positions.pop(key)
+        del self._keys[position]
+        for column in self._columns:
+            del column[position]
+        self._extra.pop(key, None)
+
+        for later in self._keys[position:]:
+            self._positions[later] -= 1
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def column(self, field) -> list:
+        """
+        Fetches the values of a field of every entry (``None`` where an entry doesn't have the field).
+
+        Parameters
+        ----------
+        field : str
+            One of ``ActionLog.fields``.
+
+        Returns
+        -------
+        list
+            The values, in the order of the entries.
+        """
+        return [None if value is _missing else value for value in self._columns[self.fields.index(field)]]
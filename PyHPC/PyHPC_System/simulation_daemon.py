@@ -0,0 +1,799 @@
+"""
+==========================
+Simulation Log Daemon
+==========================
+A long-lived process which holds a ``SimulationLog`` in memory and serves reads and mutations over a Unix domain socket,
+so that the executables and SLURM jobs sharing a log don't each have to load it in full.
+
+- ``SimulationLogDaemon`` owns the log. Every request is executed under a single lock (so concurrent writers are
+  serialized) and the resulting operations are written together every
+  ``CONFIG["System"]["SimulationLog"]["daemon_flush_interval"]`` seconds, rather than once per change. A request
+  (or ``batch`` of requests) which fails is rolled back, so that none of its changes are written.
+- ``SimulationLogClient`` is a thin client with the same interface as the ``SimulationLog`` (``ics``, ``add``,
+  ``bulk_add``, ``log``, item access, ``find_by_nml``, ``find_by_output``, ``batch``, ``save``). ``open_simulation_log``
+  returns a client if a daemon is serving the log and a ``SimulationLog`` otherwise.
+
+The daemon is started with ``PyHPC_executables/simlog_daemon.py`` and listens on ``<log>.sock`` by default. The
+executables which only write to the log (``run_sweep.py``, ``run_campaign.py`` and the job arrays of
+``ImageManager.py``) open it with ``open_simulation_log``.
+
+Protocol
+--------
+Requests and responses are single line JSON objects (written with ``JSONSerializer``):
+
+.. code-block:: python
+
+    {"method": "log", "record": ["<ic>", "<nml>"], "message": "...", "action": "...", "kwargs": {...}}
+    {"ok": true, "result": null}
+    {"ok": false, "error": "KeyError", "message": "..."}
+
+Notes
+-----
+The daemon only re-reads the log when it writes, so changes made by other processes directly through a
+``SimulationLog`` are merged (see ``SimulationLog._flush``) but aren't visible to clients until the next flush. Arrays
+are returned to clients as lists.
+"""
+import logging
+import os
+import pathlib as pt
+import socket
+import socketserver
+import threading as t
+import warnings
+from collections.abc import Mapping
+from contextlib import contextmanager
+from functools import reduce
+
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
+from PyHPC.PyHPC_System.simulation_management import InitCon, SimRec, SimulationLog, get_caller
+from PyHPC.PyHPC_System.simulation_storage import JSONSerializer
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+#: The serializer of the messages (arrays are always sent inline).
+_serializer = JSONSerializer(sidecar_threshold=0)
+
+#: The methods which change the log (and are therefore deferred inside of a client ``batch``).
+mutations = ("set", "delete", "add", "bulk_add", "log")
+
+#: The errors re-raised by the client with their own type.
+_error_types = {"KeyError": KeyError, "ValueError": ValueError, "TypeError": TypeError, "SyntaxError": SyntaxError,
+                "PyHPC_Error": PyHPC_Error}
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sub Functions ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def get_socket_path(path) -> pt.Path:
+    """
+    The default socket of the daemon serving the simulation log at ``path`` (``<log>.sock``).
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log.
+
+    Returns
+    -------
+    pt.Path
+        The path to the socket.
+    """
+    return pt.Path(path).with_name(pt.Path(path).name + ".sock")
+
+
+def connect(path=None, socket_path=None, timeout=None):
+    """
+    Connects to the daemon serving a simulation log.
+
+    Parameters
+    ----------
+    path : str or pt.Path, optional
+        The path to the simulation log. Defaults to the default log of ``SimulationLog``.
+    socket_path : str or pt.Path, optional
+        The socket of the daemon. Defaults to ``get_socket_path(path)``.
+    timeout : float, optional
+        The timeout (in seconds) of each request.
+
+    Returns
+    -------
+    SimulationLogClient or None
+        The client, or ``None`` if no daemon is listening on the socket.
+    """
+    if socket_path is None:
+        if path is None:
+            path = pt.Path(CONFIG["System"]["Directories"]["bin"], "configs", "Simlog.json")
+        socket_path = get_socket_path(path)
+
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        return SimulationLogClient(socket_path, timeout=timeout)
+    except (ConnectionRefusedError, FileNotFoundError):
+        modlog.debug("Found a stale daemon socket at %s." % socket_path)
+        return None
+
+
+def open_simulation_log(path=None, **kwargs):
+    """
+    Opens a simulation log through its daemon if one is running, and directly otherwise.
+
+    Parameters
+    ----------
+    path : str or pt.Path, optional
+        The path to the simulation log.
+    kwargs : optional
+        Additional arguments passed to ``SimulationLog`` if no daemon is running.
+
+    Returns
+    -------
+    SimulationLogClient or SimulationLog
+        The client connected to the daemon or the loaded ``SimulationLog``.
+    """
+    client = connect(path)
+    if client is not None:
+        modlog.debug("Connected to the daemon of %s." % client.path)
+        return client
+    return SimulationLog(path=path, **kwargs)
+
+
+def _send(stream, message: dict):
+    """Writes ``message`` to the (binary) ``stream`` as a single line."""
+    stream.write(_serializer.dumps(message) + b"\n")
+    stream.flush()
+
+
+def _receive(stream):
+    """Reads the next message from the (binary) ``stream``. ``None`` if the stream was closed."""
+    line = stream.readline()
+    return _serializer.loads(line) if line else None
+
+
+def _raw_path(keys) -> list:
+    """Converts the ``SimulationLog`` key path ``keys`` (``[ic, nml, ...]``) into its path in ``SimulationLog.raw``."""
+    keys = list(keys)
+    return keys[:1] + (["simulations"] + keys[1:] if len(keys) > 1 else [])
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Daemon ============================================================================================================= #
+# -------------------------------------------------------------------------------------------------------------------- #
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serves the requests of a single client connection, one line at a time."""
+
+    def handle(self):
+        while True:
+            try:
+                request = _receive(self.rfile)
+            except (ValueError, OSError):
+                modlog.exception("Failed to read a request from a client of %s." % self.server.daemon)
+                return None
+            if request is None:
+                return None  # -> the client disconnected.
+
+            try:
+                _send(self.wfile, self.server.daemon.handle(request))
+            except OSError:
+                return None
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, socket_path, daemon):
+        self.daemon = daemon
+        super().__init__(str(socket_path), _RequestHandler)
+
+
+class SimulationLogDaemon:
+    """
+    Serves a ``SimulationLog`` over a Unix domain socket.
+
+    Parameters
+    ----------
+    path : str or pt.Path, optional
+        The path to the simulation log. Defaults to the default log of ``SimulationLog``.
+    socket_path : str or pt.Path, optional
+        The socket to listen on. Defaults to ``<log>.sock``. Note that socket paths are limited to about 100
+        characters.
+    flush_interval : float, optional
+        The time (in seconds) between writes of the pending changes. Defaults to
+        ``CONFIG["System"]["SimulationLog"]["daemon_flush_interval"]``.
+    backend : str, optional
+        The storage backend of the log.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        daemon = SimulationLogDaemon("Simlog.json")
+        daemon.serve()  # -> blocks until a client sends ``shutdown`` (or on a keyboard interrupt).
+    """
+
+    def __init__(self, path=None, socket_path=None, flush_interval=None, backend=None):
+        #: The simulation log being served.
+        self.simlog = SimulationLog(path=path, backend=backend)
+        #: The socket the daemon listens on.
+        self.socket_path = pt.Path(socket_path) if socket_path else get_socket_path(self.simlog.path)
+        #: The time (in seconds) between writes.
+        self.flush_interval = flush_interval if flush_interval is not None else \
+            CONFIG["System"]["SimulationLog"]["daemon_flush_interval"]
+
+        self._lock = t.RLock()  # -> serializes the requests.
+        self._stop_lock = t.Lock()  # -> held until a stop (and its final write) completes.
+        self._batch = None  # -> the open batch of the simulation log which defers its writes.
+        self._server = None
+        self._threads = []
+        self._stopped = t.Event()
+
+        #: The methods available to clients.
+        self.methods = {"ping": self._ping, "get": self._get, "keys": self._keys, "contains": self._contains,
+                        "set": self._set, "delete": self._delete, "add": self._add, "bulk_add": self._bulk_add,
+                        "log": self._log,
+                        "find": self._find, "flush": self.flush, "batch": self._run_batch,
+                        "shutdown": self._shutdown}
+        self._mutations = [self.methods[name] for name in mutations + ("batch",)]
+
+    def __repr__(self):
+        return "SimulationLogDaemon of %s @ %s" % (self.simlog.path, self.socket_path)
+
+    @property
+    def running(self) -> bool:
+        """``True`` while the daemon is serving."""
+        return self._server is not None and not self._stopped.is_set()
+
+    def start(self):
+        """
+        Starts serving in background threads.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        PyHPC_Error
+            If another daemon is already listening on the socket.
+        """
+        if os.path.exists(self.socket_path):
+            if connect(socket_path=self.socket_path) is not None:
+                raise PyHPC_Error("A daemon is already listening on %s." % self.socket_path)
+            os.remove(self.socket_path)  # -> left behind by a daemon which didn't exit cleanly.
+
+        self._batch = self.simlog.batch()
+        self._batch.__enter__()
+        self._server = _Server(self.socket_path, self)
+        self._stopped.clear()
+
+        self._threads = [t.Thread(target=self._server.serve_forever, daemon=True),
+                         t.Thread(target=self._flush_periodically, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        modlog.info("Started %s." % self)
+
+    def serve(self):
+        """
+        Starts serving and blocks until the daemon is stopped.
+
+        Returns
+        -------
+        None
+        """
+        self.start()
+        try:
+            self._stopped.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Stops serving and writes any pending changes.
+
+        Returns
+        -------
+        None
+        """
+        with self._stop_lock:
+            with self._lock:
+                if self._server is None:
+                    return None
+                server, self._server = self._server, None
+                self._stopped.set()
+
+            server.shutdown()
+            server.server_close()
+            with self._lock:
+                self._batch.__exit__(None, None, None)
+                self._batch = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            modlog.info("Stopped %s." % self)
+
+    def flush(self) -> int:
+        """
+        Writes the pending changes to the log.
+
+        Returns
+        -------
+        int
+            The number of operations written.
+        """
+        with self._lock:
+            pending = len(self.simlog._operations)
+            if self._batch is None or not (pending or self.simlog._full_save_pending):
+                return 0
+
+            try:
+                self._batch.__exit__(None, None, None)
+            finally:
+                self._batch = self.simlog.batch()
+                self._batch.__enter__()
+
+        modlog.debug("Flushed %s operations from %s." % (pending, self))
+        return pending
+
+    def _flush_periodically(self):
+        """Writes the pending changes every ``self.flush_interval`` seconds until the daemon stops."""
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                modlog.exception("Failed to flush %s. The changes are kept for the next flush." % self)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Requests ======================================================================================================= #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    def handle(self, request: dict) -> dict:
+        """
+        Executes a single request.
+
+        Parameters
+        ----------
+        request : dict
+            The request: ``{"method": <name>, **arguments}``.
+
+        Returns
+        -------
+        dict
+            The response: ``{"ok": True, "result": ...}`` or ``{"ok": False, "error": <type>, "message": <str>}``.
+        """
+        request = dict(request)
+        method = self.methods.get(request.pop("method", None))
+        if method is None:
+            return {"ok": False, "error": "PyHPC_Error", "message": "Unknown method in request %s." % request}
+
+        try:
+            with self._lock:
+                if method not in self._mutations:
+                    return {"ok": True, "result": method(**request)}
+
+                savepoint = self.simlog.savepoint()
+                try:
+                    return {"ok": True, "result": method(**request)}
+                except Exception:
+                    self.simlog.rollback(savepoint)  # -> keeps the changes of the previous requests.
+                    raise
+        except Exception as error:
+            modlog.debug("Request %s to %s failed: %s." % (request, self, repr(error)))
+            return {"ok": False, "error": type(error).__name__, "message": str(error)}
+
+    def _record(self, record):
+        """Fetches the ``SimulationLog``, ``InitCon`` or ``SimRec`` at the key path ``record``."""
+        if not len(record):
+            return self.simlog
+        elif len(record) == 1:
+            return self.simlog.ics[record[0]]
+        return self.simlog.ics[record[0]].sims[record[1]]
+
+    def _ping(self):
+        return {"path": str(self.simlog.path), "pid": os.getpid(), "pending": len(self.simlog._operations)}
+
+    def _get(self, keys):
+        value = self.simlog.raw if not len(keys) else self.simlog[list(keys)]
+        return value.raw if isinstance(value, (InitCon, SimRec)) else value
+
+    def _keys(self, record):
+        record = self._record(record)
+        return list(record.outputs if isinstance(record, SimRec) else record.raw if isinstance(
+            record, SimulationLog) else record.raw["simulations"])
+
+    def _contains(self, keys):
+        try:
+            reduce(lambda raw, key: raw[key], _raw_path(keys), self.simlog.raw)
+            return True
+        except (KeyError, TypeError, IndexError):
+            return False
+
+    def _set(self, keys, value):
+        self.simlog[list(keys)] = value
+
+    def _delete(self, keys):
+        del self.simlog[list(keys)]
+
+    def _add(self, record, entries, force=False):
+        self._record(record).add(entries, force=force)
+
+    def _bulk_add(self, entries, force=False):
+        self.simlog.bulk_add({tuple(key): data for key, data in entries}, force=force)
+
+    def _log(self, record, message, action, kwargs=None):
+        self._record(record).log(message, action, **(kwargs or {}))
+
+    def _find(self, kind, path):
+        found = {"nml": self.simlog.find_by_nml, "output": self.simlog.find_by_output}[kind](path)
+        return [found.parent.name, found.name] if found is not None else None
+
+    def _run_batch(self, requests):
+        results = []
+        for request in requests:
+            response = self.handle(request)
+            if not response["ok"]:
+                raise _error_types.get(response["error"], PyHPC_Error)(
+                    "Request %s of the batch failed (none of the requests were applied): %s" % (
+                        len(results), response["message"]))
+            results.append(response["result"])
+        return results
+
+    def _shutdown(self):
+        t.Thread(target=self.stop, daemon=True).start()  # -> can't wait for the server from one of its threads.
+
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Client ============================================================================================================= #
+# -------------------------------------------------------------------------------------------------------------------- #
+class SimulationLogClient:
+    """
+    Thin client of a ``SimulationLogDaemon`` with the interface of the ``SimulationLog``.
+
+    Parameters
+    ----------
+    socket_path : str or pt.Path
+        The socket of the daemon.
+    timeout : float, optional
+        The timeout (in seconds) of each request.
+
+    Notes
+    -----
+    Records are fetched from the daemon on each access, so ``raw`` (and ``meta``, ``core``, etc.) are copies;
+    changes must be made through item assignment, ``add`` or ``log``. Changes are written by the daemon on its next
+    flush, or immediately with ``save``.
+    """
+
+    def __init__(self, socket_path, timeout=None):
+        #: The socket of the daemon.
+        self.socket_path = pt.Path(socket_path)
+
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(str(self.socket_path))
+        self._stream = self._socket.makefile("rwb")
+        self._lock = t.Lock()
+        self._queued = None  # -> the requests deferred by an open batch.
+        self._batch_depth = 0
+
+        #: The path to the simulation log.
+        self.path = pt.Path(self.request("ping")["path"])
+        self._ics = RemoteChildren(self, [])
+
+    def __repr__(self):
+        return "SimulationLogClient of %s @ %s" % (self.path, self.socket_path)
+
+    def __str__(self):
+        return "SimulationLog @ %s" % self.path
+
+    def close(self):
+        """
+        Closes the connection to the daemon.
+
+        Returns
+        -------
+        None
+        """
+        self._stream.close()
+        self._socket.close()
+
+    def request(self, method, **kwargs):
+        """
+        Sends a request to the daemon (or queues it if it is a mutation and a batch is open).
+
+        Parameters
+        ----------
+        method : str
+            The method to call.
+        kwargs : optional
+            The arguments of the method.
+
+        Returns
+        -------
+        any
+            The result of the request (``None`` if it was queued).
+        """
+        if self._queued is not None and method in mutations:
+            self._queued.append({"method": method, **kwargs})
+            return None
+
+        with self._lock:
+            _send(self._stream, {"method": method, **kwargs})
+            response = _receive(self._stream)
+
+        if response is None:
+            raise PyHPC_Error("The daemon at %s closed the connection." % self.socket_path)
+        if not response["ok"]:
+            raise _error_types.get(response["error"], PyHPC_Error)(response["message"])
+        return response["result"]
+
+    @property
+    def ics(self):
+        """The ``{name: RemoteInitCon}`` mapping of the initial conditions."""
+        return self._ics
+
+    @property
+    def raw(self) -> dict:
+        """A copy of the entire raw log."""
+        return self.request("get", keys=[])
+
+    @property
+    def listed(self) -> dict:
+        return self.raw
+
+    def __getitem__(self, item: list):
+        if not isinstance(item, list):
+            item = [item]
+        if len(item) == 1:
+            return self.ics[item[0]]
+        elif len(item) == 2:
+            return self.ics[item[0]].sims[item[1]]
+        return self.request("get", keys=item)
+
+    def __setitem__(self, keys: list, value):
+        self.request("set", keys=keys if isinstance(keys, list) else [keys], value=value)
+
+    def __delitem__(self, key_list):
+        self.request("delete", keys=key_list if isinstance(key_list, list) else [key_list])
+
+    def __contains__(self, item):
+        return self.request("contains", keys=[item])
+
+    def __len__(self):
+        return len(self.ics)
+
+    def __iter__(self):
+        return iter(self.ics)
+
+    def add(self, entries, auto_save=True, force=False):
+        """Adds the initial conditions ``entries`` (see ``SimulationLog.add``)."""
+        self.request("add", record=[], entries=entries, force=force)
+
+    def bulk_add(self, entries, force=False):
+        """Adds entries at any level of the log in a single request (see ``SimulationLog.bulk_add``)."""
+        self.request("bulk_add", entries=[[[key] if isinstance(key, str) else list(key), data]
+                                          for key, data in entries.items()], force=force)
+
+    def find_by_nml(self, path):
+        """Finds the ``RemoteSimRec`` of the ``.nml`` file ``path`` (see ``SimulationLog.find_by_nml``)."""
+        found = self.request("find", kind="nml", path=str(path))
+        return self.ics[found[0]].sims[found[1]] if found is not None else None
+
+    def find_by_output(self, path):
+        """Finds the ``RemoteSimRec`` owning the output ``path`` (see ``SimulationLog.find_by_output``)."""
+        found = self.request("find", kind="output", path=str(path))
+        return self.ics[found[0]].sims[found[1]] if found is not None else None
+
+    def save(self):
+        """
+        Asks the daemon to write its pending changes immediately.
+
+        Returns
+        -------
+        None
+        """
+        self.request("flush")
+
+    def shutdown(self):
+        """
+        Stops the daemon (after it writes its pending changes).
+
+        Returns
+        -------
+        None
+        """
+        self.request("shutdown")
+        self.close()
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager which sends the changes made inside of it to the daemon in a single request when it exits, so
+        that they are applied without any other client's requests in between. Reads inside of the context don't
+        see the queued changes, but records may be accessed (to ``add`` to or ``log`` on) before the requests adding
+        them are applied. If an exception is raised inside of the context, the changes are discarded, and if one of
+        the requests fails when the batch is applied, none of them are applied.
+
+        Returns
+        -------
+        SimulationLogClient
+            The client itself.
+        """
+        if not self._batch_depth:
+            self._queued = []
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._queued = None
+            raise
+
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            requests, self._queued = self._queued, None
+            if len(requests):
+                self.request("batch", requests=requests)
+
+    #: Alias of ``batch``.
+    transaction = batch
+
+
+class RemoteChildren(Mapping):
+    """
+    The mapping of the children (initial conditions or simulations) of a record of a ``SimulationLogClient``.
+
+    Parameters
+    ----------
+    client : SimulationLogClient
+        The client.
+    record : list
+        The key path of the parent record (``[]`` for the log).
+    """
+
+    def __init__(self, client, record):
+        self.client, self.record = client, list(record)
+
+    def __repr__(self):
+        return "RemoteChildren of %s" % (self.record or self.client)
+
+    def __getitem__(self, key):
+        # - inside of a batch, the record may be added by a queued request: it is checked when the batch is applied. -#
+        if self.client._queued is None and not self.client.request("contains", keys=self.record + [key]):
+            raise KeyError(key)
+        return (RemoteInitCon if not len(self.record) else RemoteSimRec)(self.client, self.record + [key])
+
+    def __iter__(self):
+        return iter(self.client.request("keys", record=self.record))
+
+    def __len__(self):
+        return len(self.client.request("keys", record=self.record))
+
+    def __contains__(self, key):
+        return self.client.request("contains", keys=self.record + [key])
+
+
+class RemoteRecord:
+    """
+    Base class of the records of a ``SimulationLogClient``, with the interface of ``InitCon`` and ``SimRec``.
+
+    Parameters
+    ----------
+    client : SimulationLogClient
+        The client.
+    record : list
+        The key path of the record (``[ic]`` or ``[ic, nml]``).
+    """
+
+    def __init__(self, client, record):
+        #: The client the record belongs to.
+        self.client = client
+        #: The key path of the record.
+        self.record = list(record)
+        #: The name of the record.
+        self.name = self.record[-1]
+
+    def __repr__(self):
+        return "%s @ %s" % (type(self).__name__, self.name)
+
+    def __str__(self):
+        return "%s @ %s" % (type(self).__name__.replace("Remote", ""), self.name)
+
+    @property
+    def raw(self) -> dict:
+        """A copy of the raw record."""
+        return self.client.request("get", keys=self.record)
+
+    @property
+    def meta(self) -> dict:
+        return self.raw["meta"]
+
+    @property
+    def inf(self) -> str:
+        return self.raw["information"]
+
+    @property
+    def core(self) -> dict:
+        return self.raw["core"]
+
+    def __getitem__(self, item: list):
+        return self.client.request("get", keys=self.record + (item if isinstance(item, list) else [item]))
+
+    def __setitem__(self, keys: list, value):
+        self.client.request("set", keys=self.record + (keys if isinstance(keys, list) else [keys]), value=value)
+
+    def __delitem__(self, key_list):
+        self.client.request("delete", keys=self.record + (key_list if isinstance(key_list, list) else [key_list]))
+
+    def add(self, entries, auto_save=True, force=False):
+        """Adds ``entries`` to the record (see ``InitCon.add`` and ``SimRec.add``)."""
+        self.client.request("add", record=self.record, entries=entries, force=force)
+
+    def log(self, message, action, auto_save=True, **kwargs):
+        """Logs ``message`` to the record's action log (see ``InitCon.log`` and ``SimRec.log``)."""
+        filename, lineno = get_caller()
+        self.client.request("log", record=self.record, message=message, action=action,
+                            kwargs={"file": filename, "lineno": lineno, **kwargs})
+
+    def save(self):
+        """Asks the daemon to write its pending changes immediately."""
+        self.client.save()
+
+
+class RemoteInitCon(RemoteRecord):
+    """An initial condition of a ``SimulationLogClient`` (see ``InitCon``)."""
+
+    @property
+    def sims(self):
+        """The ``{name: RemoteSimRec}`` mapping of the simulations."""
+        return RemoteChildren(self.client, self.record)
+
+    def __getitem__(self, item_map: list):
+        if not isinstance(item_map, list):
+            item_map = [item_map]
+        if len(item_map) == 1:
+            return self.sims[item_map[0]]
+        return super().__getitem__(item_map)
+
+    def __contains__(self, item):
+        return item in self.sims
+
+    def __len__(self):
+        return len(self.sims)
+
+    def __iter__(self):
+        return iter(self.sims)
+
+
+class RemoteSimRec(RemoteRecord):
+    """A simulation of a ``SimulationLogClient`` (see ``SimRec``)."""
+
+    @property
+    def parent(self):
+        """The ``RemoteInitCon`` of the simulation."""
+        return RemoteInitCon(self.client, self.record[:1])
+
+    @property
+    def outputs(self) -> dict:
+        """A copy of the outputs of the simulation."""
+        return self.client.request("get", keys=self.record + ["outputs"])
+
+    def __contains__(self, path):
+        return self.client.request("contains", keys=self.record + ["outputs", str(path)])
+
+    def __len__(self):
+        return len(self.outputs)
+
+    def __iter__(self):
+        return iter(self.raw)
@@ -2,22 +2,31 @@
 Simulation management tools for the PyHPC system. The core object ``SimulationLog`` is used by the backend to
 store and manage simulations throughout the generation pipeline.
 """
+import bisect
 import builtins
+import copy
 import json
 import logging
 import operator
 import os
 import pathlib as pt
-import shutil
+import sys
 import threading as t
+import time
 import warnings
+from collections.abc import Mapping
+from contextlib import contextmanager
 from datetime import datetime
-from functools import reduce
-from inspect import getframeinfo, stack
+from functools import lru_cache, reduce
 
 from PyHPC.PyHPC_Core.configuration import read_config
 from PyHPC.PyHPC_Core.errors import PyHPC_Error
-from PyHPC.PyHPC_Core.utils import NonStandardEncoder
+from PyHPC.PyHPC_System.disk_usage import DiskUsageIndex
+from PyHPC.PyHPC_System.file_management import delete_paths
+from PyHPC.PyHPC_System.simulation_compact import compact_log, compact_record
+from PyHPC.PyHPC_System.simulation_storage import ActionArchive, apply_operation, get_backend
+from PyHPC.PyHPC_System.simulation_tables import ColumnarLog
+from PyHPC.PyHPC_System.snapshot_management import SnapshotIndex
 
 # generating screen locking #
 screen_lock = t.Semaphore(value=1)  # locks off multi-threaded screen.
@@ -49,6 +58,17 @@ class SimulationLog:
     ----------
     path: str or pt.Path
         The path to the corresponding logging file.
+    backend: str or SimulationLogBackend, optional
+        The storage backend to read and write the log with (see ``PyHPC.PyHPC_System.simulation_storage``). If not
+        specified, ``CONFIG["System"]["SimulationLog"]["backend"]`` is used.
+    lazy: bool, optional
+        If ``True``, each initial condition is only parsed when it is first accessed, so that opening a large log only
+        costs reading the index of its initial conditions. Only supported by the ``json``, ``journal`` and
+        ``sharded`` backends.
+    compact: bool, optional
+        If ``True``, the log is held in the compact in-memory representation of
+        ``PyHPC.PyHPC_System.simulation_compact``. If not specified, ``CONFIG["System"]["SimulationLog"]
+        ["compact_memory"]`` is used.
 
     Notes
     -----
@@ -58,9 +78,17 @@ class SimulationLog:
     .. include:: ../../PyHPC/bin/lib/struct/simlog_struct.json
         :code:
 
+    Every change made through ``add``, ``log``, ``delete`` and the child ``save`` methods is recorded as an operation
+    and passed to the storage backend, which may then write only the changed portion of the log. Calling
+    ``SimulationLog.save()`` directly always writes the entire log.
+
+    Several processes may share a simulation log. Writes are made under an advisory file lock and, if another process
+    has written to the log in the meantime, the log is re-read and only this process's operations are applied before
+    writing. Wrapper objects obtained before such a merge should be fetched again to see the other processes' changes.
+
     """
 
-    def __init__(self, path=None):
+    def __init__(self, path=None, backend=None, lazy=False, compact=None):
         #  Introduction debug
         # ------------------------------------------------------------------------------------------------------------ #
         modlog.debug("Loading a SimulationLog from path %s" % path)
@@ -76,9 +104,40 @@ class SimulationLog:
 
         # Reading the path data
         # ------------------------------------------------------------------------------------------------------------ #
-        #: ``self.raw`` (``dict``) is the core variable containing the raw data
-        with open(self.path, "r+") as simfile:
-            self.raw = json.load(simfile)
+        #: ``self.backend`` is the storage backend used to read and write the log.
+        self.backend = get_backend(self.path, backend=backend)
+        #: ``self.lazy`` is ``True`` if the initial conditions are loaded on first access.
+        self.lazy = lazy
+        #: ``self.compact`` is ``True`` if the log is held in the compact in-memory representation.
+        self.compact = CONFIG["System"]["SimulationLog"]["compact_memory"] if compact is None else compact
+        with self.backend.lock():
+            #: ``self.raw`` (``dict`` or ``LazyLog``) is the core variable containing the raw data
+            self.raw = self._load()
+            self._version = self.backend.version()  # -> the version of the stored log ``self.raw`` reflects.
+
+        # - Operations made since the last write -#
+        self._operations = []
+        self._detached = 0  # -> the number of operations whose values were copied by ``savepoint``.
+        self._batch_depth = 0  # -> the number of open ``batch`` contexts.
+        self._archive_pending = {}  # -> ic -> action log entries to archive on the next write.
+
+        #: ``self.archive`` holds the action log entries which have been rolled out of the log.
+        self.archive = ActionArchive(self.path)
+        #: ``self.snapshots`` is the index of the snapshots in the output directories of the log.
+        self.snapshots = SnapshotIndex(self.path)
+        #: ``self.disk_usage`` is the index of the disk usage of the output directories of the log.
+        self.disk_usage = DiskUsageIndex(self.path)
+        self._full_save_pending = False  # -> True if ``save`` was called inside of a batch.
+
+        # - Cached wrapper objects -#
+        self._ics = ChildCache(self, InitCon, lambda simlog: simlog.raw)
+        self._records = None
+
+        # - Search indexes (built on the first search) -#
+        self._indexes = None
+        self._parents = None
+        self._columns = None  # -> the ``ColumnarLog`` (built on first access).
+        self._owners = None  # -> the ``OwnerIndex`` (built on the first lookup).
 
     # ---------------------------------------------------------------------------------------------------------------- #
     # Defining and Managing Properties =============================================================================== #
@@ -91,12 +150,11 @@ class SimulationLog:
 
         Returns
         -------
-        val : dict of {str : InitCon}
-            The dictionary of ``InitCon`` objects.
+        val : ChildCache of {str : InitCon}
+            The (read-only) mapping of ``InitCon`` objects. The same ``InitCon`` object is returned on each access until
+            the underlying entry is changed.
         """
-        return {
-            k: InitCon(k, v, parent=self) for k, v in self.raw.items()
-        }
+        return self._ics
 
     @property
     def listed(self) -> dict:
@@ -152,18 +210,30 @@ class SimulationLog:
     def __setitem__(self, keys: list, value):
         if not isinstance(keys, list):
             keys = [keys]
-        self.__getitem__(keys[:-1])[keys[-1]] = value
+
+        if len(keys) > 1:
+            self.ics[keys[0]][keys[1:]] = value
+        else:
+            self.raw[keys[0]] = value.raw if isinstance(value, InitCon) else value
+            self._record_operation(keys, self.raw[keys[0]])
+            self._invalidate(keys[0])
 
     def __len__(self):
-        return len(self.ics)
+        return len(self.raw)
 
     def __contains__(self, item):
-        return item in self.ics
+        return item in self.raw
 
     def __delitem__(self, key_list):
         if not isinstance(key_list, list):
             key_list = [key_list]
-        del self.__getitem__(key_list[:-1])[key_list[-1]]
+
+        if len(key_list) > 1:
+            del self.ics[key_list[0]][key_list[1:]]
+        else:
+            del self.raw[key_list[0]]
+            self._record_operation(key_list, delete=True)
+            self._invalidate(key_list[0])
 
     def __iter__(self):
         return iter(self.ics)
@@ -179,12 +249,191 @@ class SimulationLog:
         -------
         dict
             Dictionary of all the ``SimRec`` objects in the format ``{name:SimRec}``.
+
+        Notes
+        -----
+        The dictionary is cached until an entry is added or removed through ``add``, ``delete``, ``__setitem__`` or
+        ``__delitem__``. It should not be altered by the caller.
+        """
+        if self._records is None:
+            self._records = {}
+            for ic in self.ics.values():
+                if ic.sims is not None:
+                    self._records.update(ic.sims)
+
+        return self._records
+
+    def find_by_nml(self, path):
+        """
+        Finds the ``SimRec`` of the ``.nml`` file ``path`` through the reverse index of the log.
+
+        Parameters
+        ----------
+        path : str
+            The path to the ``.nml`` file, as it is stored in the log (or its absolute path).
+
+        Returns
+        -------
+        SimRec or None
+            The simulation record, or ``None`` if the ``.nml`` file isn't in the log.
+        """
+        owners = self._get_owners()
+        for key in [str(path), os.path.abspath(path)]:
+            if key in owners.nmls:
+                return self.ics[owners.nmls[key]].sims[key]
+        return None
+
+    def find_by_output(self, path):
+        """
+        Finds the ``SimRec`` owning the output directory ``path`` through the reverse index of the log. The
+        ``InitCon`` is its ``parent`` and the output's data is ``simrec.outputs[path]``.
+
+        Parameters
+        ----------
+        path : str
+            The path to the output directory, as it is stored in the log (or its absolute path).
+
+        Returns
+        -------
+        SimRec or None
+            The simulation record, or ``None`` if the output isn't in the log.
+        """
+        owners = self._get_owners()
+        for key in [str(path), os.path.abspath(path)]:
+            if key in owners.outputs:
+                ic, sim = owners.outputs[key]
+                return self.ics[ic].sims[sim]
+        return None
+
+    def _get_owners(self) -> "OwnerIndex":
+        """The reverse index of the log, built on first use and afterwards updated by ``_reindex``."""
+        if self._owners is None:
+            self._owners = OwnerIndex()
+            for ic, ic_raw in self.raw.items():
+                self._owners.add_ic(ic, ic_raw)
+            modlog.debug("Built %s for %s." % (self._owners, repr(self)))
+        return self._owners
+
+    def _invalidate(self, *path):
         """
-        obs = {}
-        for ic in self.ics.values():
-            obs = {**obs, **ic.sims}
+        Drops the cached wrapper objects at ``path`` after a structural change to ``self.raw``.
 
-        return obs
+        Parameters
+        ----------
+        path : str
+            The key path of the changed entry: ``()`` for the whole log, ``(ic,)`` for an ``InitCon`` or ``(ic, sim)``
+            for a ``SimRec``.
+
+        Returns
+        -------
+        None
+        """
+        self._records = None
+
+        if not len(path):
+            self._ics.invalidate()
+        elif len(path) == 1:
+            self._ics.invalidate(path[0])
+        elif self._ics.cached(path[0]) is not None and self._ics.cached(path[0]).sims is not None:
+            self._ics.cached(path[0]).sims.invalidate(path[1])
+
+        self._reindex(*path)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Searching ====================================================================================================== #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    @property
+    def columns(self) -> ColumnarLog:
+        """
+        The columnar projection of the log (see ``PyHPC.PyHPC_System.simulation_tables``). Built on first access and
+        updated as entries change.
+        """
+        if self._columns is None:
+            self._columns = ColumnarLog(self)
+        return self._columns
+
+    def _build_indexes(self):
+        """
+        Builds the search indexes over the fields listed under ``indexed`` in the ``simlog_struct.json`` file along
+        with the map from each ``SimRec`` name to the name of its parent ``InitCon``.
+
+        Returns
+        -------
+        None
+        """
+        modlog.debug("Building the search indexes of %s." % repr(self))
+        _struct = read_structure()
+        self._indexes = {
+            "ic" : {tuple(field): SearchIndex(field) for field in _struct["SimulationLog"].get("indexed", [])},
+            "sim": {tuple(field): SearchIndex(field) for field in _struct["InitCon"].get("indexed", [])}
+        }
+        self._parents = {}
+
+        for ic_name, ic_raw in self.raw.items():
+            self._index_ic(ic_name, ic_raw)
+
+    def _index_ic(self, ic_name, ic_raw):
+        """Adds the ``InitCon`` entry and all of its simulations to the search indexes."""
+        for index in self._indexes["ic"].values():
+            index.add(ic_name, ic_raw)
+
+        for sim_name, sim_raw in ic_raw.get("simulations", {}).items():
+            self._parents[sim_name] = ic_name
+            for index in self._indexes["sim"].values():
+                index.add(sim_name, sim_raw)
+
+    def _reindex(self, *path):
+        """
+        Updates the search indexes, reverse index and columnar projection after the entry at ``path`` (see ``_invalidate``) has changed.
+
+        Returns
+        -------
+        None
+        """
+        if self._columns is not None:
+            self._columns.invalidate(*path)
+
+        if self._owners is not None:
+            if not len(path):
+                self._owners = None
+            else:
+                self._owners.discard(*path[:2])
+                ic_raw = self.raw.get(path[0])
+                if ic_raw is not None and len(path) == 1:
+                    self._owners.add_ic(path[0], ic_raw)
+                elif ic_raw is not None and path[1] in ic_raw.get("simulations", {}):
+                    self._owners.add_sim(path[0], path[1], ic_raw["simulations"][path[1]])
+
+        if self._indexes is None:
+            return None
+
+        if not len(path):
+            # - Everything may have changed, the indexes are rebuilt on the next search. -#
+            self._indexes, self._parents = None, None
+            return None
+
+        if len(path) == 1:
+            ic_name = path[0]
+            for index in self._indexes["ic"].values():
+                index.discard(ic_name)
+            for sim_name in [k for k, v in self._parents.items() if v == ic_name]:
+                del self._parents[sim_name]
+                for index in self._indexes["sim"].values():
+                    index.discard(sim_name)
+
+            if ic_name in self.raw:
+                self._index_ic(ic_name, self.raw[ic_name])
+        else:
+            ic_name, sim_name = path[:2]
+            self._parents.pop(sim_name, None)
+            for index in self._indexes["sim"].values():
+                index.discard(sim_name)
+
+            sim_raw = self.raw.get(ic_name, {}).get("simulations", {}).get(sim_name)
+            if sim_raw is not None:
+                self._parents[sim_name] = ic_name
+                for index in self._indexes["sim"].values():
+                    index.add(sim_name, sim_raw)
 
     def search(self,
                search_kwargs: dict,
@@ -197,9 +446,13 @@ class SimulationLog:
         Parameters
         ----------
         search_kwargs : ``dict``
-            The ``kwargs`` to use for the search. Should be a set of ``{k:v,...}``.
+            The ``kwargs`` to use for the search. Should be a set of ``{k:v,...}`` where each ``k`` is a key of
+            ``obj.raw`` or a ``.`` separated path into it (i.e. ``"meta.software"``).
             All objects matching the level of granularity specified by ``search_for`` will be queried to see if ``obj.raw`` includes the given kwargs.
             If the ``kwargs`` dictionary has ``list`` type entries, the search will be done based on an ``OR`` boolean search approach.
+            If the ``kwargs`` dictionary has ``tuple`` type entries ``(min, max)``, the search will match values in the
+            (inclusive) range. Either bound may be ``None``. Dates in the ``%m-%d-%Y_%H-%M-%S`` format are compared
+            chronologically.
             Individual entries in the ``kwargs`` are searched based on ``AND`` booleans.
         search_for : ``str``
             The level of granularity to use in the search. can be ``sim`` or ``ic``.
@@ -210,36 +463,64 @@ class SimulationLog:
         -------
         Returns a list of matching objects.
 
+        Notes
+        -----
+        Fields listed under ``indexed`` in the ``simlog_struct.json`` file are looked up in an index instead of being
+        checked against every entry. The indexes are kept up to date by ``add``, ``delete``, ``__setitem__``,
+        ``__delitem__`` and the ``save`` methods of ``InitCon`` and ``SimRec``.
+
         """
         #  Logging
         # ------------------------------------------------------------------------------------------------------------ #
         modlog.debug("Searching %s for %s by %s and for %s." % (repr(self), search_kwargs, search_for, return_by))
 
-        #  Grabbing necessary pieces of data.
+        if self._indexes is None:
+            self._build_indexes()
+
+        #  Using the indexes
         # ------------------------------------------------------------------------------------------------------------ #
-        search_group = self.ics if search_for == "ic" else list(self.get_simulation_records().values())
-        modlog.debug("Search for %s in %s has %s search items." % (search_kwargs, repr(self), len(search_group)))
+        indexes = self._indexes[search_for]
+        candidates, unindexed = None, {}
+        for key, value in search_kwargs.items():
+            field = tuple(key.split("."))
+            if field in indexes:
+                matches = indexes[field].lookup(value)
+                candidates = matches if candidates is None else candidates & matches
+            else:
+                unindexed[field] = value
+
+        if candidates is None:
+            candidates = self.raw.keys() if search_for == "ic" else self._parents.keys()
+        modlog.debug("Search for %s in %s has %s search items." % (search_kwargs, repr(self), len(candidates)))
 
-        # Performing the group search
+        # Checking the un-indexed fields
         # ------------------------------------------------------------------------------------------------------------ #
-        return_group = [item for item in search_group if all(
-            (item[key] in value if isinstance(value, list) else item[key] == value) for key, value in search_kwargs)]
+        if search_for == "ic":
+            return_group = [self.ics[key] for key in candidates]
+        else:
+            return_group = [self.ics[self._parents[key]].sims[key] for key in candidates]
+
+        if len(unindexed):
+            return_group = [item for item in return_group if all(
+                _match_value(_get_field(item.raw, field), value) for field, value in unindexed.items())]
+
+        return_group = sorted(return_group, key=lambda item: item.name)
 
         #  Unsorting
         # ------------------------------------------------------------------------------------------------------------ #
         if return_by == search_for:
             # Return by and search for are the same so we can return exactly what we found.
             return return_group
-        elif search_for == "ics":
+        elif search_for == "ic":
             # search for is ics, return by is sims, so we need to get a list of all such simulations.
             ret_group = []
             for item in return_group:
-                ret_group += item.sims
+                ret_group += list(item.sims.values())
 
             return ret_group
         else:
             # Search is for sims, but we want to return ics.
-            return list(set([item.parent for item in return_group]))
+            return list({item.parent.name: item.parent for item in return_group}.values())
 
     def add(self, entries, auto_save=True, force=False):
         """
@@ -268,67 +549,153 @@ class SimulationLog:
         """
         #  Debugging
         # ------------------------------------------------------------------------------------------------------------ #
-        modlog.debug("Adding %s to %s" % (entries, repr(self)))
+        modlog.debug("Adding %s entries to %s" % (len(entries), repr(self)))
 
         #  Checking structure
         # ------------------------------------------------------------------------------------------------------------ #
         if not force:
-
-            # - Loading the structure information -#
-            try:
-                with open(_structure_file, "r") as struc_file:
-                    _struct = json.load(struc_file)
-            except FileNotFoundError:
-                modlog.exception(
-                    "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
-                raise PyHPC_Error(
-                    "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
-            except json.JSONDecoder:
-                modlog.exception(
-                    "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
-                raise PyHPC_Error(
-                    "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
-
-            #  Cleaning up the structure
-            # -------------------------------------------------------------------------------------------------------- #
-            ##- Trying to add any issues -##
-            generation_time = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
-            new_entries = {}
-            for item, data in entries.items():
-                new = data.copy()
-
-                # - Adding necessary headers -#
-                for header, obj in zip(["information", "meta", "simulations", "core", "action_log"],
-                                       ["", {}, {}, {}, {}]):
-                    if header not in data:
-                        new[header] = obj
-
-                # - Dealing with specialized items -#
-                if "dateCreated" not in new["meta"]:
-                    new["meta"]["dateCreated"] = generation_time
-                if "lastEdited" not in new["meta"]:
-                    new["meta"]["lastEdited"] = generation_time
-
-                new_entries[item] = new
-            entries = new_entries
-
-            for item, data in entries.items():
-                if not check_dictionary_structure(_struct["SimulationLog"]["format"], data):
-                    raise SyntaxError(
-                        "SimulationLog %s failed to add entry %s due to item %s which failed to match structure." % (
-                            repr(self), entries, item))
-
+            entries = prepare_entries("SimulationLog", entries, self)
         else:
             modlog.warning("parameter ``force`` was specified in execution of SimulationLog.add on %s." % (repr(self)))
 
         #  Adding
         # ------------------------------------------------------------------------------------------------------------ #
-        self.raw = {**self.raw, **entries}
+        self.raw.update(entries)
+
+        for item, data in entries.items():
+            self._record_operation([item], data)
+            self._invalidate(item)
 
         #  Managing Saves
         # ------------------------------------------------------------------------------------------------------------ #
         if auto_save:
-            self.save()
+            self._flush()
+
+    def bulk_add(self, entries, force=False):
+        """
+        Adds entries at any level of the ``SimulationLog`` in a single pass and a single write. Entries are grouped by
+        their parent so that each group is validated at once, and either all of the entries are added or (if any
+        fails to match the structure) none are.
+
+        Parameters
+        ----------
+        entries : dict
+            The entries to add, keyed by their key path: ``ic`` or ``(ic,)`` for initial conditions, ``(ic, nml)`` for
+            simulations and ``(ic, nml, output)`` for outputs. Parents are added before their children, so a single
+            call may add an initial condition along with its simulations and outputs.
+        force : bool
+            Forces the addition regardless of if the entries meet the standard format.
+
+        Returns
+        -------
+        None
+
+        Examples
+        --------
+        .. code-block:: python
+
+            simlog.bulk_add({(ic, nml, output): {"meta": {"path": output}} for output in outputs})
+        """
+        groups = {}
+        for key, data in entries.items():
+            key = (key,) if isinstance(key, str) else tuple(key)
+            groups.setdefault(key[:-1], {})[key[-1]] = data
+
+        modlog.debug("Bulk adding %s entries in %s groups to %s." % (len(entries), len(groups), repr(self)))
+
+        with self.batch():
+            for parent in sorted(groups, key=len):
+                if len(parent) == 0:
+                    self.add(groups[parent], auto_save=False, force=force)
+                elif len(parent) == 1:
+                    self.ics[parent[0]].add(groups[parent], auto_save=False, force=force)
+                else:
+                    self.ics[parent[0]].sims[parent[1]].add(groups[parent], auto_save=False, force=force)
+
+    def get_disk_usage(self, refresh=True) -> dict:
+        """
+        Fetches the disk usage of the output directories of each of the initial conditions in the log from the disk
+        usage index.
+
+        Parameters
+        ----------
+        refresh : bool
+            If ``True``, the index is refreshed for every output directory first. Otherwise the cached usage is used.
+
+        Returns
+        -------
+        dict of {str : tuple}
+            The total ``(bytes, inodes)`` of the output directories of each initial condition (``None`` if none of
+            them are indexed).
+        """
+        outputs = {ic: [output for sim in data.get("simulations", {}).values() for output in sim.get("outputs", {})]
+                   for ic, data in self.raw.items()}
+        if refresh:
+            self.disk_usage.refresh([output for directories in outputs.values() for output in directories])
+        return {ic: self.disk_usage.total(directories) for ic, directories in outputs.items()}
+
+    def bulk_delete(self, entries, remove_files=True, dry_run=False, max_workers=None):
+        """
+        Deletes entries at any level of the ``SimulationLog`` along with their files (initial condition files, ``.nml``
+        files and output directories) in a single pass and a single write. The files are removed in parallel with
+        ``file_management.delete_paths``.
+
+        Parameters
+        ----------
+        entries : list
+            The key paths of the entries to delete: ``ic`` or ``(ic,)`` for initial conditions, ``(ic, nml)`` for
+            simulations and ``(ic, nml, output)`` for outputs.
+        remove_files : bool
+            If ``False``, only the entries are removed from the log.
+        dry_run : bool
+            If ``True``, nothing is deleted and the report accounts for what would be.
+        max_workers : int, optional
+            The maximum number of threads used to remove the files.
+
+        Returns
+        -------
+        DeletionReport
+            The number and size of the files and the number of directories removed.
+        """
+        keys = [(key,) if isinstance(key, str) else tuple(key) for key in entries]
+
+        #  Collecting the files
+        # ------------------------------------------------------------------------------------------------------------ #
+        paths = []
+        for key in keys:
+            ic = self.raw[key[0]]
+            if len(key) == 3:
+                paths.append(key[2])
+                continue
+
+            sims = ic.get("simulations", {}) if len(key) == 1 else {key[1]: ic["simulations"][key[1]]}
+            for nml, sim in sims.items():
+                paths += [nml] + list(sim.get("outputs", {}).keys())
+            if len(key) == 1:
+                paths.append(key[0])
+
+        modlog.debug("Bulk deleting %s entries (%s paths) from %s." % (len(keys), len(paths), repr(self)))
+        report = delete_paths(paths if remove_files else [], dry_run=dry_run, max_workers=max_workers)
+
+        if dry_run:
+            return report
+
+        #  Removing the entries
+        # ------------------------------------------------------------------------------------------------------------ #
+        with self.batch():
+            for key in sorted(keys, key=len):
+                path = [key[0]] + (["simulations", key[1]] if len(key) > 1 else []) + (
+                    ["outputs", key[2]] if len(key) > 2 else [])
+                try:
+                    parent = reduce(operator.getitem, path[:-1], self.raw)
+                    del parent[path[-1]]
+                except KeyError:
+                    continue  # -> already removed with its parent.
+
+                self._record_operation(path, delete=True)
+                self._invalidate(*key[:2])
+
+        return report
 
     def save(self):
         """
@@ -337,15 +704,224 @@ class SimulationLog:
         Returns
         -------
         None
+
+        Notes
+        -----
+        Because changes made directly to ``self.raw`` cannot be tracked, this always writes the **entire** log.
         """
         #  Debugging
         # ------------------------------------------------------------------------------------------------------------ #
         modlog.debug("Saving %s." % repr(self))
 
+        if self._batch_depth:
+            # - Deferred until the batch exits -#
+            self._full_save_pending = True
+            return None
+
         #  Saving
         # ------------------------------------------------------------------------------------------------------------ #
-        with open(self.path, "w+") as simlog_file:
-            json.dump(self.raw, simlog_file, cls=NonStandardEncoder)
+        with self.backend.lock():
+            if self.backend.version() != self._version:
+                modlog.warning(
+                    "%s was changed by another process since it was loaded. Saving in full overwrites those changes."
+                    % repr(self))
+            self._write_archives()
+            self.backend.commit(self.raw, operations=None)
+            self._version = self.backend.version()
+
+        self._operations, self._detached = [], 0
+        self._reindex()
+
+    def _record_operation(self, path: list, value=None, delete=False):
+        """
+        Records a change to ``self.raw`` at ``path`` so that it can be passed to the backend on the next write.
+
+        Parameters
+        ----------
+        path : list
+            The key path of the change in ``self.raw``.
+        value : any
+            The new value at ``path``.
+        delete : bool
+            ``True`` if the item at ``path`` was removed.
+
+        Returns
+        -------
+        None
+        """
+        if delete:
+            self._operations.append({"op": "del", "path": list(path)})
+        else:
+            if self.compact and isinstance(value, dict):
+                compact_record(value, intern_keys=False)  # -> new records are added to the log as they are.
+            self._operations.append({"op": "set", "path": list(path), "value": value})
+
+    def _load(self):
+        """Loads the raw data of the log from the backend (compacting it if ``self.compact``)."""
+        raw = self.backend.load(lazy=self.lazy)
+        return compact_log(raw) if self.compact else raw
+
+    def _flush(self):
+        """
+        Writes all of the recorded operations through the backend.
+
+        Returns
+        -------
+        None
+        """
+        if self._batch_depth:
+            # - Deferred until the batch exits -#
+            return None
+
+        modlog.debug("Flushing %s operations on %s." % (len(self._operations), repr(self)))
+        with self.backend.lock(self._operations):
+            if self.backend.changed(self._version, self._operations):
+                # - Another process has written to the log, merging -#
+                modlog.debug("%s was changed by another process. Merging %s operations." % (
+                    repr(self), len(self._operations)))
+                self.raw = self._load()
+                self._invalidate()
+
+            # - Wrappers from before a merge write into the old data, so the operations are always re-applied. -#
+            operations = []
+            for operation in self._operations:
+                if apply_operation(self.raw, operation):
+                    operations.append(operation)
+                else:
+                    modlog.warning("Dropped the change to %s of %s: the record was deleted by another process." % (
+                        operation["path"], repr(self)))
+
+            self._write_archives()
+            self.backend.commit(self.raw, operations=operations)
+            self._version = self.backend.version()
+
+        self._operations, self._detached = [], 0
+
+    def _trim_action_log(self, path: list, action_log: dict):
+        """
+        Rolls the oldest entries of ``action_log`` (belonging to the object at the key ``path``) into the archive if
+        it holds more than ``CONFIG["System"]["SimulationLog"]["action_log_limit"]`` entries. The archive is written
+        along with the next write of the log.
+
+        Returns
+        -------
+        None
+        """
+        limit = CONFIG["System"]["SimulationLog"]["action_log_limit"]
+        if not limit or len(action_log) <= limit:
+            return None
+
+        records = self._archive_pending.setdefault(path[0], [])
+        for key in list(action_log.keys())[:len(action_log) - limit]:
+            records.append({"path": list(path[1:]), "key": key, "entry": action_log.pop(key)})
+            self._record_operation(list(path) + ["action_log", key], delete=True)
+
+    def _write_archives(self):
+        """Writes the pending archived action log entries."""
+        for ic, records in self._archive_pending.items():
+            self.archive.append(ic, records)
+        self._archive_pending = {}
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager which defers all of the writes made inside of it (by ``add``, ``log``, ``delete``,
+        ``__setitem__``, ``save``, etc.) and commits them in a single write when it exits.
+
+        If an exception is raised inside of the context, nothing is written and the log is reloaded from disk (the
+        changes made in the context, and any other unsaved changes, are rolled back).
+
+        Batches may be nested, in which case only the outermost batch writes or rolls back.
+
+        Returns
+        -------
+        SimulationLog
+            The simulation log itself.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            with simlog.batch():
+                simlog.ics[ic].add({nml: {...}})
+                simlog.ics[ic].sims[nml].log("Created nml.", action="RAMSES-BUILD")
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.rollback()
+            raise
+
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            if self._full_save_pending:
+                self._full_save_pending = False
+                self.save()
+            else:
+                self._flush()
+
+    #: Alias of ``batch``.
+    transaction = batch
+
+    def savepoint(self) -> tuple:
+        """
+        Marks the unsaved changes, so that the changes made after the mark can be discarded with ``rollback`` while
+        those made before it are kept.
+
+        Returns
+        -------
+        tuple
+            The savepoint, to be passed to ``rollback``.
+
+        Raises
+        ------
+        PyHPC_Error
+            If a full save is pending (the changes made directly to ``self.raw`` can't be replayed).
+
+        Notes
+        -----
+        The values of the operations share their objects with ``self.raw``, so they are copied (once) here to keep
+        the later changes out of them.
+        """
+        if self._full_save_pending:
+            raise PyHPC_Error("Can't mark the unsaved changes of %s while a full save is pending." % repr(self))
+
+        for operation in self._operations[self._detached:]:
+            if "value" in operation:
+                operation["value"] = copy.deepcopy(operation["value"])
+        self._detached = len(self._operations)
+        return len(self._operations), {ic: len(records) for ic, records in self._archive_pending.items()}
+
+    def rollback(self, savepoint=None):
+        """
+        Discards the unsaved changes and reloads the simulation log from disk.
+
+        Parameters
+        ----------
+        savepoint : tuple, optional
+            The savepoint returned by ``savepoint``. If given, only the changes made after it are discarded and those
+            made before it are re-applied to the reloaded log.
+
+        Returns
+        -------
+        None
+        """
+        operations, archived = savepoint if savepoint is not None else (0, {})
+        modlog.debug("Rolling back %s unsaved operations on %s." % (len(self._operations) - operations, repr(self)))
+        with self.backend.lock():
+            self.raw = self._load()
+            self._version = self.backend.version()
+        self._operations = self._operations[:operations]
+        self._detached = min(self._detached, operations)
+        for operation in self._operations:
+            apply_operation(self.raw, copy.deepcopy(operation))  # -> keeps the operations detached from the log.
+        self._archive_pending = {ic: records[:archived[ic]] for ic, records in self._archive_pending.items()
+                                 if archived.get(ic)}
+        self._full_save_pending = False
+        self._invalidate()
 
 
 class InitCon:
@@ -372,6 +948,8 @@ class InitCon:
 
     """
 
+    __slots__ = ("parent", "name", "raw", "_sims")
+
     def __init__(self, name: str, raw: dict, parent=None):
         #: ``self.parent`` is a reference to the parent object.
         self.parent = parent
@@ -381,16 +959,18 @@ class InitCon:
         #: ``self.raw`` is the core information in the ``InitCon`` object.
         self.raw = raw
 
+        # - Cached wrapper objects -#
+        self._sims = ChildCache(self, SimRec, lambda ic: ic.raw["simulations"])
+
     # ---------------------------------------------------------------------------------------------------------------- #
     # Managing Properties   ========================================================================================== #
     # ---------------------------------------------------------------------------------------------------------------- #
     @property
     def sims(self):
         """``self.sims`` contains all the ``SimRec`` objects in the simulation."""
-        try:
-            return {k: SimRec(k, data, parent=self) for k, data in self.raw["simulations"].items()}
-        except KeyError:
+        if "simulations" not in self.raw:
             return None
+        return self._sims
 
     @property
     def listed(self) -> dict:
@@ -469,7 +1049,13 @@ class InitCon:
     def __setitem__(self, keys: list, value):
         if not isinstance(keys, list):
             keys = [keys]
-        self.__getitem__(keys[:-1])[keys[-1]] = value
+
+        if len(keys) > 1:
+            self.sims[keys[0]][keys[1:]] = value
+        else:
+            self.raw["simulations"][keys[0]] = value.raw if isinstance(value, SimRec) else value
+            self.parent._record_operation([self.name, "simulations", keys[0]], self.raw["simulations"][keys[0]])
+            self.parent._invalidate(self.name, keys[0])
 
     def __len__(self):
         return len(self.sims)
@@ -480,7 +1066,13 @@ class InitCon:
     def __delitem__(self, key_list):
         if not isinstance(key_list, list):
             key_list = [key_list]
-        del self.__getitem__(key_list[:-1])[key_list[-1]]
+
+        if len(key_list) > 1:
+            del self.sims[key_list[0]][key_list[1:]]
+        else:
+            del self.raw["simulations"][key_list[0]]
+            self.parent._record_operation([self.name, "simulations", key_list[0]], delete=True)
+            self.parent._invalidate(self.name, key_list[0])
 
     def __iter__(self):
         return iter(self.raw)
@@ -515,69 +1107,66 @@ class InitCon:
         """
         #  Debugging
         # ------------------------------------------------------------------------------------------------------------ #
-        modlog.debug("Adding %s to %s" % (entries, repr(self)))
+        modlog.debug("Adding %s entries to %s" % (len(entries), repr(self)))
 
         #  Checking structure
         # ------------------------------------------------------------------------------------------------------------ #
         if not force:
-
-            # - Loading the structure information -#
-            try:
-                with open(_structure_file, "r") as struc_file:
-                    _struct = json.load(struc_file)
-            except FileNotFoundError:
-                modlog.exception(
-                    "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
-                raise PyHPC_Error(
-                    "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
-            except json.JSONDecoder:
-                modlog.exception(
-                    "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
-                raise PyHPC_Error(
-                    "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
-
-            #  Cleaning up the structure
-            # -------------------------------------------------------------------------------------------------------- #
-            ##- Trying to add any issues -##
-            generation_time = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
-            new_entries = {}
-            for item, data in entries.items():
-                new = data.copy()
-
-                # - Adding necessary headers -#
-                for header, obj in zip(["information", "meta", "action_log", "core", "outputs", "components"],
-                                       ["", {}, {}, {}, {}, {}]):
-                    if header not in data:
-                        new[header] = obj
-
-                # - Dealing with specialized items -#
-                if "dateCreated" not in new["meta"]:
-                    new["meta"]["dateCreated"] = generation_time
-                if "lastEdited" not in new["meta"]:
-                    new["meta"]["lastEdited"] = generation_time
-                if "software" not in new["meta"]:
-                    new["meta"]["software"] = "NA"
-
-                new_entries[item] = new
-            entries = new_entries
-
-            for item, data in entries.items():
-                if not check_dictionary_structure(_struct["InitCon"]["format"], data):
-                    raise SyntaxError(
-                        "InitCon %s failed to add entry %s due to item %s which failed to match structure." % (
-                            repr(self), entries, item))
-
+            entries = prepare_entries("InitCon", entries, self)
         else:
             modlog.warning("parameter ``force`` was specified in execution of InitCon.add on %s." % (repr(self)))
 
         #  Adding
         # ------------------------------------------------------------------------------------------------------------ #
-        self.raw["simulations"] = {**self.raw["simulations"], **entries}
+        self.raw["simulations"].update(entries)
+
+        for item, data in entries.items():
+            self.parent._record_operation([self.name, "simulations", item], data)
+            self.parent._invalidate(self.name, item)
 
         #  Managing Saves
         # ------------------------------------------------------------------------------------------------------------ #
         if auto_save:
-            self.parent.save()
+            self.parent._flush()
+
+    def get_disk_usage(self, refresh=True) -> dict:
+        """
+        Fetches the disk usage of the output directories of each of the simulations of the ``InitCon`` from the disk
+        usage index of the ``SimulationLog``.
+
+        Parameters
+        ----------
+        refresh : bool
+            If ``True``, the index is refreshed for the output directories first. Otherwise the cached usage is used.
+
+        Returns
+        -------
+        dict of {str : tuple}
+            The total ``(bytes, inodes)`` of the output directories of each simulation (``None`` if none of them are
+            indexed).
+        """
+        outputs = {sim: list(data.get("outputs", {}).keys()) for sim, data in self.raw.get("simulations", {}).items()}
+        if refresh:
+            self.parent.disk_usage.refresh([output for directories in outputs.values() for output in directories])
+        return {sim: self.parent.disk_usage.total(directories) for sim, directories in outputs.items()}
+
+    def get_action_log(self, archived=True) -> dict:
+        """
+        Fetches the action log of the ``InitCon``.
+
+        Parameters
+        ----------
+        archived : bool
+            If ``True``, the entries which have been archived are included (before the current entries).
+
+        Returns
+        -------
+        dict
+            The action log entries by key.
+        """
+        if not archived:
+            return dict(self.raw["action_log"])
+        return {**self.parent.archive.entries(self.name), **self.raw["action_log"]}
 
     def save(self):
         """
@@ -590,10 +1179,12 @@ class InitCon:
         Notes
         -----
         .. attention::
-            This function is implemented by calling ``self.parent.save()``, which will cause the **entire** ``parent`` instance
-            to save all the changes in the ``SimulationLog``, not just those relevant to this instance of ``InitCon``.
+            This function writes the entire ``InitCon`` entry along with any other pending changes in the parent
+            ``SimulationLog``. Depending on the backend, this may still rewrite the entire log file.
         """
-        self.parent.save()
+        self.parent._record_operation([self.name], self.raw)
+        self.parent._reindex(self.name)
+        self.parent._flush()
 
     def delete(self, force=False):
         """
@@ -630,37 +1221,17 @@ class InitCon:
                 print(prefix_text + "Found %s as subobject." % item)
             print("+---------------------------------+")
             yn = input(prefix_text + "DELETE all materials and sub-objects? [y,N]: ")
-            if yn in ["y", "Y"]:
-                print(prefix_text + "DELETE sub-objects...")
-                for item in self.sims:
-                    try:
-                        item.delete(force=True)
-                    except Exception:
-                        modlog.exception("Failed to delete %s while deleting %s." % (item, self))
-                        print(prefix_text + "DELETE FAILED for %s." % item)
-
-                print(prefix_text + "DELETE %s..." % self)
-
-                try:
-                    os.remove(self.name)
-                except FileNotFoundError:
-                    print(prefix_text + "The file %s corresponding to %s doesn't exist." % (self.name, self))
+            remove_files = yn in ["y", "Y"]
         else:
-            for item in self.sims:
-                try:
-                    item.delete(force=True)
-                except Exception:
-                    modlog.exception("Failed to delete %s while deleting %s." % (item, self))
-                    print(prefix_text + "DELETE FAILED for %s." % item)
-            print(prefix_text + "DELETE %s..." % self)
-
-            try:
-                os.remove(self.name)
-            except FileNotFoundError:
-                print(prefix_text + "The file %s corresponding to %s doesn't exist." % (self.name, self))
+            remove_files = True
 
-        del self.parent.raw[self.name]
-        self.parent.save()
+        print(prefix_text + "DELETE %s..." % self)
+        report = self.parent.bulk_delete([self.name], remove_files=remove_files)
+        print(prefix_text + str(report))
+        for path in report.missing:
+            print(prefix_text + "The file %s corresponding to %s doesn't exist." % (path, self))
+        for path, message in report.errors:
+            print(prefix_text + "DELETE FAILED for %s: %s" % (path, message))
 
     def log(self, message, action, auto_save=True, **kwargs):
         """
@@ -683,15 +1254,19 @@ class InitCon:
         -------
         None
 
+        Notes
+        -----
+        The ``file`` and ``lineno`` of the caller are only recorded if ``CONFIG["System"]["SimulationLog"]
+        ["capture_caller"]`` is ``True``. Otherwise they are ``None``.
         """
         #  Managing the required kwargs
         # ------------------------------------------------------------------------------------------------------------ #
-        caller = getframeinfo(stack()[1][0])  # -> grabbing frame info
+        filename, lineno = (None, None) if "lineno" in kwargs else get_caller()  # -> already given by ``SimRec.log``.
         req_entries = {  # These are the required keys that are always present in the entry.
             "msg"   : message,
             "act"   : action,
-            "lineno": caller.lineno,
-            "file"  : caller.filename,
+            "lineno": lineno,
+            "file"  : filename,
             "time"  : datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
 
         }
@@ -702,12 +1277,14 @@ class InitCon:
 
         #  Logging
         # ------------------------------------------------------------------------------------------------------------ #
-        log_time = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
+        log_time = new_log_key()
 
         self.raw["action_log"][log_time] = entries
+        self.parent._record_operation([self.name, "action_log", log_time], entries)
+        self.parent._trim_action_log([self.name], self.raw["action_log"])
 
         if auto_save:
-            self.parent.save()
+            self.parent._flush()
 
 
 class SimRec:
@@ -738,6 +1315,8 @@ class SimRec:
     ```
     """
 
+    __slots__ = ("parent", "name", "raw")
+
     def __init__(self, name, data, parent=None):
         #  Initializing the core variables.
         # ------------------------------------------------------------------------------------------------------------ #
@@ -764,6 +1343,67 @@ class SimRec:
     def listed(self) -> dict:
         return self.raw["outputs"]
 
+    def get_snapshots(self, refresh=True) -> dict:
+        """
+        Fetches the snapshots (``output_XXXXX``) in each of the output directories of the ``SimRec`` from the
+        snapshot index of the ``SimulationLog``.
+
+        Parameters
+        ----------
+        refresh : bool
+            If ``True``, the index is refreshed for the output directories which have changed first.
+
+        Returns
+        -------
+        dict of {str : list of str}
+            The snapshot names for each output directory.
+        """
+        index = self.parent.parent.snapshots
+        if refresh:
+            index.refresh(self.outputs.keys())
+        return {output: index.snapshots(output) for output in self.outputs}
+
+    def get_disk_usage(self, refresh=True) -> dict:
+        """
+        Fetches the disk usage of each of the output directories of the ``SimRec`` from the disk usage index of the
+        ``SimulationLog``.
+
+        Parameters
+        ----------
+        refresh : bool
+            If ``True``, the index is refreshed for the output directories first. Otherwise the cached usage is used.
+
+        Returns
+        -------
+        dict of {str : tuple}
+            The ``(bytes, inodes)`` of each output directory (``None`` if it isn't indexed).
+        """
+        index = self.parent.parent.disk_usage
+        if refresh:
+            index.refresh(self.outputs.keys())
+        return {output: index.usage(output) for output in self.outputs}
+
+    def get_catalog(self, output, refresh=True) -> dict:
+        """
+        Fetches the cataloged metadata of the snapshots in the output directory ``output`` of the ``SimRec``. See
+        ``PyHPC.PyHPC_System.snapshot_management.read_snapshot`` for the available metadata.
+
+        Parameters
+        ----------
+        output : str
+            The output directory.
+        refresh : bool
+            If ``True``, the snapshot index of the directory is refreshed first.
+
+        Returns
+        -------
+        dict of {str : dict}
+            The metadata of each snapshot by name.
+        """
+        if output not in self.outputs:
+            raise KeyError("%s is not an output of %s." % (output, repr(self)))
+        return self.parent.parent.snapshots.catalog(output, refresh=refresh)
+
     @property
     def core(self):
         """``self.core``  contains all the core information for this entry."""
@@ -837,6 +1477,8 @@ class SimRec:
         if not isinstance(keys, list):
             keys = [keys]
         self.__getitem__(keys[:-1])[keys[-1]] = value
+        self.parent.parent._record_operation(self._path + keys, value)
+        self.parent.parent._reindex(self.parent.name, self.name)
 
     def __len__(self):
         return len(self.outputs)
@@ -860,6 +1502,8 @@ class SimRec:
         if not isinstance(key_list, list):
             key_list = [key_list]
         del self.__getitem__(key_list[:-1])[key_list[-1]]
+        self.parent.parent._record_operation(self._path + key_list, delete=True)
+        self.parent.parent._reindex(self.parent.name, self.name)
 
     def __iter__(self):
         return iter(self.raw)
@@ -890,15 +1534,19 @@ class SimRec:
         -------
         None
 
+        Notes
+        -----
+        The ``file`` and ``lineno`` of the caller are only recorded if ``CONFIG["System"]["SimulationLog"]
+        ["capture_caller"]`` is ``True``. Otherwise they are ``None``.
         """
         #  Managing the required kwargs
         # ------------------------------------------------------------------------------------------------------------ #
-        caller = getframeinfo(stack()[1][0])  # -> grabbing frame info
+        filename, lineno = get_caller()
         req_entries = {  # These are the required keys that are always present in the entry.
             "msg"   : message,
             "act"   : action,
-            "lineno": caller.lineno,
-            "file"  : caller.filename,
+            "lineno": lineno,
+            "file"  : filename,
             "time"  : datetime.now().strftime('%m-%d-%Y_%H-%M-%S'),
             "object": str(object_rec) if object_rec else "Self"
 
@@ -910,19 +1558,63 @@ class SimRec:
 
         #  Logging
         # ------------------------------------------------------------------------------------------------------------ #
-        log_time = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
+        log_time = new_log_key()
 
         self.raw["action_log"][log_time] = entries
+        self.parent.parent._record_operation(self._path + ["action_log", log_time], entries)
+        self.parent.parent._trim_action_log(self._path, self.raw["action_log"])
 
         if object_rec:
             self.raw["outputs"][object_rec]["action_log"][log_time] = entries
+            self.parent.parent._record_operation(self._path + ["outputs", object_rec, "action_log", log_time], entries)
+            self.parent.parent._trim_action_log(self._path + ["outputs", object_rec],
+                                                self.raw["outputs"][object_rec]["action_log"])
 
-        self.parent.log(message,action,object_rec = self.name,**kwargs,level="SimRec")
+        self.parent.log(message, action, auto_save=False, object_rec=self.name,
+                        **{"file": filename, "lineno": lineno, **kwargs}, level="SimRec")
         if auto_save:
-            self.parent.parent.save()
+            self.parent.parent._flush()
+
+    @property
+    def _path(self) -> list:
+        """The key path of this ``SimRec`` in the ``SimulationLog.raw`` dictionary."""
+        return [self.parent.name, "simulations", self.name]
+
+    def get_action_log(self, output=None, archived=True) -> dict:
+        """
+        Fetches the action log of the ``SimRec`` or of one of its outputs.
+
+        Parameters
+        ----------
+        output : str, optional
+            The output to fetch the action log of. If ``None``, the ``SimRec``'s own action log is fetched.
+        archived : bool
+            If ``True``, the entries which have been archived are included (before the current entries).
+
+        Returns
+        -------
+        dict
+            The action log entries by key.
+        """
+        path, current = self._path[1:], self.raw["action_log"]
+        if output is not None:
+            path, current = path + ["outputs", output], self.raw["outputs"][output]["action_log"]
+
+        if not archived:
+            return dict(current)
+        return {**self.parent.parent.archive.entries(self.parent.name, path), **current}
 
     def save(self):
-        self.parent.parent.save()
+        """
+        Saves the info contained in ``SimRec`` to file.
+
+        Returns
+        -------
+        None
+        """
+        self.parent.parent._record_operation(self._path, self.raw)
+        self.parent.parent._reindex(self.parent.name, self.name)
+        self.parent.parent._flush()
 
     def delete(self, force=False):
         """
@@ -959,36 +1651,17 @@ class SimRec:
                 print(prefix_text + "Found %s as subobject." % item)
             print("+---------------------------------+")
             yn = input(prefix_text + "DELETE all materials and sub-objects? [y,N]: ")
-            if yn in ["y", "Y"]:
-                print(prefix_text + "DELETE sub-objects...")
-                for item in self.outputs:
-                    try:
-                        shutil.rmtree(item)
-                    except Exception:
-                        modlog.exception("Failed to delete %s while deleting %s." % (item, self))
-                        print(prefix_text + "DELETE FAILED for %s." % item)
-                print(prefix_text + "DELETE %s..." % self)
-
-                try:
-                    os.remove(self.name)
-                except FileNotFoundError:
-                    print(prefix_text + "The file %s corresponding to %s doesn't exist." % (self.name, self))
+            remove_files = yn in ["y", "Y"]
         else:
-            for item in self.outputs:
-                try:
-                    shutil.rmtree(item)
-                except Exception:
-                    modlog.exception("Failed to delete %s while deleting %s." % (item, self))
-                    print(prefix_text + "DELETE FAILED for %s." % item)
-            print(prefix_text + "DELETE %s..." % self)
-
-            try:
-                os.remove(self.name)
-            except FileNotFoundError:
-                print(prefix_text + "The file %s corresponding to %s doesn't exist." % (self.name, self))
+            remove_files = True
 
-        del self.parent.raw[self.name]
-        self.parent.parent.save()
+        print(prefix_text + "DELETE %s..." % self)
+        report = self.parent.parent.bulk_delete([(self.parent.name, self.name)], remove_files=remove_files)
+        print(prefix_text + str(report))
+        for path in report.missing:
+            print(prefix_text + "The file %s corresponding to %s doesn't exist." % (path, self))
+        for path, message in report.errors:
+            print(prefix_text + "DELETE FAILED for %s: %s" % (path, message))
 
     def add(self, entries, auto_save=True, force=False):
         """
@@ -1021,73 +1694,469 @@ class SimRec:
         """
         #  Debugging
         # ------------------------------------------------------------------------------------------------------------ #
-        modlog.debug("Adding %s to %s" % (entries, repr(self)))
+        modlog.debug("Adding %s entries to %s" % (len(entries), repr(self)))
 
         #  Checking structure
         # ------------------------------------------------------------------------------------------------------------ #
         if not force:
-
-            # - Loading the structure information -#
-            try:
-                with open(_structure_file, "r") as struc_file:
-                    _struct = json.load(struc_file)
-            except FileNotFoundError:
-                modlog.exception(
-                    "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
-                raise PyHPC_Error(
-                    "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
-            except json.JSONDecoder:
-                modlog.exception(
-                    "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
-                raise PyHPC_Error(
-                    "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
-
-            #  Cleaning up the structure
-            # -------------------------------------------------------------------------------------------------------- #
-            ##- Trying to add any issues -##
-            generation_time = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
-            new_entries = {}
-            for item, data in entries.items():
-                new = data.copy()
-
-                # - Adding necessary headers -#
-                for header, obj in zip(["information", "meta", "action_log"], ["", {}, {}]):
-                    if header not in data:
-                        new[header] = obj
-
-                # - Dealing with specialized items -#
-                if "dateCreated" not in new["meta"]:
-                    new["meta"]["dateCreated"] = generation_time
-                if "isRun" not in new["meta"]:
-                    new["meta"]["isRun"] = False
-                if "slurm_path" not in new["meta"]:
-                    new["meta"]["slurm_path"] = "None"
-
-                new_entries[item] = new
-            entries = new_entries
-
-            for item, data in entries.items():
-                if not check_dictionary_structure(_struct["SimRec"]["format"], data):
-                    raise SyntaxError(
-                        "InitCon %s failed to add entry %s due to item %s which failed to match structure." % (
-                            repr(self), entries, item))
-
+            entries = prepare_entries("SimRec", entries, self)
         else:
             modlog.warning("parameter ``force`` was specified in execution of InitCon.add on %s." % (repr(self)))
 
         #  Adding
         # ------------------------------------------------------------------------------------------------------------ #
-        self.raw["outputs"] = {**self.raw["outputs"], **entries}
+        self.raw["outputs"].update(entries)
+
+        for item, data in entries.items():
+            self.parent.parent._record_operation(self._path + ["outputs", item], data)
+        self.parent.parent._reindex(self.parent.name, self.name)
 
         #  Managing Saves
         # ------------------------------------------------------------------------------------------------------------ #
         if auto_save:
-            self.parent.parent.save()
+            self.parent.parent._flush()
+
+
+class ChildCache(Mapping):
+    """
+    Identity map of the child wrapper objects (``InitCon`` or ``SimRec``) of a simulation log object. Children are
+    only constructed when first accessed and the same object is returned on later accesses.
+
+    Parameters
+    ----------
+    parent : SimulationLog or InitCon
+        The object owning the children.
+    child_class : type
+        The wrapper class of the children.
+    container : callable
+        Function of ``parent`` returning the raw ``dict`` containing the children's data.
+
+    Notes
+    -----
+    The keys are always read from the live ``container``, so entries added directly to the raw data are still
+    visible. A cached child is also rebuilt if the raw data it wraps is no longer the data in the ``container``.
+    """
+
+    __slots__ = ("_parent", "_child_class", "_container", "_children")
+
+    def __init__(self, parent, child_class, container):
+        self._parent = parent
+        self._child_class = child_class
+        self._container = container
+        self._children = {}
+
+    def __repr__(self):
+        return "ChildCache of %s; len=%s" % (self._parent, len(self))
+
+    def __getitem__(self, key):
+        raw = self._container(self._parent)[key]
+        child = self._children.get(key)
+
+        if child is None or child.raw is not raw:
+            child = self._children[key] = self._child_class(key, raw, parent=self._parent)
+        return child
+
+    def __iter__(self):
+        return iter(self._container(self._parent))
+
+    def __len__(self):
+        return len(self._container(self._parent))
+
+    def __contains__(self, key):
+        return key in self._container(self._parent)
+
+    def cached(self, key):
+        """Returns the cached child at ``key`` without constructing it. ``None`` if it isn't cached."""
+        return self._children.get(key)
+
+    def invalidate(self, key=None):
+        """
+        Drops the cached child at ``key`` (or all of the cached children if ``key`` is ``None``).
+
+        Parameters
+        ----------
+        key : str, optional
+            The key to invalidate.
+
+        Returns
+        -------
+        None
+        """
+        if key is None:
+            self._children = {}
+        else:
+            self._children.pop(key, None)
+
+
+class SearchIndex:
+    """
+    Inverted index (``value -> set of keys``) over a single field of the ``InitCon`` or ``SimRec`` entries of a
+    ``SimulationLog``.
+
+    Parameters
+    ----------
+    field : list of str
+        The key path of the indexed field in the entries' raw data.
+
+    Examples
+    --------
+    >>> index = SearchIndex(["meta", "software"])
+    >>> index.add("a.nml", {"meta": {"software": "R-DICE"}})
+    >>> index.add("b.nml", {"meta": {"software": "RAMSES"}})
+    >>> sorted(index.lookup(["R-DICE", "RAMSES"]))
+    ['a.nml', 'b.nml']
+    >>> index.discard("a.nml")
+    >>> index.lookup("R-DICE")
+    set()
+    """
+
+    def __init__(self, field):
+        #: The key path of the indexed field.
+        self.field = tuple(field)
+        #: The ``value -> set of keys`` map.
+        self.values = {}
+        self._keys = {}  # -> key -> value, used to remove keys without their old data.
+        self._sorted = None  # -> sorted (sort key, value) pairs for range queries.
+
+    def __repr__(self):
+        return "SearchIndex @ %s; len=%s" % (".".join(self.field), len(self._keys))
+
+    def add(self, key, raw):
+        """Indexes the entry ``key`` with raw data ``raw``. Entries missing the field or with unhashable values are skipped."""
+        value = _get_field(raw, self.field)
+        if value is _missing or isinstance(value, (dict, list)):
+            return None
+
+        self.values.setdefault(value, set()).add(key)
+        self._keys[key] = value
+        self._sorted = None
+
+    def discard(self, key):
+        """Removes the entry ``key`` from the index if it is present."""
+        if key not in self._keys:
+            return None
+
+        value = self._keys.pop(key)
+        self.values[value].discard(key)
+        if not len(self.values[value]):
+            del self.values[value]
+        self._sorted = None
+
+    def lookup(self, value) -> set:
+        """
+        Finds the keys matching ``value``. A ``list`` matches any of its items and a ``tuple`` ``(min, max)`` matches
+        the inclusive range.
+        """
+        if isinstance(value, tuple):
+            if self._sorted is None:
+                self._sorted = sorted((_sort_key(v), v) for v in self.values)
+            sort_keys = [item[0] for item in self._sorted]
+
+            start = 0 if value[0] is None else bisect.bisect_left(sort_keys, _sort_key(value[0]))
+            stop = len(sort_keys) if value[1] is None else bisect.bisect_right(sort_keys, _sort_key(value[1]))
+            return set().union(*[self.values[v] for _, v in self._sorted[start:stop]])
+        elif isinstance(value, list):
+            return set().union(*[self.values.get(v, set()) for v in value])
+        else:
+            return set(self.values.get(value, set()))
+
+
+class OwnerIndex:
+    """
+    Reverse maps from the ``.nml`` and output paths in a ``SimulationLog`` to the keys of the entries owning them.
+
+    Examples
+    --------
+    >>> index = OwnerIndex()
+    >>> index.add_ic("ic.dat", {"simulations": {"a.nml": {"outputs": {"/out/a": {}}}}})
+    >>> index.nmls["a.nml"], index.outputs["/out/a"]
+    ('ic.dat', ('ic.dat', 'a.nml'))
+    >>> index.discard("ic.dat")
+    >>> index.outputs
+    {}
+    """
+
+    def __init__(self):
+        #: The ``nml -> ic`` map.
+        self.nmls = {}
+        #: The ``output -> (ic, nml)`` map.
+        self.outputs = {}
+        self._sims = {}  # -> ic -> set of nmls, used to remove entries without their old data.
+        self._sim_outputs = {}  # -> (ic, nml) -> list of outputs.
+
+    def __repr__(self):
+        return "OwnerIndex; nmls=%s, outputs=%s" % (len(self.nmls), len(self.outputs))
+
+    def add_ic(self, ic: str, raw: dict):
+        """Adds the simulations (and their outputs) of the initial condition ``ic`` with the data ``raw``."""
+        for sim, sim_raw in raw.get("simulations", {}).items():
+            self.add_sim(ic, sim, sim_raw)
+
+    def add_sim(self, ic: str, sim: str, raw: dict):
+        """Adds the simulation ``sim`` of the initial condition ``ic`` with the data ``raw``."""
+        self.nmls[sim] = ic
+        self._sims.setdefault(ic, set()).add(sim)
+
+        outputs = list(raw.get("outputs", {}).keys())
+        self._sim_outputs[(ic, sim)] = outputs
+        for output in outputs:
+            self.outputs[output] = (ic, sim)
+
+    def discard(self, ic: str, sim=None):
+        """Removes the simulation ``sim`` of ``ic`` (or all of the simulations of ``ic`` if ``None``)."""
+        sims = list(self._sims.pop(ic, [])) if sim is None else [sim]
+
+        for name in sims:
+            if self.nmls.get(name) == ic:
+                del self.nmls[name]
+            for output in self._sim_outputs.pop((ic, name), []):
+                if self.outputs.get(output) == (ic, name):
+                    del self.outputs[output]
+            if sim is not None and ic in self._sims:
+                self._sims[ic].discard(name)
 
 
 # -------------------------------------------------------------------------------------------------------------------- #
 # Sub Functions ====================================================================================================== #
 # -------------------------------------------------------------------------------------------------------------------- #
+_missing = object()  # -> sentinel for fields which are not present.
+
+
+_last_log_key_time = 0  # -> the time (in microseconds) of the last action log key issued.
+_log_key_lock = t.Lock()
+
+
+def new_log_key() -> str:
+    """
+    Produces a unique key for a new action log entry. Keys have the form ``%m-%d-%Y_%H-%M-%S.%f`` and strictly increase
+    (by at least a microsecond) within a process, so entries logged in quick succession no longer overwrite each other.
+
+    Returns
+    -------
+    str
+        The key.
+    """
+    global _last_log_key_time
+    with _log_key_lock:
+        _last_log_key_time = max(time.time_ns() // 1000, _last_log_key_time + 1)
+        key_time = _last_log_key_time
+
+    return datetime.fromtimestamp(key_time // 1000000).replace(microsecond=key_time % 1000000).strftime(
+        '%m-%d-%Y_%H-%M-%S.%f')
+
+
+def get_caller(depth: int = 2) -> tuple:
+    """
+    Finds the file name and line number of the caller ``depth`` frames up from this function (by default, the caller of
+    the function calling ``get_caller``). Only the frame itself is accessed, unlike ``inspect.stack``, which reads
+    the source context of the entire stack.
+
+    Parameters
+    ----------
+    depth : int
+        The number of frames up the stack to look.
+
+    Returns
+    -------
+    tuple
+        ``(filename, lineno)`` or ``(None, None)`` if ``CONFIG["System"]["SimulationLog"]["capture_caller"]`` is
+        ``False``.
+    """
+    if not CONFIG["System"]["SimulationLog"]["capture_caller"]:
+        return None, None
+
+    frame = sys._getframe(depth)
+    return frame.f_code.co_filename, frame.f_lineno
+
+
+def _get_field(raw, field):
+    """Fetches the value at the key path ``field`` in ``raw``. Returns ``_missing`` if it isn't present."""
+    for key in field:
+        if not isinstance(raw, dict) or key not in raw:
+            return _missing
+        raw = raw[key]
+    return raw
+
+
+def _sort_key(value):
+    """Produces a key so that values of mixed types can be sorted. Dates are sorted chronologically."""
+    if isinstance(value, bool):
+        return 1, value
+    if isinstance(value, (int, float)):
+        return 2, value
+    if isinstance(value, str):
+        try:
+            return 3, datetime.strptime(value, '%m-%d-%Y_%H-%M-%S').isoformat()
+        except ValueError:
+            return 4, value
+    return 5, str(value)
+
+
+def _match_value(found, value) -> bool:
+    """Checks a single field ``found`` against a search ``value`` (see ``SimulationLog.search``)."""
+    if found is _missing:
+        return False
+    if isinstance(value, tuple):
+        return (value[0] is None or _sort_key(found) >= _sort_key(value[0])) and (
+                value[1] is None or _sort_key(found) <= _sort_key(value[1]))
+    elif isinstance(value, list):
+        return found in value
+    return found == value
+
+
+@lru_cache(maxsize=None)
+def read_structure() -> dict:
+    """
+    Reads the ``simlog_struct.json`` file containing the structure of the simulation log objects. The file is only
+    read once, the returned ``dict`` is shared and should not be altered.
+
+    Returns
+    -------
+    dict
+        The structure dictionary.
+    """
+    try:
+        with open(_structure_file, "r") as struc_file:
+            return json.load(struc_file)
+    except FileNotFoundError:
+        modlog.exception(
+            "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
+        raise PyHPC_Error(
+            "Failed to locate the simulation log structure file at %s. Check installation." % _structure_file)
+    except json.JSONDecodeError:
+        modlog.exception(
+            "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
+        raise PyHPC_Error(
+            "Failed to parse the simulation log structure file at %s. Check installation." % _structure_file)
+
+
+def compile_structure(master: dict):
+    """
+    Compiles the ``master`` structure (see ``check_dictionary_structure``) into a validator function. The structure is
+    flattened into a list of key paths and types once, so that validating an entry doesn't need to walk the structure
+    or look up the types again.
+
+    Parameters
+    ----------
+    master : dict
+        The master dictionary containing the structure.
+
+    Returns
+    -------
+    callable
+        Function of a single ``dict`` returning ``True`` if it matches the structure.
+
+    Examples
+    --------
+    >>> validator = compile_structure({"information": "str", "meta": {"isRun": "bool"}, "core": {}})
+    >>> validator({"information": "", "meta": {"isRun": False}, "core": {}})
+    True
+    >>> validator({"information": "", "meta": {"isRun": "no"}, "core": {}})
+    False
+    """
+    checks = []  # -> (key path, type or None if only the presence is checked).
+
+    def _flatten(structure, path):
+        for key, value in structure.items():
+            if isinstance(value, dict) and len(value):
+                checks.append((path + (key,), None))
+                _flatten(value, path + (key,))
+            elif isinstance(value, str):
+                checks.append((path + (key,), getattr(builtins, value)))
+            else:
+                checks.append((path + (key,), None))
+
+    _flatten(master, ())
+
+    def validator(base: dict) -> bool:
+        for path, kind in checks:
+            location = base
+            for key in path:
+                if not isinstance(location, dict) or key not in location:
+                    modlog.debug("key %s not in base (%s), result = False" % (".".join(path), base))
+                    return False
+                location = location[key]
+
+            if kind is not None and not isinstance(location, kind):
+                modlog.debug("key %s of base %s failed to match type %s." % (".".join(path), base, kind.__name__))
+                return False
+        return True
+
+    return validator
+
+
+@lru_cache(maxsize=None)
+def get_validator(level: str):
+    """
+    Fetches the compiled validator for entries of the given ``level`` (``SimulationLog``, ``InitCon`` or ``SimRec``)
+    of the ``simlog_struct.json`` file.
+    """
+    return compile_structure(read_structure()[level]["format"])
+
+
+#: The headers and ``meta`` fields given to new entries of each level if they are missing. Headers are given by the
+#: type of their default and ``meta`` fields left as ``None`` are set to the time of the addition.
+_entry_defaults = {
+    "SimulationLog": ({"information": str, "meta": dict, "simulations": dict, "core": dict, "action_log": dict},
+                      {"dateCreated": None, "lastEdited": None}),
+    "InitCon"      : ({"information": str, "meta": dict, "action_log": dict, "core": dict, "outputs": dict,
+                       "components" : dict},
+                      {"dateCreated": None, "lastEdited": None, "software": "NA"}),
+    "SimRec"       : ({"information": str, "meta": dict, "action_log": dict},
+                      {"dateCreated": None, "isRun": False, "slurm_path": "None"})
+}
+
+
+def prepare_entries(level: str, entries: dict, owner=None) -> dict:
+    """
+    Fills in the missing headers of each of the ``entries`` to be added at ``level`` and validates them against the
+    structure in a single pass.
+
+    Parameters
+    ----------
+    level : str
+        The structure level of the entries (``SimulationLog``, ``InitCon`` or ``SimRec``).
+    entries : dict
+        The entries to prepare.
+    owner : optional
+        The object the entries are being added to. Only used for error messages.
+
+    Returns
+    -------
+    dict
+        The prepared entries.
+
+    Raises
+    ------
+    SyntaxError
+        If any of the entries fails to match the structure.
+    """
+    headers, meta_defaults = _entry_defaults[level]
+    validator = get_validator(level)
+    generation_time = datetime.now().strftime('%m-%d-%Y_%H-%M-%S')
+
+    new_entries = {}
+    for item, data in entries.items():
+        new = data.copy()
+
+        # - Adding necessary headers -#
+        for header, factory in headers.items():
+            if header not in new:
+                new[header] = factory()
+
+        # - Dealing with specialized items -#
+        for key, default in meta_defaults.items():
+            if key not in new["meta"]:
+                new["meta"][key] = generation_time if default is None else default
+
+        if not validator(new):
+            raise SyntaxError("%s failed to add entry %s which failed to match structure." % (repr(owner), item))
+
+        new_entries[item] = new
+
+    return new_entries
+
+
 def check_dictionary_structure(master: dict, base: dict) -> bool:
     """
     checks the dictionary structure of ``base`` against the ``master`` copy and returns ``True`` if the structure
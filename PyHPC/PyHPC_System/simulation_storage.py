@@ -0,0 +1,1652 @@
+"""
+=========================
+Simulation Log Storage
+=========================
+The storage backends used by ``PyHPC.PyHPC_System.simulation_management.SimulationLog`` to read and write the
+underlying log files. The ``SimulationLog`` records every mutation it makes as an *operation* and hands the pending
+operations to its backend when it is saved. Each backend may then decide how much of the log actually needs to be
+written.
+
+Operations
+----------
+Operations are simple ``dict`` objects of the form
+
+.. code-block:: python
+
+    {"op": "set", "path": ["<ic>", "simulations", "<nml>"], "value": {...}}
+    {"op": "del", "path": ["<ic>"]}
+    {"op": "batch", "operations": [...]}
+
+where ``path`` is the key path into ``SimulationLog.raw``. Operations are idempotent, so replaying an operation which
+has already been applied leaves the log unchanged. ``batch`` operations group several operations so that they are
+journaled (and replayed) all together or not at all.
+
+Backends
+--------
+- ``json``: The original behavior. The entire log is written to a single ``.json`` file on each save.
+- ``journal``: Operations are appended to a write-ahead journal (``<log>.journal``) next to the base ``.json`` file
+  and replayed on load. Once the journal grows past ``CONFIG["System"]["SimulationLog"]["journal_compaction_threshold"]``
+  entries it is compacted into the base file.
+- ``sqlite``: The log is stored as indexed tables in a ``.db`` file. Only the rows touched by the operations are
+  written, and ``SQLiteBackend.query`` can be used to search the log without loading it.
+- ``sharded``: Each initial condition is stored in its own file in ``<log>.shards`` next to a small manifest. Only the
+  files of the initial conditions touched by the operations are rewritten.
+
+Concurrency
+-----------
+Every backend provides an advisory (``fcntl``) lock on ``<log>.lock`` through ``SimulationLogBackend.lock`` and a
+``version`` stamp of its files. ``SimulationLog`` holds the lock while loading and writing and, if the log has changed
+since it last synchronized (``SimulationLogBackend.changed``), re-reads the log and re-applies only its own operations
+before writing, so that concurrent processes don't overwrite each other's changes. The ``sharded`` backend locks and
+checks each shard on its own, so that processes writing to different initial conditions don't wait for or merge each
+other's writes.
+
+Lazy Loading
+------------
+The ``json``, ``journal`` and ``sharded`` backends can load a log lazily (``load(lazy=True)``), in which case only the
+locations of the initial conditions are read (the byte offsets from the ``<log>.index`` file, which is rebuilt if it is
+out of date, or the shard files from the manifest) and each initial condition is parsed the first time it is accessed.
+See ``LazyLog``.
+
+Serialization
+-------------
+The base file of the ``json`` and ``journal`` backends is written by a ``Serializer``, selected with
+``CONFIG["System"]["SimulationLog"]["serializer"]``:
+
+- ``json``: JSON, through ``orjson`` if it is installed (and the standard library otherwise).
+- ``msgpack``: ``zstd`` compressed ``msgpack`` (requires the ``msgpack`` and ``zstandard`` packages).
+
+Both store the same data and the format of an existing file is detected when it is read, so the setting can be changed
+at any time. Journals and ``sqlite`` rows are always JSON. Arrays with at least
+``CONFIG["System"]["SimulationLog"]["array_sidecar_threshold"]`` elements are stored in ``.npy`` files in
+``<log>.arrays`` (see ``SidecarArray``).
+
+Archives
+--------
+Action log entries beyond ``CONFIG["System"]["SimulationLog"]["action_log_limit"]`` per object are moved out of the
+log into an ``ActionArchive``, which keeps a compressed file per initial condition in ``<log>.archive``.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import pathlib as pt
+import sqlite3
+import warnings
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # -> not available on Windows, locking is skipped.
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # -> the standard library json module is used.
+    orjson = None
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:  # -> the msgpack serializer is unavailable.
+    msgpack = zstandard = None
+
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
+from PyHPC.PyHPC_Core.utils import NonStandardEncoder
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Operation Management =============================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def record_path(path: list) -> list:
+    """
+    The key path of the record (initial condition, simulation or output) which owns the item at ``path`` of the raw log.
+
+    Examples
+    --------
+    >>> record_path(["ic", "simulations", "nml", "outputs", "out", "action_log", "key"])
+    ['ic', 'simulations', 'nml', 'outputs', 'out']
+    >>> record_path(["ic", "meta", "software"])
+    ['ic']
+    """
+    record = list(path[:1])
+    for container in ("simulations", "outputs"):
+        if len(path) > len(record) + 1 and path[len(record)] == container:
+            record = list(path[:len(record) + 2])
+        else:
+            break
+    return record
+
+
+def _has_record(raw, path: list) -> bool:
+    """``True`` if the record at the key path ``path`` (see ``record_path``) exists in ``raw``."""
+    location = raw
+    for key in path:
+        if not isinstance(location, Mapping) or key not in location:
+            return False
+        location = location[key]
+    return True
+
+
+def apply_operation(raw: dict, operation: dict) -> bool:
+    """
+    Applies a single recorded ``operation`` to the ``raw`` dictionary in place.
+
+    Parameters
+    ----------
+    raw : dict
+        The raw simulation log data.
+    operation : dict
+        The operation to apply. Should have the keys ``op`` and ``path`` and (for ``set``) ``value``.
+
+    Returns
+    -------
+    bool
+        ``False`` if the operation was skipped because the record it changes (or, for a new record, its parent) no
+        longer exists, e.g. because another process deleted it. Records are never re-created by a change to one of
+        their fields.
+
+    Examples
+    --------
+    >>> raw = {"ic": {"simulations": {}}}
+    >>> apply_operation(raw, {"op": "set", "path": ["ic", "simulations", "nml"], "value": {"outputs": {}}})
+    True
+    >>> raw
+    {'ic': {'simulations': {'nml': {'outputs': {}}}}}
+    >>> apply_operation(raw, {"op": "del", "path": ["ic", "simulations", "nml"]})
+    True
+    >>> raw
+    {'ic': {'simulations': {}}}
+    >>> apply_operation(raw, {"op": "set", "path": ["other", "action_log", "key"], "value": {}})
+    False
+    """
+    if operation["op"] == "batch":
+        return all([apply_operation(raw, sub_operation) for sub_operation in operation["operations"]])
+
+    if isinstance(raw, LazyLog) and raw.defer(operation):
+        return True
+
+    path = operation["path"]
+    location = raw
+
+    if operation["op"] == "set":
+        record = record_path(path)
+        if record == list(path):  # -> a new record: its parent has to exist.
+            record = record_path(path[:-2]) if len(path) > 2 else []
+        if not _has_record(raw, record):
+            return False
+
+        for key in path[:-1]:
+            location = location.setdefault(key, {})
+        location[path[-1]] = operation["value"]
+    elif operation["op"] == "del":
+        for key in path[:-1]:
+            if key not in location:
+                return True
+            location = location[key]
+        location.pop(path[-1], None)
+    else:
+        raise PyHPC_Error("Operation type %s is not recognized." % operation["op"])
+    return True
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Serialization ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+class SidecarArray(np.ndarray):
+    """
+    A ``numpy`` array read back from a sidecar ``.npy`` file. Arrays with at least
+    ``CONFIG["System"]["SimulationLog"]["array_sidecar_threshold"]`` elements are written to their own file in the
+    ``<log>.arrays`` directory and replaced in the log by the reference ``{"__npy__": "<name>.npy"}``.
+
+    Notes
+    -----
+    Sidecars are named by the hash of their contents and loaded as read-only memory maps, so the (known) name is
+    reused when the log is written again. To modify such an array, set a copy (``np.array(array)``) in its place.
+    """
+    #: The name of the sidecar file holding the array.
+    sidecar = None
+
+    def __array_finalize__(self, obj):
+        self.sidecar = None  # -> views of the array don't correspond to its sidecar.
+
+
+class Serializer:
+    """
+    Base class of the serializers used to convert the raw simulation log data to and from ``bytes``.
+
+    Parameters
+    ----------
+    sidecar_directory : str or pt.Path, optional
+        The directory holding the sidecar ``.npy`` files of large arrays. If ``None``, arrays are always stored inline.
+    sidecar_threshold : int, optional
+        The number of elements from which arrays are stored in sidecars (``0`` to store all arrays inline). Defaults to
+        ``CONFIG["System"]["SimulationLog"]["array_sidecar_threshold"]``.
+    """
+    #: The name under which the serializer is registered in ``serializers``.
+    name = None
+
+    def __init__(self, sidecar_directory=None, sidecar_threshold=None):
+        if sidecar_threshold is None:
+            sidecar_threshold = CONFIG["System"]["SimulationLog"]["array_sidecar_threshold"]
+
+        #: The directory of the sidecar ``.npy`` files.
+        self.sidecar_directory = pt.Path(sidecar_directory) if sidecar_directory is not None else None
+        #: The number of elements from which arrays are stored in sidecars.
+        self.sidecar_threshold = sidecar_threshold
+
+    def __repr__(self):
+        return "%s(sidecar_directory=%s)" % (type(self).__name__, self.sidecar_directory)
+
+    def dumps(self, obj) -> bytes:
+        """Serializes ``obj``."""
+        raise NotImplementedError
+
+    def loads(self, data):
+        """Deserializes ``data``, resolving any sidecar references."""
+        raise NotImplementedError
+
+    def default(self, obj):
+        """Converts the objects which the underlying library can't serialize."""
+        if isinstance(obj, np.ndarray):
+            if self.sidecar_directory is not None and 0 < self.sidecar_threshold <= obj.size and obj.dtype != object:
+                return {"__npy__": self.write_sidecar(obj)}
+            return obj.tolist()
+        elif isinstance(obj, np.generic):
+            return obj.item()
+        elif isinstance(obj, Mapping):
+            return dict(obj.items())  # -> e.g. ``ActionLog`` and ``LazyLog``.
+        raise TypeError("Object of type %s is not serializable." % type(obj).__name__)
+
+    def write_sidecar(self, array: np.ndarray) -> str:
+        """
+        Writes ``array`` to its sidecar file (if it doesn't already exist).
+
+        Parameters
+        ----------
+        array : np.ndarray
+            The array to store.
+
+        Returns
+        -------
+        str
+            The name of the sidecar file.
+        """
+        if isinstance(array, SidecarArray) and array.sidecar is not None:
+            return array.sidecar
+
+        array = np.ascontiguousarray(array)
+        digest = hashlib.sha1(("%s%s" % (array.dtype.str, array.shape)).encode("utf-8"))
+        digest.update(memoryview(array).cast("B"))
+        name = "%s.npy" % digest.hexdigest()
+
+        path = pt.Path(self.sidecar_directory, name)
+        if not os.path.exists(path):
+            os.makedirs(self.sidecar_directory, exist_ok=True)
+            temp_path = path.with_name(".%s.tmp" % name)
+            with open(temp_path, "wb") as sidecar_file:
+                np.save(sidecar_file, array)
+            os.replace(temp_path, path)
+            modlog.debug("Wrote the sidecar %s (%s elements)." % (path, array.size))
+        return name
+
+    def resolve(self, obj):
+        """Replaces the sidecar references in ``obj`` (in place) with the arrays they point to."""
+        if isinstance(obj, dict):
+            if len(obj) == 1 and "__npy__" in obj:
+                array = np.load(pt.Path(self.sidecar_directory, obj["__npy__"]), mmap_mode="r").view(SidecarArray)
+                array.sidecar = obj["__npy__"]
+                return array
+            for key, value in obj.items():
+                if isinstance(value, (dict, list)):
+                    obj[key] = self.resolve(value)
+        elif isinstance(obj, list):
+            for index, value in enumerate(obj):
+                if isinstance(value, (dict, list)):
+                    obj[index] = self.resolve(value)
+        return obj
+
+    def _resolve_data(self, obj, data):
+        """Resolves the sidecar references in ``obj`` only if the serialized ``data`` can contain any."""
+        if self.sidecar_directory is None:
+            return obj
+        if (b"__npy__" if isinstance(data, (bytes, bytearray)) else "__npy__") not in data:
+            return obj
+        return self.resolve(obj)
+
+
+class JSONSerializer(Serializer):
+    """
+    The ``json`` serializer. Uses ``orjson`` when it is installed and the standard library ``json`` module otherwise;
+    both read the output of the other.
+
+    Notes
+    -----
+    ``orjson`` writes non-finite floats as ``null``. Logs written by the standard library with ``NaN`` values are
+    still read (through the standard library).
+    """
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, default=self.default).encode("utf-8")
+
+    def loads(self, data):
+        if orjson is not None:
+            try:
+                return self._resolve_data(orjson.loads(data), data)
+            except orjson.JSONDecodeError:
+                pass  # -> e.g. NaN values, which only the standard library reads.
+        return self._resolve_data(json.loads(data), data)
+
+
+class MsgpackSerializer(Serializer):
+    """
+    The ``msgpack`` serializer. The ``msgpack`` encoded data is ``zstd`` compressed. Requires the ``msgpack`` and
+    ``zstandard`` packages.
+    """
+    name = "msgpack"
+
+    def __init__(self, sidecar_directory=None, sidecar_threshold=None):
+        if msgpack is None or zstandard is None:
+            raise PyHPC_Error("The msgpack serializer requires the msgpack and zstandard packages.")
+        super().__init__(sidecar_directory=sidecar_directory, sidecar_threshold=sidecar_threshold)
+
+    def dumps(self, obj) -> bytes:
+        return zstandard.ZstdCompressor().compress(msgpack.packb(obj, default=self.default, use_bin_type=True))
+
+    def loads(self, data):
+        data = zstandard.ZstdDecompressor().decompress(data)
+        return self._resolve_data(msgpack.unpackb(data, raw=False, strict_map_key=False), data)
+
+
+#: The available serializers indexed by their configuration name.
+serializers = {serializer.name: serializer for serializer in [JSONSerializer, MsgpackSerializer]}
+
+#: The leading bytes of ``zstd`` compressed data, which identify the ``msgpack`` serializer.
+_zstd_magic = b"\x28\xb5\x2f\xfd"
+
+
+def get_serializer(serializer=None, sidecar_directory=None) -> Serializer:
+    """
+    Produces a serializer.
+
+    Parameters
+    ----------
+    serializer : str or Serializer, optional
+        The serializer to use. If ``None``, the ``CONFIG["System"]["SimulationLog"]["serializer"]`` setting is used.
+    sidecar_directory : str or pt.Path, optional
+        The directory holding the sidecar ``.npy`` files of large arrays.
+
+    Returns
+    -------
+    Serializer
+        The serializer instance.
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+
+    if serializer is None:
+        serializer = CONFIG["System"]["SimulationLog"]["serializer"]
+
+    if serializer not in serializers:
+        raise PyHPC_Error(
+            "The serializer %s is not recognized. Options are %s." % (serializer, list(serializers.keys())))
+
+    return serializers[serializer](sidecar_directory=sidecar_directory)
+
+
+def detect_serializer(data: bytes) -> str:
+    """
+    Determines the name of the serializer which produced ``data`` from its leading bytes.
+
+    Examples
+    --------
+    >>> detect_serializer(b'{"ic": {}}')
+    'json'
+    """
+    return "msgpack" if data[:4] == _zstd_magic else "json"
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Backends =========================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+class SimulationLogBackend:
+    """
+    Base class for all of the ``SimulationLog`` storage backends.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log file.
+    """
+    #: The name under which the backend is registered in ``backends``.
+    name = None
+
+    def __init__(self, path):
+        #: The path to the underlying log file.
+        self.path = pt.Path(path)
+
+        self._lock_file = None
+        self._lock_depth = 0
+        self._json_serializer = None
+
+    def __repr__(self):
+        return "%s @ %s" % (type(self).__name__, self.path)
+
+    @property
+    def lock_path(self):
+        """The path to the lock file corresponding to this log."""
+        return self.path.with_name(self.path.name + ".lock")
+
+    @property
+    def files(self) -> list:
+        """The files which make up the stored log."""
+        return [self.path]
+
+    @property
+    def arrays_directory(self):
+        """The directory holding the sidecar ``.npy`` files of the large arrays in the log."""
+        return self.path.with_name(self.path.name + ".arrays")
+
+    @property
+    def json_serializer(self) -> Serializer:
+        """The ``JSONSerializer`` used for the parts of the log which are always stored as JSON."""
+        if self._json_serializer is None:
+            self._json_serializer = JSONSerializer(sidecar_directory=self.arrays_directory)
+        return self._json_serializer
+
+    @contextmanager
+    def lock(self, operations=None):
+        """
+        Context manager holding an exclusive advisory lock on the log for the duration of the context. The lock is
+        re-entrant within a single backend.
+
+        Parameters
+        ----------
+        operations : list of dict, optional
+            The operations about to be committed. Backends which store the initial conditions separately only lock
+            the ones the operations touch. If ``None``, the whole log is locked.
+
+        Returns
+        -------
+        None
+        """
+        if fcntl is None:
+            yield None
+            return
+
+        if not self._lock_depth:
+            self._lock_file = open(self.lock_path, "a")
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+
+        self._lock_depth += 1
+        try:
+            yield None
+        finally:
+            self._lock_depth -= 1
+            if not self._lock_depth:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
+
+    def version(self) -> tuple:
+        """
+        Produces a stamp of the stored log which changes whenever the log is written.
+
+        Returns
+        -------
+        tuple
+            The inode, modification time and size of each of the ``files`` (``None`` for missing files).
+        """
+        return tuple(_stamp(file) for file in self.files)
+
+    def changed(self, version, operations=None) -> bool:
+        """
+        Checks if the stored log has been written (by another process) since ``version``.
+
+        Parameters
+        ----------
+        version : tuple
+            The ``version`` of the log when it was last synchronized.
+        operations : list of dict, optional
+            The operations about to be committed. Backends which store the initial conditions separately only check
+            the ones the operations touch. If ``None``, the whole log is checked.
+
+        Returns
+        -------
+        bool
+            ``True`` if the log has to be re-read before the operations are committed.
+        """
+        return self.version() != version
+
+    def load(self, lazy=False) -> dict:
+        """
+        Loads the raw simulation log data.
+
+        Parameters
+        ----------
+        lazy : bool
+            If ``True`` and the backend supports it, the initial conditions are only parsed when first accessed.
+            Backends which don't support lazy loading load the entire log.
+
+        Returns
+        -------
+        dict or LazyLog
+            The raw data of the simulation log.
+        """
+        raise NotImplementedError
+
+    def commit(self, raw: dict, operations=None) -> None:
+        """
+        Writes the changes made to ``raw`` to disk.
+
+        Parameters
+        ----------
+        raw : dict
+            The full, current, raw data of the simulation log.
+        operations : list of dict or None
+            The operations which have been applied to ``raw`` since the last commit. If ``None``, the changes are
+            unknown and the entire log must be written.
+
+        Returns
+        -------
+        None
+        """
+        raise NotImplementedError
+
+
+class JSONBackend(SimulationLogBackend):
+    """
+    The standard ``.json`` backend. The entire log is rewritten on every commit.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the base simulation log file.
+    serializer : str or Serializer, optional
+        The serializer used to write the base file. Defaults to ``CONFIG["System"]["SimulationLog"]["serializer"]``.
+        The base file is always read with the serializer which wrote it.
+    """
+    name = "json"
+
+    def __init__(self, path, serializer=None):
+        super().__init__(path)
+
+        #: The serializer used to write the base file.
+        self.serializer = get_serializer(serializer, sidecar_directory=self.arrays_directory)
+
+    @property
+    def journal_path(self):
+        """The path to the write-ahead journal corresponding to this log."""
+        return self.path.with_name(self.path.name + ".journal")
+
+    @property
+    def index_path(self):
+        """The path to the index of the initial condition offsets in the base file (used for lazy loading)."""
+        return self.path.with_name(self.path.name + ".index")
+
+    @property
+    def files(self) -> list:
+        return [self.path, self.journal_path]
+
+    def load(self, lazy=False) -> dict:
+        raw, replayed = self._load_base(lazy=lazy)
+
+        if replayed:
+            # - A journal left over from the journal backend has been applied. -#
+            modlog.warning("Replayed %s leftover journal entries onto %s." % (replayed, self))
+
+        return raw
+
+    def commit(self, raw: dict, operations=None) -> None:
+        modlog.debug("Writing %s in full." % self)
+        self._write_base(raw)
+
+    def _load_base(self, lazy=False):
+        """Loads the base file and replays the journal (if any) onto it. Returns the data and the replay count."""
+        with open(self.path, "rb") as simfile:
+            serializer = self._serializer_for(simfile.read(4))
+
+        if lazy and serializer.name == "json":
+            raw = LazyLog(self.path, self._read_index(), loads=serializer.loads)
+        else:
+            if lazy:
+                modlog.debug("%s is stored with %s, loading it in full." % (self, serializer))
+            with open(self.path, "rb") as simfile:
+                raw = serializer.loads(simfile.read())
+
+        if not os.path.exists(self.journal_path):
+            return raw, 0
+
+        operations = self._read_journal()
+        for operation in operations:
+            apply_operation(raw, operation)
+
+        return raw, len(operations)
+
+    def _write_base(self, raw: dict) -> None:
+        """Writes ``raw`` to the base file (via a temporary file), updates the index and clears the journal."""
+        temp_path = self.path.with_name(".%s.tmp" % self.path.name)
+        offsets, position = {}, 1
+
+        with open(temp_path, "wb") as simlog_file:
+            if self.serializer.name == "json":
+                # - Written one initial condition at a time to track their offsets. -#
+                simlog_file.write(b"{")
+                for count, (key, value) in enumerate(raw.items()):
+                    prefix = (b", " if count else b"") + self.serializer.dumps(key) + b": "
+                    data = self.serializer.dumps(value)
+                    simlog_file.write(prefix + data)
+
+                    offsets[key] = (position + len(prefix), position + len(prefix) + len(data))
+                    position += len(prefix) + len(data)
+                simlog_file.write(b"}")
+            else:
+                simlog_file.write(self.serializer.dumps(dict(raw.items())))
+        os.replace(temp_path, self.path)
+
+        if self.serializer.name == "json":
+            self._write_index(offsets)
+        elif os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+        # - The base file now contains everything in the journal -#
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def _serializer_for(self, data: bytes) -> Serializer:
+        """The serializer to read the base file starting with ``data`` with."""
+        name = detect_serializer(data)
+        if name == self.serializer.name:
+            return self.serializer
+        return get_serializer(name, sidecar_directory=self.arrays_directory)
+
+    def _base_stamp(self) -> list:
+        """The stamp of the base file used to check that the index is up to date."""
+        stat = os.stat(self.path)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _read_index(self) -> dict:
+        """Reads the offsets of each initial condition in the base file, rebuilding the index if it is out of date."""
+        try:
+            with open(self.index_path, "r") as index_file:
+                index = json.load(index_file)
+            if index["stamp"] == self._base_stamp():
+                return {key: tuple(value) for key, value in index["offsets"].items()}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        modlog.debug("Rebuilding the index of %s." % self)
+        with open(self.path, "rb") as simfile:
+            offsets = index_json_object(simfile.read())
+        self._write_index(offsets)
+        return offsets
+
+    def _write_index(self, offsets: dict) -> None:
+        """Writes the index of ``offsets`` for the current base file."""
+        try:
+            temp_path = self.index_path.with_name(".%s.tmp" % self.index_path.name)
+            with open(temp_path, "w") as index_file:
+                json.dump({"stamp": self._base_stamp(), "offsets": offsets}, index_file)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # - The index is only an optimization, it is rebuilt on the next lazy load. -#
+            modlog.exception("Failed to write the index of %s." % self)
+
+    def _read_journal(self) -> list:
+        """Reads all of the complete operations stored in the journal."""
+        operations = []
+        with open(self.journal_path, "rb") as journal_file:
+            for lineno, line in enumerate(journal_file):
+                if not line.strip():
+                    continue
+                try:
+                    operations.append(self.json_serializer.loads(line))
+                except ValueError:
+                    # - An interrupted write leaves a partial trailing line which is simply dropped. -#
+                    modlog.warning("Skipping corrupted line %s of journal %s." % (lineno, self.journal_path))
+        return operations
+
+
+class JournalBackend(JSONBackend):
+    """
+    The journaled ``.json`` backend. Operations are appended to ``<log>.journal`` and the base ``.json`` file is only
+    rewritten once the journal passes the compaction threshold or when a full save is requested.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the base simulation log file.
+    compaction_threshold : int, optional
+        The number of journal entries after which the journal is compacted into the base file. Defaults to
+        ``CONFIG["System"]["SimulationLog"]["journal_compaction_threshold"]``.
+    serializer : str or Serializer, optional
+        The serializer used to write the base file. The journal itself is always JSON.
+    """
+    name = "journal"
+
+    def __init__(self, path, compaction_threshold=None, serializer=None):
+        super().__init__(path, serializer=serializer)
+
+        if compaction_threshold is None:
+            compaction_threshold = CONFIG["System"]["SimulationLog"]["journal_compaction_threshold"]
+
+        #: The number of journal entries allowed before compaction.
+        self.compaction_threshold = compaction_threshold
+        #: The number of entries currently in the journal.
+        self.journal_length = 0
+
+    def load(self, lazy=False) -> dict:
+        raw, self.journal_length = self._load_base(lazy=lazy)
+        modlog.debug("Replayed %s journal entries onto %s." % (self.journal_length, self))
+        return raw
+
+    def commit(self, raw: dict, operations=None) -> None:
+        if operations is None or self.journal_length + len(operations) > self.compaction_threshold:
+            modlog.debug("Compacting the journal of %s." % self)
+            self._write_base(raw)
+            self.journal_length = 0
+            return None
+
+        if not len(operations):
+            return None
+
+        # - Each commit is a single journal line, so an interrupted write drops the whole commit. -#
+        entry = operations[0] if len(operations) == 1 else {"op": "batch", "operations": operations}
+        with open(self.journal_path, "ab") as journal_file:
+            journal_file.write(self.json_serializer.dumps(entry) + b"\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+        self.journal_length += len(operations)
+        modlog.debug("Appended %s entries to the journal of %s." % (len(operations), self))
+
+
+class SQLiteBackend(SimulationLogBackend):
+    """
+    The ``sqlite`` backend. Initial conditions, simulations, outputs and action log entries are stored as rows in
+    separate tables of a ``.db`` file, indexed by path, software, creation date and action.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log. If the path does not have a ``.db`` or ``.sqlite`` suffix, the database is
+        placed next to it with the suffix ``.db``. If the database doesn't exist but a ``.json`` log does, the
+        ``.json`` log is imported on the first load.
+
+    Notes
+    -----
+    Each row carries the fields of its record in the ``data`` column (with child containers emptied). Only the records
+    touched by the committed operations are written, so logging a single action updates a single row.
+    """
+    name = "sqlite"
+
+    #: The keys of each record type which hold child records rather than data.
+    _containers = {"ic": ("simulations", "action_log"), "sim": ("outputs", "action_log"), "output": ("action_log",)}
+
+    _schema = """
+    CREATE TABLE IF NOT EXISTS ics (name TEXT PRIMARY KEY, software TEXT, dateCreated TEXT, created TEXT,
+                                    data TEXT NOT NULL);
+    CREATE TABLE IF NOT EXISTS sims (ic TEXT, path TEXT, software TEXT, dateCreated TEXT, created TEXT,
+                                     data TEXT NOT NULL, PRIMARY KEY (ic, path));
+    CREATE TABLE IF NOT EXISTS outputs (ic TEXT, sim TEXT, path TEXT, dateCreated TEXT, created TEXT,
+                                        data TEXT NOT NULL, PRIMARY KEY (ic, sim, path));
+    CREATE TABLE IF NOT EXISTS action_log (ic TEXT, sim TEXT, output TEXT, key TEXT, act TEXT, time TEXT,
+                                           data TEXT NOT NULL, PRIMARY KEY (ic, sim, output, key));
+    CREATE INDEX IF NOT EXISTS ics_software ON ics (software);
+    CREATE INDEX IF NOT EXISTS ics_created ON ics (created);
+    CREATE INDEX IF NOT EXISTS sims_path ON sims (path);
+    CREATE INDEX IF NOT EXISTS sims_software ON sims (software);
+    CREATE INDEX IF NOT EXISTS sims_created ON sims (created);
+    CREATE INDEX IF NOT EXISTS outputs_path ON outputs (path);
+    CREATE INDEX IF NOT EXISTS outputs_created ON outputs (created);
+    CREATE INDEX IF NOT EXISTS action_log_act ON action_log (act);
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+
+        if self.path.suffix in [".db", ".sqlite"]:
+            #: The path to the ``.json`` log to import from (if the database doesn't yet exist).
+            self.source_path = None
+        else:
+            self.source_path = self.path
+            self.path = self.path.with_suffix(".db")
+
+        self._connection = None
+
+    @property
+    def files(self) -> list:
+        return [self.path, self.path.with_name(self.path.name + "-wal")]
+
+    def version(self) -> tuple:
+        # - The file change counter in the database header is incremented by every write transaction. -#
+        try:
+            with open(self.path, "rb") as database:
+                database.seek(24)
+                counter = int.from_bytes(database.read(4), "big")
+        except FileNotFoundError:
+            counter = None
+        return (counter,) + super().version()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The (lazily opened) connection to the database."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(self._schema)
+        return self._connection
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Loading and Committing ========================================================================================= #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    def load(self, lazy=False) -> dict:
+        if not os.path.exists(self.path) and self.source_path is not None:
+            modlog.info("Importing %s into the sqlite database %s." % (self.source_path, self.path))
+            self.commit(JSONBackend(self.source_path).load(), operations=None)
+
+        cursor = self.connection.cursor()
+        loads = self.json_serializer.loads
+        raw = {name: loads(data) for name, data in cursor.execute("SELECT name, data FROM ics ORDER BY rowid")}
+
+        # - Rows whose parent is missing (left by older versions) are skipped rather than breaking the load. -#
+        orphans = 0
+        for ic, path, data in cursor.execute("SELECT ic, path, data FROM sims ORDER BY rowid"):
+            if ic not in raw:
+                orphans += 1
+                continue
+            raw[ic].setdefault("simulations", {})[path] = loads(data)
+
+        for ic, sim, path, data in cursor.execute("SELECT ic, sim, path, data FROM outputs ORDER BY rowid"):
+            owner = self._lookup(raw, ic, sim)
+            if owner is None:
+                orphans += 1
+                continue
+            owner.setdefault("outputs", {})[path] = loads(data)
+
+        for ic, sim, output, key, data in cursor.execute(
+                "SELECT ic, sim, output, key, data FROM action_log ORDER BY rowid"):
+            owner = self._lookup(raw, ic, sim, output)
+            if owner is None:
+                orphans += 1
+                continue
+            owner.setdefault("action_log", {})[key] = loads(data)
+
+        if orphans:
+            modlog.warning("Skipped %s rows of %s which belong to records that don't exist." % (orphans, self))
+        return raw
+
+    def commit(self, raw: dict, operations=None) -> None:
+        with self.connection as connection:  # -> a single transaction.
+            cursor = connection.cursor()
+            if operations is None:
+                modlog.debug("Writing %s in full." % self)
+                for table in ["ics", "sims", "outputs", "action_log"]:
+                    cursor.execute("DELETE FROM %s" % table)
+                for name, record in raw.items():
+                    self._write_record(cursor, (name, "", ""), record)
+            else:
+                for operation in operations:
+                    self._commit_path(cursor, raw, operation["path"])
+
+    def _commit_path(self, cursor, raw, path):
+        """Writes the rows affected by a change at ``path`` in ``raw``."""
+        # - Determining the record which owns the path -#
+        keys, remainder = [path[0], "", ""], list(path[1:])
+        if len(remainder) >= 2 and remainder[0] == "simulations":
+            keys[1], remainder = remainder[1], remainder[2:]
+            if len(remainder) >= 2 and remainder[0] == "outputs":
+                keys[2], remainder = remainder[1], remainder[2:]
+
+        record = self._lookup(raw, *keys)
+
+        if record is None:
+            self._delete_record(cursor, keys)
+        elif not len(remainder) or remainder[0] in ["simulations", "outputs"]:
+            self._write_record(cursor, keys, record)
+        elif remainder[0] == "action_log" and len(remainder) == 2:
+            if remainder[1] in record.get("action_log", {}):
+                self._write_action(cursor, keys, remainder[1], record["action_log"][remainder[1]])
+            else:
+                cursor.execute("DELETE FROM action_log WHERE ic=? AND sim=? AND output=? AND key=?",
+                               (*keys, remainder[1]))
+        elif remainder[0] == "action_log":
+            cursor.execute("DELETE FROM action_log WHERE ic=? AND sim=? AND output=?", keys)
+            for key, entry in record.get("action_log", {}).items():
+                self._write_action(cursor, keys, key, entry)
+        else:
+            self._write_row(cursor, keys, record)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Row Management ================================================================================================= #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    @staticmethod
+    def _lookup(raw, ic, sim="", output=""):
+        """Finds the record corresponding to the ``(ic, sim, output)`` keys in ``raw``. Returns ``None`` if missing."""
+        try:
+            record = raw[ic]
+            if sim:
+                record = record["simulations"][sim]
+            if output:
+                record = record["outputs"][output]
+        except (KeyError, TypeError):
+            return None
+        return record
+
+    @staticmethod
+    def _level(keys):
+        return "output" if keys[2] else ("sim" if keys[1] else "ic")
+
+    def _write_row(self, cursor, keys, record):
+        """Writes the row (only) of the record at ``keys``."""
+        level = self._level(keys)
+        data = self.json_serializer.dumps(
+            {k: ({} if k in self._containers[level] else v) for k, v in record.items()}).decode("utf-8")
+        meta = record.get("meta", {}) if isinstance(record.get("meta", {}), dict) else {}
+        date_created = meta.get("dateCreated")
+
+        if level == "ic":
+            cursor.execute("INSERT INTO ics VALUES (?,?,?,?,?) ON CONFLICT (name) DO UPDATE SET "
+                           "software=excluded.software, dateCreated=excluded.dateCreated, created=excluded.created, "
+                           "data=excluded.data",
+                           (keys[0], meta.get("software"), date_created, _iso_date(date_created), data))
+        elif level == "sim":
+            cursor.execute("INSERT INTO sims VALUES (?,?,?,?,?,?) ON CONFLICT (ic, path) DO UPDATE SET "
+                           "software=excluded.software, dateCreated=excluded.dateCreated, created=excluded.created, "
+                           "data=excluded.data",
+                           (keys[0], keys[1], meta.get("software"), date_created, _iso_date(date_created), data))
+        else:
+            cursor.execute("INSERT INTO outputs VALUES (?,?,?,?,?,?) ON CONFLICT (ic, sim, path) DO UPDATE SET "
+                           "dateCreated=excluded.dateCreated, created=excluded.created, data=excluded.data",
+                           (*keys, date_created, _iso_date(date_created), data))
+
+    def _write_action(self, cursor, keys, key, entry):
+        """Writes a single action log entry belonging to the record at ``keys``."""
+        cursor.execute("INSERT INTO action_log VALUES (?,?,?,?,?,?,?) ON CONFLICT (ic, sim, output, key) DO UPDATE "
+                       "SET act=excluded.act, time=excluded.time, data=excluded.data",
+                       (*keys, key, entry.get("act"), entry.get("time"),
+                        self.json_serializer.dumps(entry).decode("utf-8")))
+
+    def _write_record(self, cursor, keys, record):
+        """Writes the record at ``keys`` along with all of its children."""
+        self._delete_record(cursor, keys, children_only=True)
+        self._write_row(cursor, keys, record)
+
+        for key, entry in record.get("action_log", {}).items():
+            self._write_action(cursor, keys, key, entry)
+
+        level = self._level(keys)
+        if level == "ic":
+            for sim, child in record.get("simulations", {}).items():
+                self._write_record(cursor, (keys[0], sim, ""), child)
+        elif level == "sim":
+            for output, child in record.get("outputs", {}).items():
+                self._write_record(cursor, (keys[0], keys[1], output), child)
+
+    def _delete_record(self, cursor, keys, children_only=False):
+        """Removes the record at ``keys`` and all of its children."""
+        level = self._level(keys)
+        if level == "ic":
+            if not children_only:
+                cursor.execute("DELETE FROM ics WHERE name=?", (keys[0],))
+            cursor.execute("DELETE FROM sims WHERE ic=?", (keys[0],))
+            cursor.execute("DELETE FROM outputs WHERE ic=?", (keys[0],))
+            cursor.execute("DELETE FROM action_log WHERE ic=?", (keys[0],))
+        elif level == "sim":
+            if not children_only:
+                cursor.execute("DELETE FROM sims WHERE ic=? AND path=?", keys[:2])
+            cursor.execute("DELETE FROM outputs WHERE ic=? AND sim=?", keys[:2])
+            cursor.execute("DELETE FROM action_log WHERE ic=? AND sim=?", keys[:2])
+        else:
+            if not children_only:
+                cursor.execute("DELETE FROM outputs WHERE ic=? AND sim=? AND path=?", keys)
+            cursor.execute("DELETE FROM action_log WHERE ic=? AND sim=? AND output=?", keys)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Queries ======================================================================================================== #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    def query(self, level="output", software=None, action=None, path=None, created_after=None,
+              created_before=None) -> list:
+        """
+        Queries the database for records matching all of the given conditions.
+
+        Parameters
+        ----------
+        level : str
+            The type of record to search for. Can be ``ic``, ``sim`` or ``output``.
+        software : str or list of str, optional
+            The software of the record (for outputs, the software of the parent simulation).
+        action : str or list of str, optional
+            Only records with at least one action log entry with this ``act`` are returned.
+        path : str or list of str, optional
+            The key (path) of the record.
+        created_after : datetime or str, optional
+            Only records with ``meta.dateCreated`` on or after this time are returned.
+        created_before : datetime or str, optional
+            Only records with ``meta.dateCreated`` on or before this time are returned.
+
+        Returns
+        -------
+        list of tuple
+            The key path of each of the matching records. These are ``(ic,)``, ``(ic, sim)`` or ``(ic, sim, output)``
+            depending on the ``level``.
+
+        Examples
+        --------
+        To find all of the outputs of ``R-DICE`` simulations created this month,
+
+        .. code-block:: python
+
+            backend.query("output", software="R-DICE", created_after=datetime.now().replace(day=1))
+        """
+        table, alias, key_columns = {"ic"    : ("ics", "r", ["r.name"]),
+                                     "sim"   : ("sims", "r", ["r.ic", "r.path"]),
+                                     "output": ("outputs", "r", ["r.ic", "r.sim", "r.path"])}[level]
+        query = "SELECT %s FROM %s %s" % (", ".join(key_columns), table, alias)
+        conditions, parameters = [], []
+
+        def _add_condition(column, value):
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            conditions.append("%s IN (%s)" % (column, ",".join("?" * len(values))))
+            parameters.extend(values)
+
+        if software is not None:
+            if level == "output":
+                query += " JOIN sims s ON s.ic = r.ic AND s.path = r.sim"
+                _add_condition("s.software", software)
+            else:
+                _add_condition("r.software", software)
+        if path is not None:
+            _add_condition(key_columns[-1], path)
+        if created_after is not None:
+            conditions.append("r.created >= ?")
+            parameters.append(_iso_date(created_after))
+        if created_before is not None:
+            conditions.append("r.created <= ?")
+            parameters.append(_iso_date(created_before))
+        if action is not None:
+            owner = ["a.ic = r.%s" % ("name" if level == "ic" else "ic"),
+                     "a.sim = %s" % ("r.path" if level == "sim" else ("r.sim" if level == "output" else "''")),
+                     "a.output = %s" % ("r.path" if level == "output" else "''")]
+            actions = action if isinstance(action, (list, tuple, set)) else [action]
+            conditions.append("EXISTS (SELECT 1 FROM action_log a WHERE %s AND a.act IN (%s))" % (
+                " AND ".join(owner), ",".join("?" * len(actions))))
+            parameters.extend(actions)
+
+        if len(conditions):
+            query += " WHERE " + " AND ".join(conditions)
+
+        return [tuple(row) for row in self.connection.execute(query + " ORDER BY r.rowid", parameters)]
+
+
+class ShardedBackend(SimulationLogBackend):
+    """
+    The sharded backend. Each initial condition is stored in its own shard file in the ``<log>.shards`` directory,
+    along with a small manifest (``manifest.json``) of the shard of each initial condition. A commit only rewrites the
+    shards of the initial conditions touched by its operations, and the manifest only if it adds or removes initial
+    conditions.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log. If the shards don't exist but a ``.json`` log does, the ``.json`` log is
+        imported on the first load.
+    serializer : str or Serializer, optional
+        The serializer used to write the shards. Defaults to ``CONFIG["System"]["SimulationLog"]["serializer"]``. Each
+        shard is read with the serializer which wrote it.
+
+    Notes
+    -----
+    The manifest has the form ``{"generation": int, "shards": {"<ic>": "<file>", ...}}`` and is rewritten (through a
+    new file) whenever initial conditions are added or removed.
+
+    Commits which only change the contents of initial conditions hold a shared lock on ``<log>.lock`` and an
+    exclusive lock on the ``<shard>.lock`` of each shard they write, and are only considered stale if one of those
+    shards was written since it was read. Adding or removing initial conditions, writing the log in full and loading
+    it hold the exclusive lock on ``<log>.lock``.
+    """
+    name = "sharded"
+
+    def __init__(self, path, serializer=None):
+        super().__init__(path)
+
+        #: The serializer used to write the shards.
+        self.serializer = get_serializer(serializer, sidecar_directory=self.arrays_directory)
+        self._manifest = None  # -> the manifest as of the last load or commit.
+        self._stamps = {}  # -> shard name -> the stamp of the shard when it was last read or written.
+
+    @property
+    def shard_directory(self):
+        """The directory holding the manifest and shards."""
+        return self.path.with_name(self.path.name + ".shards")
+
+    @property
+    def manifest_path(self):
+        """The path to the manifest."""
+        return pt.Path(self.shard_directory, "manifest.json")
+
+    @property
+    def files(self) -> list:
+        return [self.manifest_path]
+
+    @staticmethod
+    def shard_name(ic: str) -> str:
+        """The name of the shard file of the initial condition ``ic``."""
+        return "%s-%s.shard" % (pt.Path(ic).name, hashlib.sha1(ic.encode("utf-8")).hexdigest()[:10])
+
+    def read_shard(self, name: str):
+        """Reads the raw data of the initial condition in the shard file ``name``."""
+        with open(pt.Path(self.shard_directory, name), "rb") as shard_file:
+            data = shard_file.read()
+            self._stamps[name] = _stamp(os.fstat(shard_file.fileno()))
+        serializer = detect_serializer(data)
+        if serializer != self.serializer.name:
+            return get_serializer(serializer, sidecar_directory=self.arrays_directory).loads(data)
+        return self.serializer.loads(data)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Locking ======================================================================================================== #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    @contextmanager
+    def lock(self, operations=None):
+        if fcntl is None or operations is None or self._lock_depth or _adds_or_removes(operations):
+            with super().lock():
+                yield None
+            return None
+
+        # - A shared lock on the log (excluding full writes) and an exclusive lock on each shard written -#
+        lock_files = [open(self.lock_path, "a")]
+        try:
+            fcntl.flock(lock_files[0].fileno(), fcntl.LOCK_SH)
+            for ic in sorted(_touched_ics(operations)):  # -> always in the same order, so that writers don't deadlock.
+                lock_files.append(open(pt.Path(self.shard_directory, "%s.lock" % self.shard_name(ic)), "a"))
+                fcntl.flock(lock_files[-1].fileno(), fcntl.LOCK_EX)
+            yield None
+        finally:
+            for lock_file in reversed(lock_files):
+                lock_file.close()  # -> releases its lock.
+
+    def changed(self, version, operations=None) -> bool:
+        if operations is None or _adds_or_removes(operations):
+            if self.version() != version:
+                return True
+            names = list(self._stamps) if operations is None else \
+                [self.shard_name(ic) for ic in _touched_ics(operations)]
+        else:
+            names = [self.shard_name(ic) for ic in _touched_ics(operations)]
+
+        # - Shards which haven't been read yet will be read as they are now -#
+        return any(_stamp(pt.Path(self.shard_directory, name)) != self._stamps[name] for name in names
+                   if name in self._stamps)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Loading and Committing ========================================================================================= #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    def load(self, lazy=False) -> dict:
+        self._manifest = self._read_manifest()
+        self._stamps = {}
+        if not os.path.exists(self.manifest_path) and os.path.exists(self.path):
+            modlog.info("Importing %s into the shards %s." % (self.path, self.shard_directory))
+            self.commit(JSONBackend(self.path).load(), operations=None)
+
+        if lazy:
+            return LazyShards(self, self._manifest["shards"])
+        return {ic: self.read_shard(name) for ic, name in self._manifest["shards"].items()}
+
+    def commit(self, raw: dict, operations=None) -> None:
+        os.makedirs(self.shard_directory, exist_ok=True)
+        if self._manifest is None:
+            self._manifest = self._read_manifest()
+
+        if operations is None:
+            modlog.debug("Writing %s in full." % self)
+            ics = list(raw.keys())
+        else:
+            ics = _touched_ics(operations)
+
+        # - Writing the shards -#
+        for ic in ics:
+            if ic in raw:
+                self._write_shard(ic, raw[ic])
+
+        # - Writing the manifest (if initial conditions were added or removed) -#
+        if operations is None:
+            shards = {ic: self.shard_name(ic) for ic in raw.keys()}
+            previous = self._manifest["shards"]
+        elif any((ic in raw) != (ic in self._manifest["shards"]) for ic in ics):
+            previous = self._read_manifest()["shards"]  # -> other processes may have added initial conditions.
+            shards = dict(previous)
+            for ic in ics:
+                if ic in raw:
+                    shards[ic] = self.shard_name(ic)
+                else:
+                    shards.pop(ic, None)
+        else:
+            shards = previous = None
+
+        if shards is not None and (operations is None or shards != previous):
+            self._manifest = {"generation": self._manifest["generation"] + 1, "shards": shards}
+            self._write_file(self.manifest_path, json.dumps(self._manifest).encode("utf-8"))
+
+            for name in set(previous.values()) - set(shards.values()):
+                self._stamps.pop(name, None)
+                for file in (name, "%s.lock" % name):
+                    try:
+                        os.remove(pt.Path(self.shard_directory, file))
+                    except FileNotFoundError:
+                        pass
+
+        modlog.debug("Wrote %s shards of %s." % (len([ic for ic in ics if ic in raw]), self))
+
+    def _write_shard(self, ic: str, record: dict) -> None:
+        """Writes the shard of the initial condition ``ic`` and records its stamp."""
+        name = self.shard_name(ic)
+        self._write_file(pt.Path(self.shard_directory, name), self.serializer.dumps(record))
+        self._stamps[name] = _stamp(pt.Path(self.shard_directory, name))
+
+    def _read_manifest(self) -> dict:
+        """Reads the manifest (empty if there are no shards yet)."""
+        try:
+            with open(self.manifest_path, "r") as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return {"generation": 0, "shards": {}}
+
+    @staticmethod
+    def _write_file(path, data: bytes) -> None:
+        """Writes ``data`` to ``path`` through a temporary file."""
+        temp_path = path.with_name(".%s.tmp" % path.name)
+        with open(temp_path, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+
+
+def _stamp(file):
+    """The inode, modification time and size of ``file`` (a path or an ``os.stat_result``). ``None`` if missing."""
+    try:
+        stat = file if isinstance(file, os.stat_result) else os.stat(file)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _touched_ics(operations) -> list:
+    """The initial conditions changed by ``operations``."""
+    return list(dict.fromkeys(operation["path"][0] for operation in _flatten_operations(operations)))
+
+
+def _adds_or_removes(operations) -> bool:
+    """``True`` if ``operations`` may add or remove initial conditions (i.e. set or delete one as a whole)."""
+    return any(len(operation["path"]) == 1 for operation in _flatten_operations(operations))
+
+
+def _flatten_operations(operations):
+    """Iterates over the operations in ``operations``, expanding ``batch`` operations."""
+    for operation in operations:
+        if operation["op"] == "batch":
+            yield from _flatten_operations(operation["operations"])
+        else:
+            yield operation
+
+
+def _iso_date(value):
+    """
+    Converts a ``dateCreated`` style string (``%m-%d-%Y_%H-%M-%S``) or ``datetime`` to a sortable ISO string.
+
+    Examples
+    --------
+    >>> _iso_date("06-23-2023_13-27-41")
+    '2023-06-23 13:27:41'
+    >>> _iso_date("not a date") is None
+    True
+    """
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    if not isinstance(value, str):
+        return None
+
+    for date_format in ['%m-%d-%Y_%H-%M-%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']:
+        try:
+            return datetime.strptime(value, date_format).isoformat(sep=" ", timespec="seconds")
+        except ValueError:
+            pass
+    return None
+
+
+#: The available backends indexed by their configuration name.
+backends = {backend.name: backend for backend in [JSONBackend, JournalBackend, SQLiteBackend, ShardedBackend]}
+
+
+def get_backend(path, backend=None) -> SimulationLogBackend:
+    """
+    Produces the storage backend for the simulation log at ``path``.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log.
+    backend : str or SimulationLogBackend, optional
+        The backend to use. If ``None``, the ``CONFIG["System"]["SimulationLog"]["backend"]`` setting is used.
+
+    Returns
+    -------
+    SimulationLogBackend
+        The backend instance.
+    """
+    if isinstance(backend, SimulationLogBackend):
+        return backend
+
+    if backend is None:
+        backend = CONFIG["System"]["SimulationLog"]["backend"]
+
+    if backend not in backends:
+        raise PyHPC_Error(
+            "The simulation log backend %s is not recognized. Options are %s." % (backend, list(backends.keys())))
+
+    return backends[backend](path)
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Lazy Loading ======================================================================================================= #
+# -------------------------------------------------------------------------------------------------------------------- #
+def index_json_object(data: bytes) -> dict:
+    """
+    Finds the byte offsets of the values of each key in the top level of the JSON object ``data``.
+
+    Parameters
+    ----------
+    data : bytes
+        The (``utf-8`` encoded) JSON object.
+
+    Returns
+    -------
+    dict
+        The ``(start, end)`` offsets of each value by key.
+
+    Examples
+    --------
+    >>> data = b'{"a": {"b": 1}, "c": [2, 3]}'
+    >>> index_json_object(data)
+    {'a': (6, 14), 'c': (21, 27)}
+    >>> data[21:27]
+    b'[2, 3]'
+    """
+    # - Decoding as latin-1 keeps the character positions equal to the byte positions. -#
+    text, decoder = data.decode("latin-1"), json.JSONDecoder()
+    skip = lambda position: json.decoder.WHITESPACE.match(text, position).end()
+
+    offsets, position = {}, skip(0)
+    if text[position:position + 1] != "{":
+        raise PyHPC_Error("Failed to index the JSON data; it is not an object.")
+
+    position = skip(position + 1)
+    while text[position:position + 1] != "}":
+        _, key_end = decoder.raw_decode(text, position)
+        key = json.loads(data[position:key_end].decode("utf-8"))
+
+        position = skip(key_end)
+        if text[position:position + 1] != ":":
+            raise PyHPC_Error("Failed to index the JSON data; expected ':' at %s." % position)
+
+        start = skip(position + 1)
+        _, end = decoder.raw_decode(text, start)
+        offsets[key] = (start, end)
+
+        position = skip(end)
+        if text[position:position + 1] == ",":
+            position = skip(position + 1)
+
+    return offsets
+
+
+class LazyLog(MutableMapping):
+    """
+    The raw data of a lazily loaded simulation log. Behaves like the ``dict`` of initial conditions, but each initial
+    condition is only read from the base file and parsed when it is first accessed.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the base ``.json`` file.
+    offsets : dict
+        The ``(start, end)`` byte offsets of each initial condition in the base file.
+    loads : callable, optional
+        The function used to parse each initial condition from its ``bytes``. Defaults to ``json.loads``.
+
+    Attributes
+    ----------
+    transform : callable or None
+        If set, a function applied to each initial condition as it is parsed (e.g. ``compact_record``).
+
+    Notes
+    -----
+    The base file is kept open until every initial condition has been parsed. Because the log is always rewritten
+    through a new file, the initial conditions are still read from the version of the file which was loaded.
+
+    Operations applied to initial conditions which have not yet been parsed are held and applied once they are.
+    Iterating over the values (i.e. writing the log in full) parses every initial condition.
+    """
+    transform = None
+
+    def __init__(self, path, offsets, loads=None):
+        self.path = pt.Path(path)
+        self._loads = loads if loads is not None else json.loads
+        self._file = open(self.path, "rb")
+        self._offsets = dict(offsets)
+        self._unread = set(offsets)  # -> the keys which still have to be read from the file.
+        self._keys = dict.fromkeys(offsets)  # -> the (ordered) keys of the log.
+        self._loaded = {}  # -> the parsed initial conditions.
+        self._pending = {}  # -> key -> operations to apply once the key is parsed.
+
+        if not len(self._unread):
+            self._file.close()
+
+    def __repr__(self):
+        return "LazyLog @ %s; len=%s, loaded=%s" % (self.path, len(self), len(self._loaded))
+
+    def __getitem__(self, key):
+        if key in self._loaded:
+            return self._loaded[key]
+        if key not in self._keys:
+            raise KeyError(key)
+
+        container = {key: self._read(key) if self.transform is None else self.transform(self._read(key))}
+        for operation in self._pending.pop(key, []):
+            apply_operation(container, operation)
+
+        self._loaded[key] = container[key]
+        self._mark_read(key)
+        return self._loaded[key]
+
+    def __setitem__(self, key, value):
+        self._keys[key] = None
+        self._loaded[key] = value
+        self._pending.pop(key, None)
+        self._mark_read(key)
+
+    def __delitem__(self, key):
+        del self._keys[key]
+        self._loaded.pop(key, None)
+        self._pending.pop(key, None)
+        self._mark_read(key)
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    @property
+    def loaded(self) -> list:
+        """The keys of the initial conditions which have been parsed."""
+        return list(self._loaded.keys())
+
+    def _read(self, key):
+        """Reads and parses the initial condition ``key``."""
+        start, end = self._offsets[key]
+        self._file.seek(start)
+        return self._loads(self._file.read(end - start))
+
+    def _mark_read(self, key):
+        """Records that ``key`` no longer needs to be read from the file, closing it once nothing else does."""
+        self._unread.discard(key)
+        if not len(self._unread) and not self._file.closed:
+            self._file.close()
+
+    def defer(self, operation: dict) -> bool:
+        """
+        Holds ``operation`` until its initial condition is parsed if possible.
+
+        Returns
+        -------
+        bool
+            ``True`` if the operation was held, ``False`` if it should be applied directly.
+        """
+        key = operation["path"][0]
+        if len(operation["path"]) < 2 or key in self._loaded or key not in self._keys:
+            return False
+
+        self._pending.setdefault(key, []).append(operation)
+        return True
+
+
+class LazyShards(LazyLog):
+    """
+    The raw data of a lazily loaded ``ShardedBackend`` log. Each initial condition is read from its shard file the
+    first time it is accessed.
+
+    Parameters
+    ----------
+    backend : ShardedBackend
+        The backend of the log.
+    shards : dict
+        The shard file name of each initial condition.
+    """
+
+    def __init__(self, backend, shards):
+        self.path = backend.shard_directory
+        self._backend = backend
+        self._shards = dict(shards)
+        self._keys = dict.fromkeys(shards)
+        self._loaded = {}
+        self._pending = {}
+
+    def __repr__(self):
+        return "LazyShards @ %s; len=%s, loaded=%s" % (self.path, len(self), len(self._loaded))
+
+    def _read(self, key):
+        return self._backend.read_shard(self._shards[key])
+
+    def _mark_read(self, key):
+        pass  # -> there is no shared file to close.
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Action Log Archives ================================================================================================ #
+# -------------------------------------------------------------------------------------------------------------------- #
+class ActionArchive:
+    """
+    Compressed archive of the action log entries which have been rolled out of a simulation log. Each initial condition
+    has its own ``gzip`` compressed file of JSON lines in the ``<log>.archive`` directory, which is only read when
+    its entries are requested.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log.
+
+    Notes
+    -----
+    Each line of an archive file has the form ``{"path": [...], "key": "<key>", "entry": {...}}`` where ``path`` is
+    the key path of the logged object below its initial condition (``[]`` for the initial condition itself).
+    """
+
+    def __init__(self, path):
+        #: The directory containing the archive files.
+        self.directory = pt.Path(path).with_name(pt.Path(path).name + ".archive")
+
+    def __repr__(self):
+        return "ActionArchive @ %s" % self.directory
+
+    def path_for(self, ic: str) -> pt.Path:
+        """The archive file of the initial condition ``ic``."""
+        return pt.Path(self.directory,
+                       "%s-%s.jsonl.gz" % (pt.Path(ic).name, hashlib.sha1(ic.encode("utf-8")).hexdigest()[:10]))
+
+    def append(self, ic: str, records: list) -> None:
+        """
+        Appends ``records`` to the archive of the initial condition ``ic``.
+
+        Parameters
+        ----------
+        ic : str
+            The name of the initial condition.
+        records : list of dict
+            The records to archive. See the notes above.
+
+        Returns
+        -------
+        None
+        """
+        if not len(records):
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        # - Appending writes a new gzip member, which is read back transparently. -#
+        with gzip.open(self.path_for(ic), "at", encoding="utf-8") as archive_file:
+            archive_file.write("".join(json.dumps(record, cls=NonStandardEncoder) + "\n" for record in records))
+
+        modlog.debug("Archived %s action log entries of %s in %s." % (len(records), ic, self))
+
+    def entries(self, ic: str, path=None) -> dict:
+        """
+        Reads the archived action log entries of the initial condition ``ic``.
+
+        Parameters
+        ----------
+        ic : str
+            The name of the initial condition.
+        path : list of str, optional
+            The key path of the logged object below the initial condition. ``[]`` (default) for the initial condition
+            itself.
+
+        Returns
+        -------
+        dict
+            The archived entries (by key) in the order they were archived.
+        """
+        path = list(path) if path is not None else []
+        if not os.path.exists(self.path_for(ic)):
+            return {}
+
+        entries = {}
+        with gzip.open(self.path_for(ic), "rt", encoding="utf-8") as archive_file:
+            for line in archive_file:
+                record = json.loads(line)
+                if record["path"] == path:
+                    entries[record["key"]] = record["entry"]
+        return entries
@@ -0,0 +1,279 @@
+"""
+===================
+Simulation Tables
+===================
+Columnar projections of a ``SimulationLog``. Each level of the log (initial conditions, simulations and outputs) is
+projected onto a ``pandas.DataFrame`` with a row per record and a column per (flattened) field, so that the log can be
+filtered and sorted with vectorized operations instead of walking the raw dictionaries.
+
+The tables are built on first access and afterwards only the rows of the records which have changed are rebuilt. They
+can be exported to Arrow tables or Parquet files if ``pyarrow`` is installed.
+"""
+import logging
+import os
+import pathlib as pt
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # -> the tables can't be exported.
+    pa = pq = None
+
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+#: The levels of the log and the keys of their records which hold child records rather than data.
+levels = {"ic": ("simulations", "action_log"), "sim": ("outputs", "action_log"), "output": ("action_log",)}
+
+#: The names of the index levels of the tables.
+index_names = ["ic", "sim", "output"]
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sub Functions ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def flatten_record(record: dict, exclude=(), prefix="") -> dict:
+    """
+    Flattens the nested fields of ``record`` into a single level with ``.`` separated names.
+
+    Parameters
+    ----------
+    record : dict
+        The record to flatten.
+    exclude : tuple of str
+        The top level keys to leave out (i.e. the child containers).
+    prefix : str
+        The prefix of the names.
+
+    Returns
+    -------
+    dict
+        The flattened fields.
+
+    Examples
+    --------
+    >>> flatten_record({"meta": {"software": "RAMSES", "ncpu": 128}, "outputs": {}}, exclude=("outputs",))
+    {'meta.software': 'RAMSES', 'meta.ncpu': 128}
+    """
+    flat = {}
+    for key, value in record.items():
+        if key in exclude:
+            continue
+
+        if isinstance(value, dict):
+            if len(value):
+                flat.update(flatten_record(value, prefix="%s%s." % (prefix, key)))
+            else:
+                flat["%s%s" % (prefix, key)] = None
+        else:
+            flat["%s%s" % (prefix, key)] = value
+    return flat
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Columnar Log ======================================================================================================= #
+# -------------------------------------------------------------------------------------------------------------------- #
+class ColumnarLog:
+    """
+    The columnar projection of a ``SimulationLog``.
+
+    Parameters
+    ----------
+    simlog : SimulationLog
+        The simulation log to project.
+
+    Notes
+    -----
+    The table of each level is indexed by the ``(ic, sim, output)`` keys of its records, with ``""`` for the keys
+    below the level (e.g. ``("ic_1.dat", "run.nml", "")`` for a simulation). The ``SimulationLog`` reports the records
+    it changes through ``invalidate``; changes made directly to ``SimulationLog.raw`` require a call to
+    ``invalidate()`` to be reflected.
+
+    The tables are shared, so they should be copied before they are modified.
+    """
+
+    def __init__(self, simlog):
+        #: The simulation log being projected.
+        self.simlog = simlog
+        self._frames = None  # -> level -> DataFrame.
+        self._dirty = set()  # -> the key prefixes of the records to rebuild.
+
+    def __repr__(self):
+        return "ColumnarLog of %s; built=%s" % (repr(self.simlog), self._frames is not None)
+
+    def invalidate(self, *path):
+        """
+        Marks the records at ``path`` (``()`` for the whole log, ``(ic,)`` for an initial condition and its children,
+        ``(ic, sim)`` for a simulation and its outputs) to be rebuilt on the next access.
+
+        Returns
+        -------
+        None
+        """
+        if not len(path):
+            self._frames, self._dirty = None, set()
+        elif self._frames is not None:
+            self._dirty.add(tuple(path[:2]))
+
+    def frame(self, level="sim") -> pd.DataFrame:
+        """
+        Fetches the table of a level of the log.
+
+        Parameters
+        ----------
+        level : str
+            The level: ``ic``, ``sim`` or ``output``.
+
+        Returns
+        -------
+        pd.DataFrame
+            The table with a row per record and a column per flattened field.
+        """
+        if level not in levels:
+            raise PyHPC_Error("The level %s is not recognized. Options are %s." % (level, list(levels.keys())))
+
+        if self._frames is None:
+            self._frames = self._build(self._records(self.simlog.raw.keys()))
+            modlog.debug("Built %s." % self)
+        elif len(self._dirty):
+            self._update()
+        return self._frames[level]
+
+    def children(self, *key) -> pd.DataFrame:
+        """
+        Fetches the rows of the direct children of the record at ``key`` (``()`` for the initial conditions).
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows indexed by the names of the children.
+        """
+        frame = self.frame(list(levels.keys())[len(key)])
+
+        mask = np.ones(len(frame), dtype=bool)
+        for position, value in enumerate(key):
+            mask &= np.asarray(frame.index.get_level_values(position) == value)
+
+        children = frame[mask]
+        children.index = children.index.get_level_values(len(key))
+        return children
+
+    def _records(self, ics, prefixes=None) -> dict:
+        """Flattens the records of the initial conditions ``ics`` (within ``prefixes`` if given) by level."""
+        records = {level: ([], []) for level in levels}
+        for ic in ics:
+            if ic not in self.simlog.raw:
+                continue
+            ic_raw = self.simlog.raw[ic]
+            sims = ic_raw.get("simulations", {})
+
+            if prefixes is None or (ic,) in prefixes:
+                records["ic"][0].append((ic, "", ""))
+                records["ic"][1].append(flatten_record(ic_raw, exclude=levels["ic"]))
+            else:
+                sims = {sim: sims[sim] for (_, sim) in [p for p in prefixes if p[0] == ic] if sim in sims}
+
+            for sim, sim_raw in sims.items():
+                records["sim"][0].append((ic, sim, ""))
+                records["sim"][1].append(flatten_record(sim_raw, exclude=levels["sim"]))
+                for output, output_raw in sim_raw.get("outputs", {}).items():
+                    records["output"][0].append((ic, sim, output))
+                    records["output"][1].append(flatten_record(output_raw, exclude=levels["output"]))
+        return records
+
+    @staticmethod
+    def _build(records) -> dict:
+        """Produces the tables of the flattened ``records``."""
+        return {level: pd.DataFrame(rows, index=pd.MultiIndex.from_tuples(keys, names=index_names)
+                                    if len(keys) else pd.MultiIndex.from_tuples([], names=index_names))
+                for level, (keys, rows) in records.items()}
+
+    def _update(self):
+        """Rebuilds the rows of the records marked by ``invalidate``."""
+        # - Prefixes within another are rebuilt with it -#
+        prefixes = {prefix for prefix in self._dirty if len(prefix) == 1 or prefix[:1] not in self._dirty}
+        self._dirty = set()
+
+        new_frames = self._build(self._records(dict.fromkeys(prefix[0] for prefix in prefixes), prefixes=prefixes))
+        for level, frame in self._frames.items():
+            mask = np.zeros(len(frame), dtype=bool)
+            for prefix in prefixes:
+                matches = np.ones(len(frame), dtype=bool)
+                for position, value in enumerate(prefix):
+                    matches &= np.asarray(frame.index.get_level_values(position) == value)
+                mask |= matches
+
+            if mask.any() or len(new_frames[level]):
+                self._frames[level] = pd.concat([frame[~mask], new_frames[level]])
+
+        modlog.debug("Updated %s prefixes of %s." % (len(prefixes), self))
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Exporting ====================================================================================================== #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    def to_arrow(self, level="sim"):
+        """
+        Converts the table of a level of the log to an Arrow table. Requires ``pyarrow``.
+
+        Parameters
+        ----------
+        level : str
+            The level: ``ic``, ``sim`` or ``output``.
+
+        Returns
+        -------
+        pyarrow.Table
+            The table, with the ``(ic, sim, output)`` keys as columns. Columns of mixed types are stored as strings.
+        """
+        if pa is None:
+            raise PyHPC_Error("Exporting the simulation log tables requires pyarrow.")
+
+        frame = self.frame(level).reset_index()
+        for column in frame.columns:
+            if frame[column].dtype == object:
+                try:
+                    pa.array(frame[column])
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    frame[column] = [None if value is None else str(value) for value in frame[column]]
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+    def to_parquet(self, directory) -> list:
+        """
+        Writes the table of each level of the log to ``<directory>/<level>.parquet``. Requires ``pyarrow``.
+
+        Parameters
+        ----------
+        directory : str
+            The directory to write the files to.
+
+        Returns
+        -------
+        list of str
+            The written files.
+        """
+        if pq is None:
+            raise PyHPC_Error("Exporting the simulation log tables requires pyarrow.")
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for level in levels:
+            paths.append(os.path.join(directory, "%s.parquet" % level))
+            pq.write_table(self.to_arrow(level), paths[-1])
+        return paths
@@ -0,0 +1,399 @@
+"""
+=====================
+Snapshot Management
+=====================
+Indexing of the ``output_XXXXX`` snapshots written into the output directories of the simulations in a
+``SimulationLog``. The index is stored next to the simulation log (``<log>.snapshots``) and only the output directories
+whose modification time has changed since they were last indexed are listed again, so that menus and batch tools can
+use the stored snapshot counts instead of listing every directory on the (often slow) file system.
+
+The index also holds a catalog of the metadata of each RAMSES snapshot, read from its ``info_XXXXX.txt`` file and the
+headers of its ``amr_``, ``hydro_`` and ``part_`` files (see ``read_snapshot``), so that snapshots can be selected by
+time or resolution without loading them.
+"""
+import json
+import logging
+import os
+import pathlib as pt
+import re
+import struct
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from PyHPC.PyHPC_Core.configuration import read_config
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+#: The pattern of the snapshot directory names.
+snapshot_pattern = re.compile(r"^output_(\d{5})$")
+
+#: The (name, struct format) of the leading header records of each of the RAMSES binary file types.
+ramses_headers = {
+    "amr"  : [("ncpu", "i"), ("ndim", "i"), ("nx", "3i"), ("nlevelmax", "i"), ("ngridmax", "i"), ("nboundary", "i"),
+              ("ngrid_current", "i")],
+    "hydro": [("ncpu", "i"), ("nvar", "i"), ("ndim", "i"), ("nlevelmax", "i"), ("nboundary", "i"), ("gamma", "d")],
+    "part" : [("ncpu", "i"), ("ndim", "i"), ("npart", "i"), ("localseed", "4i"), ("nstar_tot", "i")]
+}
+
+#: The header fields which are summed over the files of every cpu (the rest are taken from the first file).
+ramses_summed_fields = {"amr": ["ngrid_current"], "hydro": [], "part": ["npart"]}
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Snapshot Index ===================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+class SnapshotIndex:
+    """
+    Index of the ``output_XXXXX`` snapshots in a set of output directories.
+
+    Parameters
+    ----------
+    path : str or pt.Path
+        The path to the simulation log. The index is stored at ``<path>.snapshots``.
+
+    Notes
+    -----
+    Each indexed directory has an entry of the form
+
+    .. code-block:: python
+
+        {"mtime_ns": int, "exists": bool, "snapshots": {"output_00001": {...}, ...}}
+
+    where the snapshot entries hold any cached information about the individual snapshots.
+    """
+
+    def __init__(self, path):
+        #: The path to the index file.
+        self.path = pt.Path(path).with_name(pt.Path(path).name + ".snapshots")
+        self._data = None
+
+    def __repr__(self):
+        return "SnapshotIndex @ %s" % self.path
+
+    def __contains__(self, directory):
+        return str(directory) in self.data
+
+    @property
+    def data(self) -> dict:
+        """The raw index data (read from disk on first access)."""
+        if self._data is None:
+            try:
+                with open(self.path, "r") as index_file:
+                    self._data = json.load(index_file)
+            except FileNotFoundError:
+                self._data = {}
+            except json.JSONDecodeError:
+                modlog.warning("Failed to read the snapshot index %s. It will be rebuilt." % self.path)
+                self._data = {}
+        return self._data
+
+    def save(self):
+        """
+        Writes the index to disk.
+
+        Returns
+        -------
+        None
+        """
+        temp_path = self.path.with_name(".%s.tmp" % self.path.name)
+        with open(temp_path, "w") as index_file:
+            json.dump(self.data, index_file)
+        os.replace(temp_path, self.path)
+
+    def refresh(self, directories, force=False) -> list:
+        """
+        Updates the index of each of the ``directories``. Each directory is only listed again if its modification time
+        has changed since it was last indexed (or if ``force=True``). The index is saved if anything changed.
+
+        Parameters
+        ----------
+        directories : list of str
+            The output directories to refresh.
+        force : bool
+            If ``True``, every directory is listed again.
+
+        Returns
+        -------
+        list of str
+            The directories whose entries changed.
+        """
+        directories = [str(directory) for directory in directories]
+
+        # - Checking the directories (in parallel if enabled, each check is a round trip on networked systems) -#
+        if CONFIG["Computation"]["Parallel"]["threading"] and len(directories) > 1:
+            with ThreadPoolExecutor(max_workers=CONFIG["Computation"]["Parallel"]["max_thread_workers"]) as executor:
+                entries = list(executor.map(lambda directory: self._scan(directory, force), directories))
+        else:
+            entries = [self._scan(directory, force) for directory in directories]
+
+        changed = [directory for directory, entry in zip(directories, entries) if entry is not None]
+        for directory, entry in zip(directories, entries):
+            if entry is not None:
+                self.data[directory] = entry
+
+        modlog.debug("Refreshed %s directories in %s; %s changed." % (len(directories), self, len(changed)))
+        if len(changed):
+            self.save()
+        return changed
+
+    def _scan(self, directory, force=False):
+        """Produces the new entry of ``directory`` or ``None`` if its current entry is up to date."""
+        current = self.data.get(directory)
+
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            if current is not None and not current["exists"]:
+                return None
+            return {"mtime_ns": None, "exists": False, "snapshots": {}}
+
+        if not force and current is not None and current["mtime_ns"] == mtime_ns:
+            return None
+
+        # - Keeping any cached information on the snapshots which are still present -#
+        previous = current["snapshots"] if current is not None else {}
+        with os.scandir(directory) as scanner:
+            names = sorted(entry.name for entry in scanner if snapshot_pattern.match(entry.name) and entry.is_dir())
+
+        return {"mtime_ns": mtime_ns, "exists": True, "snapshots": {name: previous.get(name, {}) for name in names}}
+
+    def exists(self, directory) -> bool:
+        """``True`` if ``directory`` existed when it was last indexed."""
+        return str(directory) in self.data and self.data[str(directory)]["exists"]
+
+    def snapshots(self, directory) -> list:
+        """The names of the snapshots in ``directory`` when it was last indexed."""
+        return list(self.data.get(str(directory), {}).get("snapshots", {}).keys())
+
+    def count(self, directory) -> int:
+        """The number of snapshots in ``directory`` when it was last indexed."""
+        return len(self.data.get(str(directory), {}).get("snapshots", {}))
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # Catalog ======================================================================================================== #
+    # ---------------------------------------------------------------------------------------------------------------- #
+    def catalog(self, directory, refresh=True) -> dict:
+        """
+        Fetches the metadata (see ``read_snapshot``) of each of the snapshots in ``directory``. Snapshots which
+        haven't yet been cataloged are read and the index is saved.
+
+        Parameters
+        ----------
+        directory : str
+            The output directory.
+        refresh : bool
+            If ``True``, the directory is refreshed (see ``refresh``) first.
+
+        Returns
+        -------
+        dict of {str : dict}
+            The metadata of each snapshot by name. Snapshots without an info file (i.e. which are still being
+            written) have empty entries and are read again on the next call.
+        """
+        directory = str(directory)
+        if refresh or directory not in self.data:
+            self.refresh([directory])
+
+        snapshots = self.data[directory]["snapshots"]
+        missing = [name for name, record in snapshots.items() if not len(record)]
+
+        if len(missing):
+            paths = [os.path.join(directory, name) for name in missing]
+            if CONFIG["Computation"]["Parallel"]["threading"] and len(paths) > 1:
+                with ThreadPoolExecutor(
+                        max_workers=CONFIG["Computation"]["Parallel"]["max_thread_workers"]) as executor:
+                    records = list(executor.map(read_snapshot, paths))
+            else:
+                records = [read_snapshot(path) for path in paths]
+
+            for name, record in zip(missing, records):
+                snapshots[name] = record
+            modlog.debug("Cataloged %s snapshots in %s." % (len(missing), directory))
+            self.save()
+
+        return snapshots
+
+    def select(self, directory, refresh=True, **criteria) -> list:
+        """
+        Selects the snapshots in ``directory`` whose ``info`` fields match the ``criteria``.
+
+        Parameters
+        ----------
+        directory : str
+            The output directory.
+        refresh : bool
+            If ``True``, the directory is refreshed first.
+        criteria :
+            The fields of ``info_XXXXX.txt`` (i.e. ``time``, ``aexp``, ``levelmax``) to match. A ``tuple`` ``(min, max)``
+            selects an (inclusive) range, either bound of which may be ``None``. Any other value must match exactly.
+
+        Returns
+        -------
+        list of str
+            The names of the matching snapshots.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            simlog.snapshots.select(output_directory, time=(0.5, 1.5), levelmax=14)
+        """
+        selected = []
+        for name, record in self.catalog(directory, refresh=refresh).items():
+            info = record.get("info", {})
+            if all(_match_field(info.get(field), value) for field, value in criteria.items()):
+                selected.append(name)
+        return selected
+
+    def closest(self, directory, field, value, refresh=True):
+        """
+        Finds the snapshot in ``directory`` whose ``info`` field ``field`` is closest to ``value``.
+
+        Returns
+        -------
+        str or None
+            The name of the snapshot (``None`` if there are no cataloged snapshots).
+        """
+        candidates = {name: record["info"][field] for name, record in self.catalog(directory, refresh=refresh).items()
+                      if field in record.get("info", {})}
+        if not len(candidates):
+            return None
+        return min(candidates, key=lambda name: abs(candidates[name] - value))
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Reading RAMSES Snapshots =========================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def read_info_file(path) -> dict:
+    """
+    Reads the parameters of a RAMSES ``info_XXXXX.txt`` file (everything before the domain ordering table).
+
+    Parameters
+    ----------
+    path : str
+        The path to the info file.
+
+    Returns
+    -------
+    dict
+        The parameters. Numerical values are converted to ``int`` or ``float``.
+    """
+    info = {}
+    with open(path, "r") as info_file:
+        for line in info_file:
+            if line.startswith("ordering type"):
+                break
+            if "=" not in line:
+                continue
+
+            key, value = [item.strip() for item in line.split("=", 1)]
+            for kind in [int, float]:
+                try:
+                    value = kind(value)
+                    break
+                except ValueError:
+                    pass
+            info[key] = value
+    return info
+
+
+def read_fortran_header(path, fields) -> dict:
+    """
+    Reads the leading records of a Fortran unformatted (sequential) file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file.
+    fields : list of tuple
+        The ``(name, struct format)`` of each record to read.
+
+    Returns
+    -------
+    dict
+        The value of each record (a ``list`` for records with more than one value).
+    """
+    header = {}
+    with open(path, "rb") as fortran_file:
+        for name, fmt in fields:
+            (length,) = struct.unpack("<i", fortran_file.read(4))
+            record = fortran_file.read(length)
+            fortran_file.read(4)
+
+            values = struct.unpack("<" + fmt, record[:struct.calcsize("<" + fmt)])
+            header[name] = values[0] if len(values) == 1 else list(values)
+    return header
+
+
+def read_snapshot(directory) -> dict:
+    """
+    Reads the metadata of a RAMSES snapshot directory without loading any of its data.
+
+    Parameters
+    ----------
+    directory : str
+        The path to the ``output_XXXXX`` directory.
+
+    Returns
+    -------
+    dict
+        The metadata with the keys
+
+        - ``info``: The parameters in ``info_XXXXX.txt`` (``ncpu``, ``levelmin``, ``levelmax``, ``time``, ``aexp``,
+          ``unit_l``, ``unit_d``, ``unit_t``, etc.).
+        - ``files``: The ``count`` and total ``bytes`` of the ``amr``, ``hydro`` and ``part`` files.
+        - ``amr``, ``hydro``, ``part``: The header of each file type (see ``ramses_headers``), with the particle and grid
+          counts summed over all of the cpu files.
+
+        An empty ``dict`` is returned if the info file doesn't exist (yet).
+    """
+    number = snapshot_pattern.match(pt.Path(directory).name).group(1)
+    info_path = os.path.join(directory, "info_%s.txt" % number)
+    if not os.path.exists(info_path):
+        return {}
+
+    record = {"info": read_info_file(info_path), "files": {}}
+
+    # - Grouping the binary files by type -#
+    files = {kind: [] for kind in ramses_headers}
+    with os.scandir(directory) as scanner:
+        for entry in scanner:
+            kind = entry.name.split("_", 1)[0]
+            if kind in files and entry.name.startswith("%s_%s.out" % (kind, number)):
+                files[kind].append((entry.path, entry.stat().st_size))
+
+    for kind, found in files.items():
+        record["files"][kind] = {"count": len(found), "bytes": sum(size for _, size in found)}
+        if not len(found):
+            continue
+
+        try:
+            found = sorted(found)
+            header = read_fortran_header(found[0][0], ramses_headers[kind])
+            for field in ramses_summed_fields[kind]:
+                header[field] = sum(read_fortran_header(path, ramses_headers[kind])[field] for path, _ in found)
+            record[kind] = header
+        except (struct.error, OSError):
+            modlog.exception("Failed to read the %s headers of %s." % (kind, directory))
+
+    return record
+
+
+def _match_field(found, value) -> bool:
+    """Checks a catalog field ``found`` against a criterion ``value`` (see ``SnapshotIndex.select``)."""
+    if found is None:
+        return False
+    if isinstance(value, tuple):
+        return (value[0] is None or found >= value[0]) and (value[1] is None or found <= value[1])
+    return found == value
@@ -0,0 +1,359 @@
+"""
+=================
+Software Registry
+=================
+The registry of the software PyHPC can run: the RAMSES variants (``R-DICE``, etc.), the initial conditions generators
+and the file extensions of each kind of file.
+
+The registry is read from ``bin/lib/imp/types.json`` once per process and each RAMSES variant is compiled into a
+``RamsesSoftware`` handler, which
+
+- enables / disables the headers of the ``.nml`` (``header_control``),
+- points the ``.nml`` at the initial conditions (``ic_handler``, the name of a function registered with
+  ``ic_handler``) and
+- locates the RAMSES executable and batch templates of the variant (``exec``, ``exec_string`` and, for the job arrays
+  of parameter sweeps, ``array_exec_string``).
+
+Legacy ``ic_exec`` strings are still accepted, but are compiled once when the registry is loaded rather than on each
+call.
+
+Plugins
+-------
+New software is added with an entry in ``types.json`` or from a plugin module, listed in
+``CONFIG["System"]["Software"]["plugins"]`` and imported when the registry is loaded, which registers its handlers:
+
+.. code-block:: python
+
+    from PyHPC.PyHPC_System.software import RamsesSoftware, ic_handler, register_ramses_software
+
+    @ic_handler("ryq")
+    def ryq_ic(settings, ic_file):
+        settings["INIT_PARAMS"]["initfile(1)"]["v"] = "'%s'" % ic_file
+
+    register_ramses_software(RamsesSoftware("RyQ", header_control={"DICE_PARAMS": False}, ic_handler="ryq"))
+"""
+import importlib
+import json
+import logging
+import os
+import pathlib as pt
+import warnings
+
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_System"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+#: The location of the software types.
+types_path = os.path.join(pt.Path(__file__).parents[1], "bin", "lib", "imp", "types.json")
+
+_types = None  # -> the contents of types.json, once loaded.
+_ramses_software = {}  # -> name -> RamsesSoftware.
+_ic_handlers = {}  # -> name -> function(settings, ic_file).
+_loaded = False
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Initial Conditions Handlers ======================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def ic_handler(name: str):
+    """
+    Registers a function pointing the settings of a ``.nml`` at an initial conditions file (a decorator).
+
+    Parameters
+    ----------
+    name : str
+        The name the handler is referred to by (the ``ic_handler`` of a software).
+
+    Returns
+    -------
+    callable
+        The decorator. The function is called as ``function(settings, ic_file)`` and changes ``settings`` in place.
+    """
+
+    def _register(function):
+        _ic_handlers[name] = function
+        return function
+
+    return _register
+
+
+@ic_handler("dice")
+def dice_ic(settings: dict, ic_file: str):
+    """Points the ``INIT_PARAMS`` at the directory of ``ic_file`` and the ``DICE_PARAMS`` at its name."""
+    settings['INIT_PARAMS']['initfile(1)']['v'] = "'%s'" % str(pt.Path(ic_file).parents[0])
+    settings['DICE_PARAMS']['ic_file']['v'] = "'%s'" % str(pt.Path(ic_file).name)
+
+
+def compile_ic_exec(name: str, source: str):
+    """
+    Compiles a legacy ``ic_exec`` string (python run with ``settings``, ``ic_file`` and ``pt`` in scope) into a handler.
+
+    Parameters
+    ----------
+    name : str
+        The name of the software, used in the errors.
+    source : str
+        The code.
+
+    Returns
+    -------
+    callable
+        The handler.
+    """
+    try:
+        code = compile(source, "<types.json:%s:ic_exec>" % name, "exec")
+    except SyntaxError as error:
+        raise PyHPC_Error("The ic_exec of %s is not valid python: %s." % (name, error))
+
+    def _handler(settings, ic_file):
+        exec(code, {"pt": pt}, {"settings": settings, "ic_file": ic_file})
+
+    return _handler
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# RAMSES Software ==================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+class RamsesSoftware:
+    """
+    The handler of a RAMSES variant.
+
+    Parameters
+    ----------
+    name : str
+        The name of the software (the ``META.software`` of the RAMSES configuration).
+    header_control : dict, optional
+        ``{header: enabled}`` for the headers which are enabled or disabled by the software.
+    ic_handler : str or callable, optional
+        The handler pointing the ``.nml`` at the initial conditions, or the name it was registered with.
+    template : list of str, optional
+        The path of the batch template, relative to ``PyHPC``.
+    array_template : list of str, optional
+        The path of the batch template of job arrays (see ``run_sweep.py``), relative to ``PyHPC``.
+    executable : str, optional
+        The key of the executable in ``CONFIG["System"]["Executables"]``.
+    """
+
+    def __init__(self, name: str, header_control=None, ic_handler=None,
+                 template=("bin", "lib", "templates", "ramses_slurm.template"), executable="ramses_executable",
+                 array_template=("bin", "lib", "templates", "ramses_array_slurm.template")):
+        #: The name of the software.
+        self.name = name
+        #: The headers enabled or disabled by the software.
+        self.header_control = dict(header_control or {})
+        #: The key of the executable in ``CONFIG["System"]["Executables"]``.
+        self.executable = executable
+        #: The path of the batch template.
+        self.template = os.path.join(pt.Path(__file__).parents[1], *template)
+        #: The path of the batch template of job arrays.
+        self.array_template = os.path.join(pt.Path(__file__).parents[1], *array_template)
+
+        if isinstance(ic_handler, str):
+            if ic_handler not in _ic_handlers:
+                raise PyHPC_Error("The ic handler %s of %s is not registered." % (ic_handler, name))
+            ic_handler = _ic_handlers[ic_handler]
+        self._ic_handler = ic_handler
+
+    def __repr__(self):
+        return "<RamsesSoftware %s>" % self.name
+
+    @property
+    def executable_path(self) -> str:
+        """The path of the RAMSES executable of the software."""
+        try:
+            return CONFIG["System"]["Executables"][self.executable]
+        except KeyError:
+            raise PyHPC_Error("The executable %s of %s is not in the configuration." % (self.executable, self.name))
+
+    def apply(self, settings: dict, ic_file: str) -> dict:
+        """
+        Configures the settings of a ``.nml`` for the software, in place.
+
+        Parameters
+        ----------
+        settings : dict
+            The RAMSES configuration.
+        ic_file : str
+            The initial conditions file.
+
+        Returns
+        -------
+        dict
+            The settings.
+        """
+        for header, enabled in self.header_control.items():
+            settings[header]["enabled"]["v"] = enabled
+            modlog.debug("Enabled %s" % header if enabled else "Disabled %s" % header)
+
+        if self._ic_handler is not None:
+            self._ic_handler(settings, ic_file)
+        return settings
+
+    def validate(self, settings=None) -> list:
+        """
+        Checks that the software can be used.
+
+        Parameters
+        ----------
+        settings : dict, optional
+            A RAMSES configuration to check the controlled headers against.
+
+        Returns
+        -------
+        list of str
+            The problems found (empty if there are none).
+        """
+        problems = []
+        for template in (self.template, self.array_template):
+            if not os.path.exists(template):
+                problems.append("The template %s of %s doesn't exist." % (template, self.name))
+        if self.executable not in CONFIG["System"]["Executables"]:
+            problems.append("The executable %s of %s is not in the configuration." % (self.executable, self.name))
+        if settings is not None:
+            for header in self.header_control:
+                if "enabled" not in settings.get(header, {}):
+                    problems.append("The header %s controlled by %s can't be enabled." % (header, self.name))
+        return problems
+
+
+def register_ramses_software(software: RamsesSoftware, replace=False):
+    """
+    Registers a RAMSES variant.
+
+    Parameters
+    ----------
+    software : RamsesSoftware
+        The handler of the software.
+    replace : bool
+        If ``True``, replaces a software already registered under the same name.
+
+    Returns
+    -------
+    RamsesSoftware
+        The handler.
+    """
+    if software.name in _ramses_software and not replace:
+        raise PyHPC_Error("The software %s is already registered." % software.name)
+    _ramses_software[software.name] = software
+    modlog.debug("Registered the RAMSES software %s." % software.name)
+    return software
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Registry =========================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def load_types() -> dict:
+    """The contents of ``types.json`` (read once per process)."""
+    global _types
+    if _types is None:
+        with open(types_path, "r") as type_file:
+            _types = json.load(type_file)
+    return _types
+
+
+def load_registry():
+    """
+    Compiles the RAMSES software of ``types.json`` into handlers and imports the plugins. Only runs once per process.
+
+    Returns
+    -------
+    None
+    """
+    global _loaded
+    if _loaded:
+        return None
+    _loaded = True
+
+    for name, entry in load_types()["software"]["RAMSES"].items():
+        if "ic_handler" in entry:
+            handler = entry["ic_handler"]
+        elif "ic_exec" in entry:
+            handler = compile_ic_exec(name, entry["ic_exec"])
+        else:
+            handler = None
+
+        register_ramses_software(RamsesSoftware(name,
+                                                header_control=entry.get("header_control"),
+                                                ic_handler=handler,
+                                                template=entry.get("exec_string",
+                                                                   ["bin", "lib", "templates",
+                                                                    "ramses_slurm.template"]),
+                                                executable=entry.get("exec", "ramses_executable"),
+                                                array_template=entry.get("array_exec_string",
+                                                                         ["bin", "lib", "templates",
+                                                                          "ramses_array_slurm.template"])),
+                                 replace=True)
+
+    for plugin in CONFIG["System"]["Software"]["plugins"]:
+        modlog.debug("Loading the software plugin %s." % plugin)
+        try:
+            importlib.import_module(plugin)
+        except ImportError:
+            raise PyHPC_Error("Failed to import the software plugin %s." % plugin)
+    return None
+
+
+def ramses_software() -> dict:
+    """The registered RAMSES software, by name."""
+    load_registry()
+    return _ramses_software
+
+
+def get_ramses_software(name: str) -> RamsesSoftware:
+    """
+    Fetches the handler of a RAMSES variant.
+
+    Parameters
+    ----------
+    name : str
+        The name of the software.
+
+    Returns
+    -------
+    RamsesSoftware
+        The handler.
+    """
+    try:
+        return ramses_software()[name]
+    except KeyError:
+        raise PyHPC_Error("The software %s does not match any of the implemented softwares!" % name)
+
+
+def ic_generators() -> dict:
+    """The initial conditions generators, as ``{name: path}`` (relative to ``PyHPC_executables``)."""
+    return {name: entry["path"] for name, entry in load_types()["software"]["initial_conditions"].items()}
+
+
+def extensions(kind: str) -> list:
+    """The file extensions of ``kind`` (``initial_conditions`` or ``namelist``)."""
+    return load_types()["extensions"][kind]
+
+
+def validate_registry(settings=None) -> dict:
+    """
+    Validates every registered RAMSES software (see ``RamsesSoftware.validate``).
+
+    Parameters
+    ----------
+    settings : dict, optional
+        A RAMSES configuration to check the controlled headers against.
+
+    Returns
+    -------
+    dict
+        The problems of each software which has any.
+    """
+    problems = {name: software.validate(settings) for name, software in ramses_software().items()}
+    return {name: software_problems for name, software_problems in problems.items() if len(software_problems)}
@@ -21,7 +21,8 @@ should be executed from the ``PyHPC`` base directory. There are a variety of com
 
 .. code-block:: commandline
 
-    usage: ImageManager.py [-h] [--simulation_log SIMULATION_LOG] [-nb] [-s]
+    usage: ImageManager.py [-h] [--simulation_log SIMULATION_LOG] [-nb] [-s] [-a] [--chunk_size CHUNK_SIZE]
+                           [--resubmit TEMP_DIR] [--after AFTER [AFTER ...]]
 
     optional arguments:
       -h, --help            show this help message and exit
@@ -29,6 +30,21 @@ should be executed from the ``PyHPC`` base directory. There are a variety of com
                             A [PATH] to a simulation logger if desired.
       -nb, --no_batch       If active, the execution will not be passed to SLURM.
       -s, --stop            True to not push the executable to SLURM.
+      -a, --array           Image an entire simulation with a SLURM job array.
+      --chunk_size CHUNK_SIZE
+                            The number of outputs imaged by each task of the job array.
+      --resubmit TEMP_DIR   Resubmit the incomplete tasks of the job array run from TEMP_DIR.
+      --after AFTER [AFTER ...]
+                            The job ids which must complete successfully before the job starts.
+
+Job Arrays
+^^^^^^^^^^
+With ``-a``, imaging an entire simulation is submitted as a SLURM job array instead of a single allocation running every
+output through GNU ``parallel``. The outputs are split into contiguous chunks of ``--chunk_size`` outputs (by default
+``CONFIG["System"]["SLURM"]["array_chunk_size"]``) and each task of the array images one chunk, skipping the images
+which already exist. Each task that succeeds writes a marker to the temporary directory of the run, so that the tasks
+which failed (or were cancelled) can be resubmitted on their own with ``--resubmit <temporary directory>``. The
+submission of the array is logged through the simulation log daemon if one is running (see ``simlog_daemon.py``).
 
 Usage Instructions
 ^^^^^^^^^^^^^^^^^^
@@ -49,6 +65,7 @@ Once the system has been loaded, there are several stages through which the imag
 #. **Execution**: The execution will proceed and generate the image.
 """
 import argparse
+import json
 import os
 import pathlib as pt
 import sys
@@ -69,7 +86,9 @@ from datetime import datetime
 from PyHPC.PyHPC_Core.errors import PyHPC_Error
 from PyHPC.PyHPC_Utils.text_display_utilities import option_menu
 from PyHPC.PyHPC_System.simulation_management import SimulationLog
-from PyHPC.PyHPC_System.io import write_slurm_file
+from PyHPC.PyHPC_System.simulation_daemon import connect
+from PyHPC.PyHPC_System.io import write_slurm_file, chunk_ranges, format_array_spec, incomplete_array_tasks, \
+    submit_job
 
 # --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
 # ------------------------------------------------------ Setup ----------------------------------------------------------#
@@ -126,8 +145,40 @@ if __name__ == '__main__':
                         action="store_true")
     parser.add_argument("-s", "--stop", help="True to not push the executable to SLURM.",
                         action="store_true")
+    parser.add_argument("-a", "--array", help="Image an entire simulation with a SLURM job array.",
+                        action="store_true")
+    parser.add_argument("--chunk_size", type=int, help="The number of outputs imaged by each task of the job array.",
+                        default=CONFIG["System"]["SLURM"]["array_chunk_size"])
+    parser.add_argument("--resubmit", type=str, help="Resubmit the incomplete tasks of the job array run from [PATH].",
+                        default=None)
+    parser.add_argument("--after", type=str, nargs="+", help="The job ids which must complete successfully before the job starts.",
+                        default=None)
     args = parser.parse_args()
 
+    #  Resubmitting the failed tasks of a job array
+    # ----------------------------------------------------------------------------------------------------------------- #
+    if args.resubmit:
+        try:
+            with open(os.path.join(args.resubmit, "array.json"), "r") as manifest_file:
+                manifest = json.load(manifest_file)
+        except FileNotFoundError:
+            printer.print("%sNo job array was found at %s (it may have already completed)." % (
+                fdbg_string, args.resubmit))
+            sys.exit()
+
+        incomplete = incomplete_array_tasks(os.path.join(args.resubmit, "array"), manifest["task_count"])
+        if not len(incomplete):
+            printer.print("%sAll %s tasks of the job array have completed." % (fdbg_string, manifest["task_count"]))
+            sys.exit()
+
+        array_spec = format_array_spec(incomplete, max_concurrent=CONFIG["System"]["SLURM"]["array_max_concurrent"])
+        printer.print("%sResubmitting %s of %s tasks (--array=%s)..." % (
+            fdbg_string, len(incomplete), manifest["task_count"], array_spec), end="")
+        job_id = submit_job(manifest["slurm_file"], array=array_spec)
+        printer.print(done_string)
+        printer.print("%sSubmitted job %s." % (fdbg_string, job_id))
+        sys.exit()
+
     # ---------------------------------------------------------------------------------------------------------------- #
     # Core Execution ================================================================================================= #
     # ---------------------------------------------------------------------------------------------------------------- #
@@ -164,9 +215,12 @@ if __name__ == '__main__':
         sys.exit()
 
     # - Getting the chosen simulation -#
+    snapshot_index = simlog.snapshots  # -> only directories changed since the last run are listed again.
+    snapshot_index.refresh([i for rec in simlog.get_simulation_records().values() for i in rec.raw["outputs"]])
+
     available_simulations = []
     for rec in list(simlog.get_simulation_records().values()):
-        available_simulations += [i for i in rec.raw["outputs"] if os.path.exists(i)]
+        available_simulations += [i for i in rec.raw["outputs"] if snapshot_index.exists(i)]
 
     try:
         if not len(available_simulations):
@@ -181,7 +235,7 @@ if __name__ == '__main__':
     os.system('cls' if os.name == 'nt' else 'clear')
 
     # - Choosing the desired simulation - #
-    _selected_simulation_directory = option_menu({k: str(len(os.listdir(k))) for k in available_simulations}, desc=True,
+    _selected_simulation_directory = option_menu({k: str(snapshot_index.count(k)) for k in available_simulations}, desc=True,
                                                  title="Select a Simulation")
     os.system('cls' if os.name == 'nt' else 'clear')
     printer.reprint()
@@ -189,16 +243,16 @@ if __name__ == '__main__':
     modlog.debug("Selected %s."%_selected_simulation_directory)
 
     # - Post Selection Logging to Action Log - #
-    simrec = [sr for key,sr in simlog.get_simulation_records().items() if _selected_simulation_directory in sr.raw["outputs"]][0]
+    simrec = simlog.find_by_output(_selected_simulation_directory)
     modlog.debug("Found simrec %s corresponding to the selected output %s."%(simrec,_selected_simulation_directory))
 
     #  Type of Execution / Selecting a snap.
     # ----------------------------------------------------------------------------------------------------------------- #
     # - Selecting a simulation snapshot number if one applies - #
     if type_setting == "1":
-        available_outputs = len([i for i in os.listdir(_selected_simulation_directory) if "output" in i])
+        available_outputs = snapshot_index.count(_selected_simulation_directory)
         snap_choice = 0
-        while not (1 <= snap_choice <= len(os.listdir(_selected_simulation_directory))):
+        while not (1 <= snap_choice <= available_outputs):
             snap_choice = int(input(
                 fdbg_string + f"Which snapshot do you want to select? (1-{available_outputs})..."))
             os.system('cls' if os.name == 'nt' else 'clear')
@@ -307,6 +361,57 @@ if __name__ == '__main__':
         os.system('cls' if os.name == 'nt' else 'clear')
         printer.reprint()
         os.system((os.path.join(_temporary_directory, "exec.sh")))
+    elif args.array and type_setting == "0":
+        #  Running the executable as a job array.
+        # ----------------------------------------------------------------------------------------------------------------- #
+        slurm_output = input("%sPlease enter the desired name of the .slurm file (EXCLUDE .slurm): " % fdbg_string)
+        slurm_path = pt.Path(os.path.join(CONFIG["System"]["Directories"]["slurm_directory"], slurm_output))
+
+        # - Splitting the outputs between the tasks -#
+        outputs = sorted(snapshot_index.snapshots(_selected_simulation_directory))
+        chunks = chunk_ranges(len(outputs), args.chunk_size)
+        with open(os.path.join(_temporary_directory, "outputs.txt"), "w") as outputs_file:
+            outputs_file.write("".join("%s\n" % output for output in outputs))
+        with open(os.path.join(_temporary_directory, "array.json"), "w") as manifest_file:
+            json.dump({"slurm_file": str(slurm_path) + ".SLURM", "task_count": len(chunks),
+                       "chunk_size": args.chunk_size, "outputs": len(outputs)}, manifest_file)
+
+        printer.print("%sGenerating the executable (%s tasks of up to %s outputs)..." % (
+            fdbg_string, len(chunks), args.chunk_size), end="\n")
+        with open(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "lib", "templates",
+                               "image_array_slurm.template"), "r") as template:
+            write_slurm_file(template.read(), name=slurm_output,
+                             array=format_array_spec(range(len(chunks)),
+                                                     max_concurrent=CONFIG["System"]["SLURM"]["array_max_concurrent"]),
+                             **{
+                                 "csh_interp"         : CONFIG["System"]["Modules"]["csh_interp"],
+                                 "python_env_script"  : CONFIG["System"]["Modules"]["python_env_script"],
+                                 "python_exec"        : CONFIG["System"]["Modules"]["python_exec_name"],
+                                 "output_directory"   : output_directory,
+                                 "temp_dir"           : str(_temporary_directory),
+                                 "root_directory"     : str(pt.Path(__file__).parents[1]),
+                                 "simulation_location": _selected_simulation_directory,
+                                 "chunk_size"         : args.chunk_size,
+                                 "task_count"         : len(chunks)
+                             })
+        printer.print(done_string)
+
+        os.system('cls' if os.name == 'nt' else 'clear')
+        printer.reprint(end="")
+        printer.print(done_string)
+        printer.print("%sIncomplete tasks can be resubmitted with --resubmit %s." % (fdbg_string, _temporary_directory))
+
+        if not args.stop:
+            printer.print("%sAdding the job array to the SLURM queue..." % fdbg_string, end="")
+            client = connect(args.simulation_log)  # -> the daemon serializes the writes of the jobs sharing the log.
+            job_id = submit_job(str(slurm_path) + ".SLURM", after=args.after,
+                                record=client.find_by_output(_selected_simulation_directory) if client is not None
+                                else simrec,
+                                object_rec=_selected_simulation_directory, stage="image")
+            if client is not None:
+                client.close()
+            printer.print(done_string)
+            printer.print("%sSubmitted job %s." % (fdbg_string, job_id))
     else:
         #  Running the executable with no batching.
         # ----------------------------------------------------------------------------------------------------------------- #
@@ -339,6 +444,7 @@ if __name__ == '__main__':
 
         if not args.stop:
             printer.print("%sAdding the job to the SLURM queue..." % fdbg_string, end="")
-            os.system("sbatch %s" % slurm_path + ".SLURM")
-
-            printer.print(done_string)
\ No newline at end of file
+            job_id = submit_job(str(slurm_path) + ".SLURM", after=args.after, record=simrec,
+                                object_rec=_selected_simulation_directory, stage="image")
+            printer.print(done_string)
+            printer.print("%sSubmitted job %s." % (fdbg_string, job_id))
\ No newline at end of file
@@ -27,7 +27,6 @@ To run an initial condition report, one simply needs to run
 """
 
 import argparse
-import json
 import os
 import pathlib as pt
 import sys
@@ -70,10 +69,6 @@ if not CONFIG["System"]["Logging"]["warnings"]:
 done_string = "[" + Fore.CYAN + Style.BRIGHT + "DONE" + Style.RESET_ALL + "]"
 fail_string = "[" + Fore.RED + Style.BRIGHT + "FAILED" + Style.RESET_ALL + "]"
 
-# - Grabbing type information -#
-with open(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "lib", "imp", "types.json"), "r") as type_file:
-    types = json.load(type_file)
-
 if __name__ == '__main__':
     #  Printing Introduction, etc.
     # ----------------------------------------------------------------------------------------------------------------- #
@@ -112,7 +107,7 @@ if __name__ == '__main__':
 
     #------------------- Loading the simulation log ----------------------------------#
     try:
-        simlog = SimulationLog(path=user_arguments.simulation_log)
+        simlog = SimulationLog(path=user_arguments.simulation_log, lazy=True)
         modlog.debug("Loaded a simulation log at %s."%simlog)
     except FileNotFoundError as message:
         printer.print("")
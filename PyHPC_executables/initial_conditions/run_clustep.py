@@ -2,7 +2,6 @@
 Runtime implementation for CLUSTEP to be integrated into the ``PyHPC`` system.
 """
 import argparse
-import json
 import os
 import pathlib as pt
 import sys
@@ -22,7 +21,7 @@ from PyHPC.PyHPC_Utils.text_display_utilities import TerminalString, PrintRetain
 from PyHPC.PyHPC_System.simulation_management import SimulationLog
 from PyHPC.PyHPC_Utils.analysis_utils import recenter
 from PyHPC.PyHPC_Core.utils import write_ini
-from PyHPC.PyHPC_System.io import write_slurm_file
+from PyHPC.PyHPC_System.io import write_slurm_file, submit_job
 
 # --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
 # ------------------------------------------------------ Setup ----------------------------------------------------------#
@@ -44,10 +43,6 @@ initial_conditions_directory = CONFIG["System"]["Directories"]["ic_directory"]
 done_string = "[" + Fore.CYAN + Style.BRIGHT + "DONE" + Style.RESET_ALL + "]"
 fail_string = "[" + Fore.RED + Style.BRIGHT + "FAILED" + Style.RESET_ALL + "]"
 
-# - Grabbing type information -#
-with open(os.path.join(pt.Path(__file__).parents[2], "PyHPC", "bin", "lib", "imp", "types.json"), "r") as type_file:
-    types = json.load(type_file)
-
 # - grabbing defaults - #
 clustep_ini = toml.load(os.path.join(CONFIG["System"]["Directories"]["bin"], "configs", "CLUSTEP.config"))
 
@@ -379,8 +374,9 @@ if __name__ == '__main__':
 
         if not user_arguments.stop:
             printer.print("%sAdding the job to the SLURM queue..." % fdbg_string, end="")
-            os.system("sbatch %s" % slurm_path+".SLURM")
+            job_id = submit_job(str(slurm_path) + ".SLURM")
             simlog.ics[str(ic_name)].log(
                 "ran %s" % slurm_path,
-                "RAN-SLURM", slurm=True)
+                "RAN-SLURM", slurm=True, job_id=job_id)
             printer.print(done_string)
+            printer.print("%sSubmitted job %s." % (fdbg_string, job_id))
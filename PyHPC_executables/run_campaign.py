@@ -0,0 +1,220 @@
+"""
+=========
+Campaigns
+=========
+
+The ``run_campaign.py`` executable queues a whole pipeline of SLURM jobs (e.g. initial conditions generation -> RAMSES ->
+imaging -> animation) in one command. Each stage is submitted with ``sbatch --dependency=afterok:<job ids>`` on the
+stages before it, so that SLURM starts it as soon as they have completed successfully instead of a user waiting for
+each stage to finish.
+
+Usage
+-----
+
+.. code-block:: console
+
+    usage: run_campaign.py [-h] [-s] [--simulation_log SIMULATION_LOG] campaign
+
+    positional arguments:
+      campaign              The campaign specification (.toml).
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -s, --stop            Enable this flag to only check the campaign and write its scripts.
+      --simulation_log SIMULATION_LOG
+                            A [PATH] to a simulation logger if desired.
+
+The Campaign Specification
+--------------------------
+The scripts of the stages are generated beforehand (by running each executable with ``-s``), or a stage may run a
+single command, for which a script is written with the default ``SLURM.config`` settings.
+
+.. code-block:: toml
+
+    name = "merger"
+    dependency = "afterok" # The type of the dependencies between the stages.
+
+    [[stage]]
+    name = "ic"
+    slurm = "/home/user/slurm/merger_ic.SLURM"
+    ic = "/home/user/ics/merger.dat" # The initial condition to log the job to.
+
+    [[stage]]
+    name = "run"
+    kind = "ramses" # The kind of job (defaults to the name). The state of the ramses jobs is kept in the log.
+    slurm = "/home/user/slurm/merger_run.SLURM"
+    nml = "/home/user/nmls/merger.nml" # The simulation to log the job to...
+    output = "/home/user/Sims/R-DICE/merger" # ...and its output.
+
+    [[stage]]
+    name = "images"
+    slurm = "/home/user/slurm/merger_images.SLURM"
+
+    [[stage]]
+    name = "movie"
+    command = "python3 PyHPC_executables/animate.py -f /home/user/figures/merger -o /home/user/movies"
+    setup = ["ml ffmpeg"] # Additional lines run before the command.
+
+Each stage depends on the stage before it unless it lists the stages it depends on with ``after`` (``after = []`` for
+a stage which doesn't depend on any other). ``array`` submits only some tasks of a job array. The jobs are logged
+through the simulation log daemon if one is running (see ``simlog_daemon.py``).
+"""
+import argparse
+import contextlib
+import logging
+import os
+import pathlib as pt
+import sys
+import warnings
+
+import toml
+from colorama import Fore, Style
+
+sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import *
+from PyHPC.PyHPC_Core.log import configure_logging
+from PyHPC.PyHPC_System.io import write_slurm_file, JobChain
+from PyHPC.PyHPC_System.simulation_daemon import open_simulation_log
+from PyHPC.PyHPC_Utils.text_display_utilities import print_title, TerminalString, PrintRetainer
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_executables"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+fdbg_string = "%s [%s]: " % (_dbg_string, Fore.GREEN + "Campaign Wizard" + Style.RESET_ALL)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+printer = PrintRetainer()
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+# - Organizational Strings -#
+slurm_config_path = os.path.join(CONFIG["System"]["Directories"]["bin"], "configs", "SLURM.config")
+done_string = "[" + Fore.CYAN + Style.BRIGHT + "DONE" + Style.RESET_ALL + "]"
+fail_string = "[" + Fore.RED + Style.BRIGHT + "FAILED" + Style.RESET_ALL + "]"
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Main  ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+if __name__ == '__main__':
+
+    #  Printing Introduction, etc.
+    # ----------------------------------------------------------------------------------------------------------------- #
+    configure_logging(__file__)
+    term_string = TerminalString()
+    print_title(func=printer.print)
+    printer.print(term_string.str_in_grid(""))
+    printer.print(term_string.str_in_grid(Fore.BLUE + "Campaign Submission" + Style.RESET_ALL, alignment="center"))
+    printer.print(term_string.str_in_grid(""))
+    printer.print(term_string.h + "\n")
+
+    #  Argument Parsing
+    # ----------------------------------------------------------------------------------------------------------------- #
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("campaign", type=str, help="The campaign specification (.toml).")
+    argparser.add_argument("-s", "--stop", action="store_true",
+                           help="Enable this flag to only check the campaign and write its scripts.")
+    argparser.add_argument("--simulation_log", type=str, help="A [PATH] to a simulation logger if desired.",
+                           default=None)
+    user_arguments = argparser.parse_args()
+
+    # -------------------------------------------------------------------------------------------------------------------- #
+    # Loading the campaign =============================================================================================== #
+    # -------------------------------------------------------------------------------------------------------------------- #
+    printer.print("%sLoading the campaign %s..." % (fdbg_string, user_arguments.campaign), end="")
+    try:
+        campaign = toml.load(user_arguments.campaign)
+    except FileNotFoundError:
+        raise PyHPC_Error("Failed to find the campaign specification at %s." % user_arguments.campaign)
+    except toml.TomlDecodeError:
+        raise PyHPC_Error("Failed to correctly load the campaign %s in TOML format." % user_arguments.campaign)
+
+    campaign_name = campaign.get("name", pt.Path(user_arguments.campaign).stem)
+    stages = campaign.get("stage", [])
+    if not len(stages):
+        raise PyHPC_Error("The campaign %s doesn't have any [[stage]]." % user_arguments.campaign)
+    printer.print(done_string)
+
+    simlog = None
+    if any(key in stage for stage in stages for key in ("ic", "nml")):
+        printer.print("%sLoading the simulation log..." % fdbg_string, end="")
+        simlog = open_simulation_log(path=user_arguments.simulation_log or campaign.get("simulation_log"), lazy=True)
+        printer.print(done_string)
+
+    # -------------------------------------------------------------------------------------------------------------------- #
+    # Building the chain ================================================================================================= #
+    # -------------------------------------------------------------------------------------------------------------------- #
+    chain = JobChain(dependency=campaign.get("dependency", "afterok"))
+    slurm_config = None
+
+    for index, stage in enumerate(stages):
+        name = stage.get("name", "stage_%s" % index)
+
+        #  Locating the script
+        # ----------------------------------------------------------------------------------------------------------------- #
+        if "command" in stage:
+            if slurm_config is None:
+                slurm_config = toml.load(slurm_config_path)
+            script_name = "%s_%s" % (campaign_name, name)
+            with open(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "lib", "templates",
+                                   "command_slurm.template"), "r") as template:
+                write_slurm_file(template.read(), slurm_config=slurm_config, name=script_name, **{
+                    "csh_interp"    : CONFIG["System"]["Modules"]["csh_interp"],
+                    "setup"         : "\n".join([CONFIG["System"]["Modules"]["python_env_script"]] +
+                                                stage.get("setup", [])),
+                    "root_directory": str(pt.Path(__file__).parents[1]),
+                    "command"       : stage["command"],
+                    "stage"         : name,
+                    "campaign"      : campaign_name
+                })
+            slurm_file = os.path.join(CONFIG["System"]["Directories"]["slurm_directory"], "%s.SLURM" % script_name)
+        elif "slurm" in stage:
+            slurm_file = stage["slurm"]
+            if not os.path.exists(slurm_file):
+                raise PyHPC_Error("The script %s of the stage %s doesn't exist." % (slurm_file, name))
+        else:
+            raise PyHPC_Error("The stage %s has neither a slurm script nor a command." % name)
+
+        #  Locating the simulation log record
+        # ----------------------------------------------------------------------------------------------------------------- #
+        if "nml" in stage:
+            record = simlog.find_by_nml(stage["nml"])
+            if record is None:
+                raise PyHPC_Error("The .nml %s of the stage %s is not in %s." % (stage["nml"], name, simlog))
+        elif "ic" in stage:
+            try:
+                record = simlog.ics[stage["ic"]]
+            except KeyError:
+                raise PyHPC_Error("The initial condition %s of the stage %s is not in %s." % (stage["ic"], name, simlog))
+        else:
+            record = None
+
+        chain.add(name, slurm_file, after=stage.get("after"), array=stage.get("array"), record=record,
+                  object_rec=stage.get("output"), stage=stage.get("kind", name))
+        printer.print("%s\t%s: %s (after %s)." % (fdbg_string, name, slurm_file,
+                                                   ", ".join(chain.stages[name]["after"]) or "nothing"))
+
+    # -------------------------------------------------------------------------------------------------------------------- #
+    # Submitting ========================================================================================================= #
+    # -------------------------------------------------------------------------------------------------------------------- #
+    if user_arguments.stop:
+        printer.print("%sChecked the %s stages of %s." % (fdbg_string, len(chain.stages), campaign_name))
+        sys.exit()
+
+    printer.print("%sSubmitting %s..." % (fdbg_string, chain), end="")
+    failure = None
+    with (simlog.batch() if simlog is not None else contextlib.nullcontext()):  # -> a single write for the campaign.
+        try:
+            chain.submit()
+        except PyHPC_Error as error:  # -> the stages already queued are still logged.
+            failure = error
+    printer.print(done_string if failure is None else fail_string)
+
+    for name, job_id in chain.job_ids.items():
+        printer.print("%s\t%s: job %s" % (fdbg_string, name, job_id))
+    if failure is not None:
+        raise failure
@@ -158,7 +158,6 @@ execution will begin immediately.
     M -- Generate sequential final outputs --> N[Move final output to chosen directory] --> O["END"]
 
 """
-import json
 import os
 import pathlib as pt
 import sys
@@ -170,6 +169,7 @@ sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
 from PyHPC.PyHPC_Core.configuration import read_config
 import logging
 from PyHPC.PyHPC_Core.log import configure_logging
+from PyHPC.PyHPC_System.software import ic_generators
 from PyHPC.PyHPC_Utils.text_display_utilities import print_title, TerminalString, PrintRetainer, option_menu
 
 # --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
@@ -194,10 +194,6 @@ fail_string = "[" + Fore.RED + Style.BRIGHT + "FAILED" + Style.RESET_ALL + "]"
 
 if __name__ == '__main__':
 
-    # - Grabbing type information -#
-    with open(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "lib", "imp", "types.json"), "r") as type_file:
-        types = json.load(type_file)
-
     configure_logging(_location)
 
     # -------------------------------------------------------------------------------------------------------------------- #
@@ -243,9 +239,7 @@ if __name__ == '__main__':
 
     #  Selecting the pass through command
     # ----------------------------------------------------------------------------------------------------------------- #
-    command_options = {
-        k: types["software"]["initial_conditions"][k]["path"] for k in list(types["software"]["initial_conditions"].keys())
-    }
+    command_options = ic_generators()
 
     os.system('cls' if os.name == 'nt' else 'clear')
     selection = option_menu(command_options, title="Software Selector")
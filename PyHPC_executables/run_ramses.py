@@ -12,6 +12,7 @@ Usage
 .. code-block:: console
 
     usage: run_ramses.py [-h] [-v] [-i IC] [-n NML] [--nml_output NML_OUTPUT] [--slurm_output SLURM_OUTPUT] [-s] [--simulation_log SIMULATION_LOG]
+                         [--after AFTER [AFTER ...]]
     optional arguments:
       -h, --help            show this help message and exit
       -v, --verbose         Toggles verbose mode.
@@ -24,6 +25,8 @@ Usage
       -s, --stop            Enable this flag to generate only the slurm file but not execute.
       --simulation_log SIMULATION_LOG
                             A [PATH] to a simulation logger if desired.
+      --after AFTER [AFTER ...]
+                            The job ids which must complete successfully before the job starts.
 
 Notes
 -----
@@ -51,7 +54,7 @@ Software Options
 
 A variety of different core software types can be included in the ``run_ramses`` directive. The available softwares are
 determined by the ``PyHPC/bin/lib/imp/types.json`` file, which specifies how the system should react to the
-given choice of software.
+given choice of software, and by any plugins registered with ``PyHPC.PyHPC_System.software``.
 
 - Each piece of available software is listed under ``software.RAMSES`` in the json file.
 
@@ -83,7 +86,6 @@ Developer Information
 ---------------------
 """
 import argparse
-import json
 import os
 import pathlib as pt
 import sys
@@ -99,8 +101,9 @@ from PyHPC.PyHPC_Core.configuration import read_config
 from PyHPC.PyHPC_Core.errors import *
 import logging
 from PyHPC.PyHPC_Core.log import configure_logging
-from PyHPC.PyHPC_System.io import write_ramses_nml, write_slurm_file
+from PyHPC.PyHPC_System.io import write_ramses_nml, write_slurm_file, submit_job
 from PyHPC.PyHPC_System.simulation_management import SimulationLog
+from PyHPC.PyHPC_System.software import ramses_software, get_ramses_software, extensions
 from PyHPC.PyHPC_Utils.text_display_utilities import print_title, TerminalString, select_files, PrintRetainer, \
     get_options
 
@@ -125,9 +128,8 @@ done_string = "[" + Fore.CYAN + Style.BRIGHT + "DONE" + Style.RESET_ALL + "]"
 fail_string = "[" + Fore.RED + Style.BRIGHT + "FAILED" + Style.RESET_ALL + "]"
 
 # - Grabbing type information -#
-with open(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "lib", "imp", "types.json"), "r") as type_file:
-    #: The ``types`` json dictionary contains information on the structure of the software usage.
-    types = json.load(type_file)
+#: The extensions of the initial conditions files.
+ic_extensions = extensions("initial_conditions")
 
 # --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
 # ------------------------------------------------------ Main  ----------------------------------------------------------#
@@ -165,6 +167,8 @@ if __name__ == '__main__':
                            help="Enable this flag to generate only the slurm file but not execute.")
     argparser.add_argument("--simulation_log", type=str, help="A [PATH] to a simulation logger if desired.",
                            default=None)
+    argparser.add_argument("--after", type=str, nargs="+", help="The job ids which must complete successfully before the job starts.",
+                           default=None)
     # - parsing
     user_arguments = argparser.parse_args()
     printer.print(done_string)
@@ -176,7 +180,7 @@ if __name__ == '__main__':
     # - Grabbing the simulation logger - #
     printer.print("%sLoading the simulation log..." % fdbg_string, end="")
     try:
-        simlog = SimulationLog(path=user_arguments.simulation_log)
+        simlog = SimulationLog(path=user_arguments.simulation_log, lazy=True)
         printer.print(done_string)
     except FileNotFoundError:
         printer.print(fail_string)
@@ -203,7 +207,9 @@ if __name__ == '__main__':
         printer.print("%s\tLoading the .nml entry in the simulation log..." % fdbg_string, end="")
 
         try:
-            nml_log = simlog.get_simulation_records()[user_nml_path]
+            nml_log = simlog.find_by_nml(user_nml_path)
+            if nml_log is None:
+                raise KeyError(user_nml_path)
             nml_log.log("Loaded nml for run." % user_nml_path, action="RAMSES-GRAB")
             init_con_log = nml_log.parent
             init_con_log.log("Loaded ic for run.",action="RAMSES-GRAB",object_rec=nml_log.name)
@@ -234,8 +240,7 @@ if __name__ == '__main__':
             # - Grabbing initial conditions from the user.
             try:
                 selected_initial_condition_path = select_files([pt.Path(initial_conditions_directory)], max=1,
-                                                               condition=lambda f: (f.suffix in types["extensions"][
-                                                                   "initial_conditions"]) or os.path.isdir(
+                                                               condition=lambda f: (f.suffix in ic_extensions) or os.path.isdir(
                                                                    f))[0]
                 os.system('cls' if os.name == 'nt' else 'clear')
                 printer.reprint(end="")
@@ -250,7 +255,7 @@ if __name__ == '__main__':
             printer.print("%s\tInitial condition was provided explicitly. Checking for validity...", end="")
             selected_initial_condition_path = pt.Path(user_arguments.ic)
 
-            if selected_initial_condition_path.suffix not in types["extensions"]["initial_conditions"]:
+            if selected_initial_condition_path.suffix not in ic_extensions:
                 raise PyHPC_Error("The selected initial condition file is not valid.")
 
             printer.print(done_string)
@@ -318,9 +323,9 @@ if __name__ == '__main__':
         nml_software = ramses_config_user["META"]["software"]["v"]
 
         printer.print("%s\t\tSoftware = %s. Recognized = %s." % (
-            fdbg_string, nml_software, nml_software in types["software"]["RAMSES"]))
+            fdbg_string, nml_software, nml_software in ramses_software()))
 
-        if nml_software not in types["software"]["RAMSES"]:
+        if nml_software not in ramses_software():
             printer.print(fail_string)
             sys.exit()
 
@@ -341,16 +346,17 @@ if __name__ == '__main__':
 
         #  Adding the .nml to the simulation data
         # ---------------------------------------------------------------------------------------------------------------- #
-        init_con_log.add({
-            nml_output_loc: {
-                "information": "Generated ``.nml`` from ``PyHPC.PyHPC_executables.run_ramses.py``.",
-                "meta"       : {
-                    "software": nml_software
+        with simlog.batch():
+            init_con_log.add({
+                nml_output_loc: {
+                    "information": "Generated ``.nml`` from ``PyHPC.PyHPC_executables.run_ramses.py``.",
+                    "meta"       : {
+                        "software": nml_software
+                    }
                 }
-            }
-        }, auto_save=True)
-        nml_log = init_con_log.sims[nml_output_loc]
-        nml_log.log("Created nml.", action="RAMSES-BUILD")
+            }, auto_save=True)
+            nml_log = init_con_log.sims[nml_output_loc]
+            nml_log.log("Created nml.", action="RAMSES-BUILD")
 
     # -------------------------------------------------------------------------------------------------------------------- #
     # Passing command to batch runner ==================================================================================== #
@@ -389,38 +395,38 @@ if __name__ == '__main__':
         output_directory = pt.Path(
             os.path.join(CONFIG["System"]["Simulations"]["simulation_directory"],nml_software, output_directory))
 
-    if str(output_directory) not in nml_log.raw["outputs"]:
-        nml_log.add({str(output_directory):{
-            "meta": {
+    with simlog.batch():  # -> a single write for all of the changes.
+        if str(output_directory) not in nml_log.raw["outputs"]:
+            nml_log.add({str(output_directory):{
+                "meta": {
+                    "path"       : str(output_directory),
+                    "dateCreated": datetime.now().strftime('%m-%d-%Y_%H-%M-%S'),
+                    "slurm_path" : str(slurm_path)+".slurm"
+                }
+            }})
+            nml_log.log("created slurm file.",action= "SLURM-GENERATE",object_rec=str(output_directory))
+        else:
+            nml_log.raw["outputs"][str(output_directory)]["meta"] = {
                 "path"       : str(output_directory),
                 "dateCreated": datetime.now().strftime('%m-%d-%Y_%H-%M-%S'),
                 "slurm_path" : str(slurm_path)+".slurm"
             }
-        }})
-        nml_log.log("created slurm file.",action= "SLURM-GENERATE",object_rec=str(output_directory))
-    else:
-        nml_log.raw["outputs"][str(output_directory)]["meta"] = {
-            "path"       : str(output_directory),
-            "dateCreated": datetime.now().strftime('%m-%d-%Y_%H-%M-%S'),
-            "slurm_path" : str(slurm_path)+".slurm"
-        }
-        nml_log.save()
-        nml_log.log("created slurm file.", action="SLURM-REPLACE", object_rec=str(output_directory))
-        nml_log.log("created slurm file.",action= "SLURM-GENERATE",object_rec=str(output_directory))
+            nml_log.save()
+            nml_log.log("created slurm file.", action="SLURM-REPLACE", object_rec=str(output_directory))
+            nml_log.log("created slurm file.",action= "SLURM-GENERATE",object_rec=str(output_directory))
 
     #  Generating the slurm file
     # ----------------------------------------------------------------------------------------------------------------- #
     printer.print("%sGenerating the slurm executable..." % fdbg_string, end="\n")
 
-    with open(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "lib", "templates", "ramses_slurm.template"),
-              "r") as template:
+    with open(get_ramses_software(nml_software).template, "r") as template:
         write_slurm_file(template.read(),
                          name=slurm_output,
                          open_mpi_package=CONFIG["System"]["Modules"]["open_mpi_package"],
                          gcc_package=CONFIG["System"]["Modules"]["gcc_package"],
                          nml_path=nml_location,
                          output_dir=output_directory,
-                         executable=CONFIG["System"]["Executables"][types["software"]["RAMSES"][nml_software]["exec"]]
+                         executable=get_ramses_software(nml_software).executable_path
                          )
 
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -429,7 +435,7 @@ if __name__ == '__main__':
 
     if not user_arguments.stop:
         printer.print("%sAdding the job to the SLURM queue..." % fdbg_string, end="")
-        os.system("sbatch %s.SLURM" % slurm_path)
-        nml_log.log("Ran slurm file for %s" % str(output_directory), "SLURM-RUN", object_rec=str(output_directory))
-
+        job_id = submit_job("%s.SLURM" % slurm_path, after=user_arguments.after, record=nml_log,
+                            object_rec=str(output_directory), stage="ramses")
         printer.print(done_string)
+        printer.print("%sSubmitted job %s." % (fdbg_string, job_id))
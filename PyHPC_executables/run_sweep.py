@@ -0,0 +1,198 @@
+"""
+=======================
+RAMSES Parameter Sweeps
+=======================
+
+The ``run_sweep.py`` executable writes the ``.nml`` files of a grid of ``RAMSES`` runs over one initial condition and
+submits all of them as a single SLURM job array.
+
+Usage
+-----
+
+.. code-block:: console
+
+    usage: run_sweep.py [-h] -i IC [--ramses_config RAMSES_CONFIG] [-o OUTPUT] [--slurm_output SLURM_OUTPUT] [-s]
+                        [--simulation_log SIMULATION_LOG] [--after AFTER [AFTER ...]] sweep
+
+    positional arguments:
+      sweep                 The sweep specification (.toml).
+
+    optional arguments:
+      -h, --help            show this help message and exit
+      -i IC, --ic IC        The initial condition file of the sweep.
+      --ramses_config RAMSES_CONFIG
+                            The base RAMSES configuration (defaults to RAMSES.config).
+      -o OUTPUT, --output OUTPUT
+                            The output directory of the sweep (defaults to the name of the sweep).
+      --slurm_output SLURM_OUTPUT
+                            Use this to hard set the slurm file location.
+      -s, --stop            Enable this flag to generate only the slurm file but not execute.
+      --simulation_log SIMULATION_LOG
+                            A [PATH] to a simulation logger if desired.
+      --after AFTER [AFTER ...]
+                            The job ids which must complete successfully before the sweep starts.
+
+Notes
+-----
+The format of the sweep specification is described in ``PyHPC.PyHPC_System.parameter_sweeps``. The ``.nml`` files are
+written to ``<nml_directory>/<name>`` and each run writes its outputs to ``<simulation_directory>/<software>/<output>/<nml
+name>``. Every simulation is registered in the simulation log (with its sweep parameters in its ``meta``) with a single
+write, through the simulation log daemon if one is running (see ``simlog_daemon.py``). The job array is written from
+the ``array_exec_string`` template of the software (see ``PyHPC.PyHPC_System.software``).
+"""
+import argparse
+import os
+import pathlib as pt
+import sys
+import warnings
+
+import toml
+from colorama import Fore, Style
+
+sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.errors import *
+import logging
+from PyHPC.PyHPC_Core.log import configure_logging
+from PyHPC.PyHPC_System.io import write_slurm_file, format_array_spec, submit_job
+from PyHPC.PyHPC_System.job_status import record_submission
+from PyHPC.PyHPC_System.parameter_sweeps import load_sweep, sweep_points, write_sweep, register_sweep
+from PyHPC.PyHPC_System.simulation_daemon import open_simulation_log
+from PyHPC.PyHPC_System.software import get_ramses_software
+from PyHPC.PyHPC_Utils.text_display_utilities import print_title, TerminalString, PrintRetainer
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Setup ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+_location = "PyHPC_executables"
+_filename = pt.Path(__file__).name.replace(".py", "")
+_dbg_string = "%s:%s:" % (_location, _filename)
+fdbg_string = "%s [%s]: " % (_dbg_string, Fore.GREEN + "Sweep Wizard" + Style.RESET_ALL)
+CONFIG = read_config()
+modlog = logging.getLogger(__name__)
+printer = PrintRetainer()
+# - managing warnings -#
+if not CONFIG["System"]["Logging"]["warnings"]:
+    warnings.filterwarnings('ignore')
+
+# - Organizational Strings -#
+ramses_nml_config = os.path.join(CONFIG["System"]["Directories"]["bin"], "configs", "RAMSES.config")
+done_string = "[" + Fore.CYAN + Style.BRIGHT + "DONE" + Style.RESET_ALL + "]"
+fail_string = "[" + Fore.RED + Style.BRIGHT + "FAILED" + Style.RESET_ALL + "]"
+
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+# ------------------------------------------------------ Main  ----------------------------------------------------------#
+# --|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--|--#
+if __name__ == '__main__':
+
+    #  Printing Introduction, etc.
+    # ----------------------------------------------------------------------------------------------------------------- #
+    configure_logging(__file__)
+    term_string = TerminalString()
+    print_title(func=printer.print)
+    printer.print(term_string.str_in_grid(""))
+    printer.print(term_string.str_in_grid(Fore.BLUE + "RAMSES Parameter Sweeps" + Style.RESET_ALL, alignment="center"))
+    printer.print(term_string.str_in_grid(""))
+    printer.print(term_string.h + "\n")
+
+    #  Argument Parsing
+    # ----------------------------------------------------------------------------------------------------------------- #
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("sweep", type=str, help="The sweep specification (.toml).")
+    argparser.add_argument("-i", "--ic", type=str, required=True, help="The initial condition file of the sweep.")
+    argparser.add_argument("--ramses_config", type=str, help="The base RAMSES configuration (defaults to RAMSES.config).",
+                           default=ramses_nml_config)
+    argparser.add_argument("-o", "--output", type=str,
+                           help="The output directory of the sweep (defaults to the name of the sweep).", default=None)
+    argparser.add_argument("--slurm_output", type=str, help="Use this to hard set the slurm file location.",
+                           default=None)
+    argparser.add_argument("-s", "--stop", action="store_true",
+                           help="Enable this flag to generate only the slurm file but not execute.")
+    argparser.add_argument("--simulation_log", type=str, help="A [PATH] to a simulation logger if desired.",
+                           default=None)
+    argparser.add_argument("--after", type=str, nargs="+", help="The job ids which must complete successfully before the job starts.",
+                           default=None)
+    user_arguments = argparser.parse_args()
+
+    # -------------------------------------------------------------------------------------------------------------------- #
+    # Loading the sweep ================================================================================================== #
+    # -------------------------------------------------------------------------------------------------------------------- #
+    printer.print("%sLoading the sweep %s..." % (fdbg_string, user_arguments.sweep), end="")
+    sweep = load_sweep(user_arguments.sweep)
+    points = sweep_points(sweep["parameters"], mode=sweep["mode"], samples=sweep.get("samples"),
+                          seed=sweep.get("seed"))
+    printer.print(done_string)
+    printer.print("%s\t%s runs (%s) over %s." % (fdbg_string, len(points), sweep["mode"],
+                                                 ", ".join(sweep["parameters"].keys())))
+
+    try:
+        ramses_config = toml.load(user_arguments.ramses_config)
+    except FileNotFoundError:
+        raise PyHPC_Error("Failed to locate the ramses configuration file at %s." % user_arguments.ramses_config)
+    except toml.TomlDecodeError:
+        raise PyHPC_Error("Failed to correctly load the file %s in TOML format." % user_arguments.ramses_config)
+
+    ramses_config["META"]["ic_file"]["v"] = str(user_arguments.ic)
+    nml_software = ramses_config["META"]["software"]["v"]
+    software = get_ramses_software(nml_software)
+    problems = software.validate(ramses_config)
+    if len(problems):
+        raise PyHPC_Error("The software %s can't be used: %s" % (nml_software, " ".join(problems)))
+
+    printer.print("%sLoading the simulation log..." % fdbg_string, end="")
+    simlog = open_simulation_log(path=user_arguments.simulation_log, lazy=True)
+    printer.print(done_string)
+
+    # -------------------------------------------------------------------------------------------------------------------- #
+    # Writing the sweep ================================================================================================== #
+    # -------------------------------------------------------------------------------------------------------------------- #
+    nml_directory = os.path.join(CONFIG["System"]["Directories"]["nml_directory"], sweep["name"])
+    output_directory = pt.Path(CONFIG["System"]["Simulations"]["simulation_directory"], nml_software,
+                               user_arguments.output or sweep["name"])
+
+    if not user_arguments.slurm_output:
+        slurm_output = sweep["name"]
+        slurm_path = pt.Path(os.path.join(CONFIG["System"]["Directories"]["slurm_directory"], slurm_output))
+    else:
+        slurm_output = pt.Path(user_arguments.slurm_output).name
+        slurm_path = pt.Path(user_arguments.slurm_output)
+
+    printer.print("%sWriting the .nml files to %s..." % (fdbg_string, nml_directory), end="")
+    nml_paths = write_sweep(ramses_config, points, nml_directory, sweep["name"])
+    printer.print(done_string)
+
+    printer.print("%sRegistering the sweep in the simulation log..." % fdbg_string, end="")
+    outputs = register_sweep(simlog, user_arguments.ic, nml_paths, points, nml_software, output_directory,
+                             sweep["name"], slurm_path=str(slurm_path) + ".SLURM")
+    printer.print(done_string)
+
+    #  Generating the slurm file
+    # ----------------------------------------------------------------------------------------------------------------- #
+    printer.print("%sGenerating the slurm executable..." % fdbg_string, end="\n")
+    with open(software.array_template, "r") as template:
+        write_slurm_file(template.read(),
+                         name=slurm_output,
+                         array=format_array_spec(range(len(nml_paths)),
+                                                 max_concurrent=CONFIG["System"]["SLURM"]["array_max_concurrent"]),
+                         open_mpi_package=CONFIG["System"]["Modules"]["open_mpi_package"],
+                         gcc_package=CONFIG["System"]["Modules"]["gcc_package"],
+                         sweep_list=os.path.join(nml_directory, "%s.sweep" % sweep["name"]),
+                         output_root=output_directory,
+                         executable=software.executable_path
+                         )
+
+    os.system('cls' if os.name == 'nt' else 'clear')
+    printer.reprint(end="")
+    printer.print(done_string)
+
+    if not user_arguments.stop:
+        printer.print("%sAdding the sweep to the SLURM queue..." % fdbg_string, end="")
+        job_id = submit_job("%s.SLURM" % slurm_path, after=user_arguments.after)
+        with simlog.batch():
+            for task_id, (nml_path, output) in enumerate(zip(nml_paths, outputs)):
+                simrec = simlog.find_by_nml(nml_path)
+                simrec.log("Ran slurm file for %s" % output, "SLURM-RUN", object_rec=output,
+                           job_id="%s_%s" % (job_id, task_id), stage="ramses")
+                record_submission(simrec, "%s_%s" % (job_id, task_id), "ramses", object_rec=output)
+        printer.print(done_string)
+        printer.print("%sSubmitted job %s." % (fdbg_string, job_id))
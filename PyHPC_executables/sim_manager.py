@@ -3,6 +3,9 @@
 Simulation Log Manager
 ======================
 
+With ``--jobs``, the states of the SLURM jobs recorded in the log are synced (see ``PyHPC_System.job_status``) when a
+table is drawn and shown in the ``Job State`` column. The states are fetched for all of the jobs at once and synced
+again once they have been cached for ``CONFIG["System"]["SLURM"]["status_ttl"]`` seconds.
 """
 import os
 import pathlib as pt
@@ -13,14 +16,16 @@ import pandas as pd
 sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
 from PyHPC.PyHPC_Utils.text_display_utilities import TerminalString,get_yes_no, print_title, KeyLogger,get_dict_str,edit_dictionary
 from tqdm import tqdm
-from time import sleep
+from time import sleep, monotonic
 import argparse
 from PyHPC.PyHPC_Core.configuration import read_config
 from PyHPC.PyHPC_System.simulation_management import SimulationLog
+from PyHPC.PyHPC_System.job_status import JobStatusPoller, sync_job_states
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
 import logging
 from PyHPC.PyHPC_Core.log import configure_logging
 import json
-from PyHPC.PyHPC_Utils.standard_utils import getFromDict,isInDict
+from PyHPC.PyHPC_Core.utils import format_size
 from colorama import Fore,Back,Style
 from sshkeyboard import listen_keyboard
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -53,12 +58,28 @@ def get_frame(simobject, available_columns):
     _name = type(simobject).__name__  #: The name of the simulation object class.
     columns = available_columns[_name]
 
-
     data = simobject.listed
 
+    #- Selecting the rows of the children from the columnar projection of the log -#
+    if _name == "SimulationLog":
+        table = simobject.columns.children()
+    elif _name == "InitCon":
+        table = simobject.parent.columns.children(simobject.name)
+    else:
+        table = simobject.parent.parent.columns.children(simobject.parent.name, simobject.name)
+    table = table.reindex(list(data.keys()))
+
+    #- The cached disk usage of the output directories (refreshed with --usage) -#
+    usage = simobject.get_disk_usage(refresh=False)
+
     output_frame = pd.DataFrame({**{"Name":[pt.Path(key).name for key in data]},**{
-        column: [getFromDict(data[key], maplist) if isInDict(data[key], maplist) else "N.S." for key in data]  for column, maplist in columns.items()
-    }})
+        column: (table[".".join(maplist)].where(table[".".join(maplist)].notna(), "N.S.").tolist()
+                 if ".".join(maplist) in table.columns else ["N.S."] * len(data)) for column, maplist in columns.items()
+    },**{"Disk Usage":[format_size(usage[key][0]) if usage.get(key) is not None else "N.S." for key in data]}})
+
+    #- The state of the latest SLURM job of each entry (synced with --jobs) -#
+    if "meta.job_state" in table.columns:
+        output_frame["Job State"] = table["meta.job_state"].where(table["meta.job_state"].notna(), "N.S.").tolist()
 
     return output_frame
 
@@ -98,6 +119,8 @@ if __name__ == '__main__':
     # -------------------------------------------------------------------------------------------------------------------- #
     arg_parser = argparse.ArgumentParser()
     arg_parser.add_argument("--simlog", "-s", help="The simulation log to link to", default=None)
+    arg_parser.add_argument("--usage", "-u", help="Refresh the disk usage of the output directories.", action="store_true")
+    arg_parser.add_argument("--jobs", "-j", help="Show the live states of the SLURM jobs of the entries.", action="store_true")
     args = arg_parser.parse_args()
     #  False Loading Screen
     # ----------------------------------------------------------------------------------------------------------------- #
@@ -117,6 +140,9 @@ if __name__ == '__main__':
         sys.exit()
 
     print("[Sim-Manager]: Successfully loaded %s." % _simulation_log)
+    if args.usage:
+        print("[Sim-Manager]: Refreshing the disk usage of the output directories...")
+        _simulation_log.get_disk_usage(refresh=True)
     sleep(1)
     # -------------------------------------------------------------------------------------------------------------------- #
     # Main Cycle ========================================================================================================= #
@@ -134,12 +160,22 @@ if __name__ == '__main__':
     #  Entering main cycle
     # ----------------------------------------------------------------------------------------------------------------- #
     frame = None
+    job_poller = JobStatusPoller()
+    sync_jobs, synced = args.jobs, None  # -> the jobs are synced again once their cached states expire.
     while not klog.exit:
         os.system('cls' if os.name == 'nt' else 'clear')
 
         #  Printing
         # ----------------------------------------------------------------------------------------------------------------- #
         if not isinstance(klog.object,dict):
+            if sync_jobs and (synced is None or monotonic() - synced > job_poller.ttl):
+                synced = monotonic()
+                try:
+                    klog.reframe = len(sync_job_states(_simulation_log, job_poller)) > 0 or klog.reframe
+                except PyHPC_Error as error:
+                    print("[Sim-Manager]: Failed to sync the job states (%s)." % error)
+                    sync_jobs = False
+                    sleep(2)
             if klog.reframe:
                 frame = get_frame(klog.object,available_columns)
                 klog.reframe = False
@@ -167,14 +203,14 @@ if __name__ == '__main__':
 
                 if klog.command == "log" and len(klog.location) >= 1:
                     os.system('cls' if os.name == 'nt' else 'clear')
+                    # - The archived entries are included, they are only read from disk here. -#
                     if type(klog.object).__name__ != "SimRec":
-                        out_dict = klog.object[list(klog.object.listed.keys())[klog.position]].raw["action_log"].copy()
+                        out_dict = klog.object[list(klog.object.listed.keys())[klog.position]].get_action_log()
                     else:
-                        out_dict = klog.object["outputs"][list(klog.object.listed.keys())[klog.position]]["action_log"].copy()
+                        out_dict = klog.object.get_action_log(output=list(klog.object.listed.keys())[klog.position])
                     print_dict = {}
                     for k,v in out_dict.items():
-                        out_dict[k]["act"] = Fore.RED+v["act"]+Style.RESET_ALL
-                        print_dict[Fore.GREEN+k+Style.RESET_ALL] = v
+                        print_dict[Fore.GREEN+k+Style.RESET_ALL] = {**v, "act": Fore.RED+v["act"]+Style.RESET_ALL}
 
                     print(get_dict_str(print_dict))
 
@@ -200,26 +236,28 @@ if __name__ == '__main__':
                         klog.selected.remove(klog.position
                                              )
                 if klog.command == "delete":
-                    verify = get_yes_no("[Sim-Manager]: Delete %s Items from %s?"%(len(klog.selected),_simulation_log))
+                    #- Collecting the key paths of the selected entries -#
+                    keys = []
+                    for id in klog.selected:
+                        name = list(klog.object.listed.keys())[id]
+                        if type(klog.object).__name__ == "SimulationLog":
+                            keys.append(name)
+                        elif type(klog.object).__name__ == "InitCon":
+                            keys.append((klog.object.name, name))
+                        else:
+                            keys.append((klog.object.parent.name, klog.object.name, name))
 
-                    if verify:
-                        for id in klog.selected:
-                            if type(klog.object).__name__ != "SimRec":
-                                obj = klog.object[list(klog.object.listed.keys())[id]]
-                            else:
-                                obj = klog.object.listed[list(klog.object.listed.keys())[id]]
+                    verify = get_yes_no("[Sim-Manager]: Delete %s Items from %s?"%(len(keys),_simulation_log))
 
-                            print("Sim-Manager]: Deleting %s."%obj)
-                            if not isinstance(obj,dict):
-                                obj.delete()
-                            else:
-                                #- This is a dictionary
-                                del klog.location[-1].raw["outputs"][list(klog.location[-1].raw["outputs"].keys())[id]]
-                                klog.location[-1].save()
+                    if verify:
+                        dry_run = _simulation_log.bulk_delete(keys, dry_run=True)
+                        remove_files = get_yes_no("[Sim-Manager]: Delete their files as well? (%s files, %s directories, %.2f GB)"%(
+                            dry_run.files, dry_run.directories, dry_run.bytes / 1e9))
 
+                        print("[Sim-Manager]: Deleting %s items."%len(keys))
+                        print("[Sim-Manager]: %s"%_simulation_log.bulk_delete(keys, remove_files=remove_files))
 
                         input("[Sim-Manager]: Press any key to proceed...")
-                        _simulation_log.save()
                         klog.reframe = True
                         klog.position = 0
                         klog.object = klog.location[-1]
@@ -0,0 +1,73 @@
+"""
+=====================
+Simulation Log Daemon
+=====================
+Starts, stops and queries the daemon serving a simulation log (see ``PyHPC.PyHPC_System.simulation_daemon``).
+
+**Usage:**
+
+.. code-block:: commandline
+
+    python3 simlog_daemon.py start [--simulation_log SIMULATION_LOG] [--socket SOCKET] [--flush_interval SECONDS]
+    python3 simlog_daemon.py {stop,status,flush} [--simulation_log SIMULATION_LOG] [--socket SOCKET]
+
+The daemon runs in the foreground, so it is usually started in the background (``... start &``) or from the batch
+script before the jobs which log to it. ``run_sweep.py``, ``run_campaign.py`` and the job arrays of ``ImageManager.py``
+log through it whenever it is running; the other executables load the log directly, and their changes are merged into
+it on its next write.
+"""
+import argparse
+import logging
+import os
+import pathlib as pt
+import sys
+
+sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
+from PyHPC.PyHPC_Core.configuration import read_config
+from PyHPC.PyHPC_Core.log import configure_logging
+from PyHPC.PyHPC_System.simulation_daemon import SimulationLogDaemon, connect
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Setup ============================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+CONFIG = read_config()
+modlog = logging.getLogger("PyHPC_executables.simlog_daemon.py")
+
+if __name__ == '__main__':
+    configure_logging(__file__)
+    # -------------------------------------------------------------------------------------------------------------------- #
+    # Argument Parsing =================================================================================================== #
+    # -------------------------------------------------------------------------------------------------------------------- #
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("command", choices=["start", "stop", "status", "flush"], help="The action to take.")
+    arg_parser.add_argument("--simulation_log", "-s", help="The simulation log to serve.", default=None)
+    arg_parser.add_argument("--socket", help="The socket of the daemon (defaults to <log>.sock).", default=None)
+    arg_parser.add_argument("--flush_interval", type=float, help="The time (in seconds) between writes.",
+                            default=None)
+    args = arg_parser.parse_args()
+
+    # -------------------------------------------------------------------------------------------------------------------- #
+    # Execution ========================================================================================================== #
+    # -------------------------------------------------------------------------------------------------------------------- #
+    if args.command == "start":
+        daemon = SimulationLogDaemon(path=args.simulation_log, socket_path=args.socket,
+                                     flush_interval=args.flush_interval)
+        print("[Simlog-Daemon]: Serving %s on %s." % (daemon.simlog, daemon.socket_path))
+        daemon.serve()
+        print("[Simlog-Daemon]: Stopped.")
+        sys.exit()
+
+    client = connect(args.simulation_log, socket_path=args.socket)
+    if client is None:
+        print("[Simlog-Daemon]: No daemon is running for %s." % (args.socket or args.simulation_log or "the default log"))
+        sys.exit(1)
+
+    if args.command == "status":
+        print("[Simlog-Daemon]: %s" % client.request("ping"))
+        client.close()
+    elif args.command == "flush":
+        print("[Simlog-Daemon]: Wrote %s pending operations." % client.request("flush"))
+        client.close()
+    else:
+        client.shutdown()
+        print("[Simlog-Daemon]: Stopped the daemon of %s." % client.path)
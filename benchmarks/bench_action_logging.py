@@ -0,0 +1,87 @@
+"""
+Benchmarks the per-entry cost of action logging in ``PyHPC.PyHPC_System.simulation_management``.
+
+Compares the caller capture through ``inspect.stack`` (the previous implementation) against
+``simulation_management.get_caller`` and times ``SimRec.log`` with caller capture on and off.
+
+**Usage:**
+
+.. code-block:: commandline
+
+    python benchmarks/bench_action_logging.py -n 2000 -d 20
+"""
+import argparse
+import json
+import os
+import pathlib as pt
+import sys
+import tempfile
+from inspect import getframeinfo, stack
+from time import perf_counter
+
+sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
+from PyHPC.PyHPC_System import simulation_management
+from PyHPC.PyHPC_System.simulation_management import SimulationLog, get_caller
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sub Functions ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def capture_with_stack():
+    caller = getframeinfo(stack()[1][0])
+    return caller.filename, caller.lineno
+
+
+def capture_with_getframe():
+    return get_caller()
+
+
+def at_depth(function, depth):
+    """Calls ``function`` from ``depth`` nested frames, as it would be from within a larger program."""
+    if depth <= 0:
+        return function()
+    return at_depth(function, depth - 1)
+
+
+def time_per_call(function, number):
+    """Returns the mean time (in microseconds) of ``number`` calls to ``function``."""
+    t_in = perf_counter()
+    for _ in range(number):
+        function()
+    return 1e6 * (perf_counter() - t_in) / number
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Main =============================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("-n", "--number", type=int, default=2000, help="The number of log entries to time.")
+    argparser.add_argument("-d", "--depth", type=int, default=20, help="The stack depth of the calls.")
+    args = argparser.parse_args()
+
+    #  Caller capture alone
+    # ---------------------------------------------------------------------------------------------------------------- #
+    print("Caller capture at stack depth %s (us / call):" % args.depth)
+    print("\tinspect.stack     : %8.2f" % time_per_call(lambda: at_depth(capture_with_stack, args.depth), args.number))
+    print("\tsys._getframe     : %8.2f" % time_per_call(lambda: at_depth(capture_with_getframe, args.depth),
+                                                         args.number))
+
+    #  Full log entries
+    # ---------------------------------------------------------------------------------------------------------------- #
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "Simlog.json")
+        with open(path, "w") as f:
+            json.dump({}, f)
+
+        simlog = SimulationLog(path, backend="json")
+        simlog.add({"ic.dat": {}})
+        simlog.ics["ic.dat"].add({"run.nml": {}})
+        simrec = simlog.ics["ic.dat"].sims["run.nml"]
+
+        print("SimRec.log at stack depth %s without saving (us / entry):" % args.depth)
+        for capture in [True, False]:
+            simulation_management.CONFIG["System"]["SimulationLog"]["capture_caller"] = capture
+            print("\tcapture_caller=%-5s: %8.2f" % (capture, time_per_call(
+                lambda: at_depth(lambda: simrec.log("Benchmark.", "BENCH", auto_save=False), args.depth),
+                args.number)))
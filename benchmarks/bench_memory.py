@@ -0,0 +1,95 @@
+"""
+Benchmarks the memory of loaded simulation logs in ``PyHPC.PyHPC_System.simulation_management``.
+
+Writes a synthetic log with ``-n`` outputs (spread over 10 initial conditions of 10 simulations each), each with ``-e``
+action log entries, and reports the memory held by a ``SimulationLog`` loaded with the standard representation and
+with the compact one (``PyHPC.PyHPC_System.simulation_compact``), along with the load times.
+
+**Usage:**
+
+.. code-block:: commandline
+
+    python benchmarks/bench_memory.py -n 20000 -e 10
+"""
+import argparse
+import gc
+import os
+import pathlib as pt
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
+from PyHPC.PyHPC_System.simulation_management import SimulationLog
+from PyHPC.PyHPC_System.simulation_storage import JSONBackend
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sub Functions ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def synthetic_log(number, entries):
+    """Produces a raw simulation log with ``number`` outputs, each with ``entries`` action log entries."""
+    n_ics, n_sims = 10, 10
+    per_sim = max(number // (n_ics * n_sims), 1)
+    count = iter(range(10 ** 9))
+
+    def action_log(size, **kwargs):
+        log = {}
+        for _ in range(size):
+            i = next(count)
+            log["01-01-2023_00-%02d-%02d.%06d" % (i // 60 % 60, i % 60, i)] = {
+                "msg": "Generated frame %s." % (i % 500), "act": ["FIG-GEN", "RAMSES-RUN", "SLURM-GENERATE"][i % 3],
+                "lineno": 120 + i % 3, "file": "/home/user/PyHPC/PyHPC_executables/ImageManager.py",
+                "time": "01-01-2023_00-%02d-%02d" % (i // 60 % 60, i % 60), **kwargs}
+        return log
+
+    raw = {}
+    for i in range(n_ics):
+        simulations = {}
+        for j in range(n_sims):
+            nml = "/home/user/nmls/ic_%s/run_%s.nml" % (i, j)
+            outputs = {}
+            for k in range(per_sim):
+                path = "/scratch/user/simulations/RAMSES/ic_%s/run_%s/output_%05d" % (i, j, k)
+                outputs[path] = {"information": "", "meta": {"path": path, "dateCreated": "01-01-2023_00-00-00",
+                                                             "software": "RAMSES"},
+                                 "action_log": action_log(entries, object=path, level="SimRec")}
+            simulations[nml] = {"information": "", "meta": {"software": "RAMSES", "isRun": True},
+                                "action_log": action_log(entries), "outputs": outputs}
+        raw["/home/user/ics/ic_%s.dat" % i] = {"information": "", "meta": {"software": "clustep"}, "core": {},
+                                               "action_log": action_log(entries), "simulations": simulations}
+    return raw
+
+
+def measure(path, compact):
+    """Loads the log at ``path`` and returns the memory it holds (in MB) and the load time (in s)."""
+    gc.collect()
+    tracemalloc.start()
+    t_in = perf_counter()
+    simlog = SimulationLog(path, backend="json", compact=compact)
+    elapsed = perf_counter() - t_in
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del simlog
+    return current / 1e6, peak / 1e6, elapsed
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Main =============================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("-n", "--number", type=int, default=20000, help="The number of outputs in the log.")
+    argparser.add_argument("-e", "--entries", type=int, default=10, help="The action log entries of each output.")
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "Simlog.json")
+        JSONBackend(path).commit(synthetic_log(args.number, args.entries))
+        print("Synthetic log with %s outputs of %s action log entries (%.1f MB on disk):" % (
+            args.number, args.entries, os.path.getsize(path) / 1e6))
+
+        for name, compact in [("standard", False), ("compact", True)]:
+            print("\t%-10s: held %8.1f MB, peak %8.1f MB, load %6.2f s" % (name, *measure(path, compact)))
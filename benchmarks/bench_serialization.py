@@ -0,0 +1,111 @@
+"""
+Benchmarks the serialization of simulation logs in ``PyHPC.PyHPC_System.simulation_storage``.
+
+Builds a synthetic log with ``-n`` outputs (spread over 10 initial conditions of 10 simulations each) and times
+encoding, decoding and the full write / load through ``JSONBackend`` for the standard library encoder (the previous
+implementation) and each of the available serializers.
+
+**Usage:**
+
+.. code-block:: commandline
+
+    python benchmarks/bench_serialization.py -n 50000
+"""
+import argparse
+import json
+import os
+import pathlib as pt
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
+from PyHPC.PyHPC_Core.errors import PyHPC_Error
+from PyHPC.PyHPC_Core.utils import NonStandardEncoder
+from PyHPC.PyHPC_System.simulation_storage import JSONBackend, serializers
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Sub Functions ====================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+def synthetic_log(number):
+    """Produces a raw simulation log with ``number`` outputs, each with a short action log."""
+    n_ics, n_sims = 10, 10
+    per_sim = max(number // (n_ics * n_sims), 1)
+    entry = lambda i: {"time": "01-01-2023_00-00-00.%06d" % i, "act": "GEN", "msg": "Generated output %s." % i,
+                       "file": "run_ramses.py", "line": 120}
+
+    raw = {}
+    for i in range(n_ics):
+        simulations = {}
+        for j in range(n_sims):
+            outputs = {"/sims/ic_%s/run_%s/output_%05d" % (i, j, k): {
+                "information": "", "meta": {"dateCreated": "01-01-2023_00-00-00", "lastEdited": "01-01-2023_00-00-00",
+                                            "redshift": np.float64(k / per_sim), "ncpu": np.int64(128)},
+                "action_log": {str(k): entry(k)}} for k in range(per_sim)}
+            simulations["/nmls/run_%s.nml" % j] = {"information": "", "meta": {"software": "RAMSES"},
+                                                   "core": {"center": np.array([0.5, 0.5, 0.5])},
+                                                   "action_log": {str(j): entry(j)}, "outputs": outputs}
+        raw["/ics/ic_%s.dat" % i] = {"information": "", "meta": {"software": "clustep"},
+                                     "core": {"masses": np.arange(100000.0)}, "simulations": simulations}
+    return raw
+
+
+def best_time(function, repeats):
+    """Returns the best time (in seconds) of ``repeats`` calls to ``function``."""
+    times = []
+    for _ in range(repeats):
+        t_in = perf_counter()
+        function()
+        times.append(perf_counter() - t_in)
+    return min(times)
+
+
+# -------------------------------------------------------------------------------------------------------------------- #
+# Main =============================================================================================================== #
+# -------------------------------------------------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("-n", "--number", type=int, default=50000, help="The number of outputs in the log.")
+    argparser.add_argument("-r", "--repeats", type=int, default=3, help="The number of repeats of each timing.")
+    args = argparser.parse_args()
+
+    raw = synthetic_log(args.number)
+    print("Synthetic log with %s outputs (best of %s, s):" % (args.number, args.repeats))
+
+    #  Encoding alone
+    # ---------------------------------------------------------------------------------------------------------------- #
+    data = json.dumps(raw, cls=NonStandardEncoder)
+    print("\t%-24s: dumps %6.3f, loads %6.3f, size %6.1f MB" % (
+        "NonStandardEncoder", best_time(lambda: json.dumps(raw, cls=NonStandardEncoder), args.repeats),
+        best_time(lambda: json.loads(data), args.repeats), len(data) / 1e6))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, serializer_class in serializers.items():
+            try:
+                serializer = serializer_class(sidecar_directory=directory)
+            except PyHPC_Error as error:
+                print("\t%-24s: unavailable (%s)" % (name, error))
+                continue
+
+            data = serializer.dumps(raw)
+            print("\t%-24s: dumps %6.3f, loads %6.3f, size %6.1f MB" % (
+                name, best_time(lambda: serializer.dumps(raw), args.repeats),
+                best_time(lambda: serializer.loads(data), args.repeats), len(data) / 1e6))
+
+    #  Full writes and loads
+    # ---------------------------------------------------------------------------------------------------------------- #
+    print("JSONBackend write / load (s):")
+    for name in serializers:
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                backend = JSONBackend(os.path.join(directory, "Simlog.json"), serializer=name)
+            except PyHPC_Error:
+                continue
+
+            print("\t%-24s: write %6.3f, load %6.3f, lazy load %6.3f" % (
+                name, best_time(lambda: backend.commit(raw), args.repeats),
+                best_time(lambda: backend.load(), args.repeats),
+                best_time(lambda: backend.load(lazy=True), args.repeats)))
@@ -12,6 +12,7 @@ import pathlib as pt
 import shutil
 import unittest
 import sys
+import tempfile
 import pytest
 
 
@@ -60,4 +61,656 @@ class TestCore(unittest.TestCase):
             d = f.read()
 
         os.remove(os.path.join(pt.Path(__file__).parents[0], "temp.ini"))
-        assert d == self.test_data["test_utils_write_ini"]["ini_dict_val"]
\ No newline at end of file
+        assert d == self.test_data["test_utils_write_ini"]["ini_dict_val"]
+
+class TestSimulationManagement(unittest.TestCase):
+    with open(os.path.join(pt.Path(__file__).parents[0], "test_data/pytest_data.json")) as f:
+        test_data = json.load(f)["TestSimulationManagement"]
+
+    def setUp(self) -> None:
+        sys.path.append(str(pt.Path(os.path.realpath(__file__)).parents[1]))
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "Simlog.json")
+
+        with open(self.path, "w") as f:
+            json.dump(self.test_data["simlog"], f)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_journal_backend(self):
+        """tests that the ``journal`` backend appends changes and replays them on load."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="journal")
+        simlog.ics["ic_1.dat"].add({"run.nml": {"information": "test"}})
+        simlog.ics["ic_1.dat"].log("Test message.", "TEST")
+
+        # - The base file is untouched, the changes live in the journal -#
+        with open(self.path, "r") as f:
+            assert json.load(f) == self.test_data["simlog"]
+        assert os.path.exists(self.path + ".journal")
+
+        reloaded = SimulationLog(self.path, backend="journal")
+        assert reloaded.raw == simlog.raw
+
+        # - A full save compacts the journal -#
+        reloaded.save()
+        assert not os.path.exists(self.path + ".journal")
+        assert SimulationLog(self.path, backend="json").raw == simlog.raw
+
+    def test_sqlite_backend(self):
+        """tests that the ``sqlite`` backend imports, round-trips and queries the log."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="sqlite")
+        simlog.ics["ic_1.dat"].add({"run.nml": {"information": "test", "meta": {"software": "R-DICE"}}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].add({"output_dir": {}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].log("Test message.", "TEST", object_rec="output_dir")
+
+        reloaded = SimulationLog(self.path, backend="sqlite")
+        assert reloaded.raw == simlog.raw
+        assert reloaded.backend.query("output", software="R-DICE", action="TEST") == [
+            ("ic_1.dat", "run.nml", "output_dir")]
+        assert reloaded.backend.query("sim", software="NA") == []
+
+        reloaded.ics["ic_1.dat"].sims["run.nml"].delete(force=True)
+        assert SimulationLog(self.path, backend="sqlite").raw == reloaded.raw
+
+    def test_sharded_backend(self):
+        """tests that the ``sharded`` backend imports the log and only rewrites the shards which changed."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="sharded")
+        simlog.bulk_add({"ic_2.dat": {}, ("ic_2.dat", "run.nml"): {}})
+        shards = {ic: os.path.join(simlog.backend.shard_directory, simlog.backend.shard_name(ic))
+                  for ic in ["ic_1.dat", "ic_2.dat"]}
+        os.utime(shards["ic_1.dat"], ns=(1, 1))
+
+        simlog.ics["ic_2.dat"].sims["run.nml"].log("Test message.", "TEST")
+        assert os.stat(shards["ic_1.dat"]).st_mtime_ns == 1
+
+        reloaded = SimulationLog(self.path, backend="sharded", lazy=True)
+        assert reloaded.raw.loaded == [] and len(reloaded.ics["ic_2.dat"].sims["run.nml"].raw["action_log"]) == 1
+        assert dict(reloaded.raw.items()) == simlog.raw
+
+        # - Writers to different initial conditions neither rewrite the manifest nor reload each other's changes -#
+        first, second = SimulationLog(self.path, backend="sharded"), SimulationLog(self.path, backend="sharded")
+        raw, manifest = first.raw, os.stat(simlog.backend.manifest_path)
+        second.ics["ic_1.dat"].log("Second.", "TEST")
+        first.ics["ic_2.dat"].log("First.", "TEST")
+        assert first.raw is raw and os.stat(simlog.backend.manifest_path).st_ino == manifest.st_ino
+
+        second.ics["ic_2.dat"].log("Second.", "TEST")  # -> merges the write of the first to the same shard.
+        messages = [entry["msg"] for entry in SimulationLog(self.path, backend="sharded").ics["ic_2.dat"].raw[
+            "action_log"].values()]
+        assert messages[-2:] == ["First.", "Second."]
+
+        reloaded.bulk_delete(["ic_2.dat"], remove_files=False)
+        assert not os.path.exists(shards["ic_2.dat"])
+        assert list(SimulationLog(self.path, backend="sharded").raw.keys()) == ["ic_1.dat"]
+
+    def test_daemon(self):
+        """tests that clients of a daemon share the log and that their changes are written together."""
+        from PyHPC.PyHPC_System.simulation_daemon import SimulationLogDaemon, connect, open_simulation_log
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        daemon = SimulationLogDaemon(self.path, backend="json", flush_interval=3600)
+        daemon.start()
+        try:
+            first, second = connect(self.path), open_simulation_log(self.path)
+            assert first is not None and type(second).__name__ == "SimulationLogClient"
+
+            first.ics["ic_1.dat"].add({"run.nml": {"information": "test"}})
+            with second.batch():
+                second.ics["ic_1.dat"].sims["run.nml"].add({"/out/run": {}})
+                second.ics["ic_1.dat"].sims["run.nml"].log("Test message.", "TEST", object_rec="/out/run")
+                assert "/out/run" not in first.ics["ic_1.dat"].sims["run.nml"]
+
+            assert first.find_by_output("/out/run").name == "run.nml"
+            assert "/out/run" in first.ics["ic_1.dat"].sims["run.nml"] and "other.dat" not in first.ics
+            with pytest.raises(KeyError):
+                first.ics["other.dat"]
+
+            # - Records added in a batch can be logged on before it is applied (see register_sweep) -#
+            with first.batch():
+                first.bulk_add({"ic_3.dat": {"information": "test"}, ("ic_3.dat", "sweep.nml"): {"information": "test"},
+                                ("ic_3.dat", "sweep.nml", "/out/sweep"): {}})
+                first.ics["ic_3.dat"].sims["sweep.nml"].log("Test message.", "TEST", object_rec="/out/sweep")
+            assert first.find_by_output("/out/sweep").name == "sweep.nml"
+            assert list(second.ics["ic_3.dat"].raw["action_log"].values())[-1]["msg"] == "Test message."
+
+            # - Failed requests and batches are rolled back without losing the pending changes -#
+            with pytest.raises(SyntaxError):
+                first.bulk_add({"ic_new.dat": {"information": "test"}, ("ic_new.dat", "bad.nml"): {"information": 1}})
+            with pytest.raises(KeyError):
+                with first.batch():
+                    first.ics["ic_1.dat"].sims["run.nml"][["meta", "status"]] = "failed"
+                    first.ics["other.dat"].log("Test message.", "TEST")
+            assert "ic_new.dat" not in first and first.ics["ic_1.dat"].sims["run.nml"].meta.get("status") != "failed"
+            assert "ic_3.dat" in first and first.find_by_output("/out/run").name == "run.nml"
+
+            # - Nothing is written until the daemon flushes -#
+            assert "run.nml" not in SimulationLog(self.path, backend="json").ics["ic_1.dat"].sims
+            first.save()
+            assert SimulationLog(self.path, backend="json").raw == second.raw
+            second.close()
+            first.shutdown()
+        finally:
+            daemon.stop()
+        assert not os.path.exists(daemon.socket_path) and connect(self.path) is None
+
+    def test_compact_log(self):
+        """tests that compact logs round-trip to the same file and that their action logs behave like dictionaries."""
+        from PyHPC.PyHPC_System.simulation_compact import ActionLog
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="json", compact=True)
+        simlog.ics["ic_1.dat"].add({"run.nml": {"information": "test"}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].add({"/out/run": {}})
+        for i in range(3):
+            simlog.ics["ic_1.dat"].sims["run.nml"].log("Message %s." % i, "TEST", object_rec="/out/run", note=i)
+
+        action_log = simlog.ics["ic_1.dat"].sims["run.nml"].raw["outputs"]["/out/run"]["action_log"]
+        assert isinstance(action_log, ActionLog) and action_log.column("act") == ["TEST"] * 3
+        assert list(action_log.values())[-1]["note"] == 2
+
+        reloaded = SimulationLog(self.path, backend="json")
+        assert reloaded.raw == simlog.raw and SimulationLog(self.path, backend="json", compact=True).raw == reloaded.raw
+
+        key = list(action_log.keys())[0]
+        del action_log[key]
+        assert key not in action_log and len(action_log) == 2 and action_log.column("msg")[0] == "Message 1."
+
+    def test_slurm_array(self):
+        """tests the job array helpers of ``PyHPC.PyHPC_System.io``."""
+        pytest.importorskip("sshkeyboard")  # -> imported by io for its menus.
+        from PyHPC.PyHPC_System.io import chunk_ranges, format_array_spec, parse_array_spec, incomplete_array_tasks
+
+        chunks = chunk_ranges(23, 10)
+        assert chunks == [(0, 10), (10, 20), (20, 23)]
+        assert format_array_spec(range(len(chunks)), max_concurrent=2) == "0-2%2"
+        assert parse_array_spec(format_array_spec([4, 0, 1, 2, 9])) == [0, 1, 2, 4, 9]
+
+        markers = os.path.join(self.directory, "array")
+        os.makedirs(markers)
+        for task in [0, 2]:
+            pt.Path(markers, "%s.done" % task).touch()
+        assert incomplete_array_tasks(markers, 4) == [1, 3]
+
+    def test_parameter_sweep(self):
+        """tests that sweeps write an .nml per point and register all of them in the simulation log."""
+        pytest.importorskip("sshkeyboard")  # -> imported by io for its menus.
+        import toml
+        from PyHPC.PyHPC_System.parameter_sweeps import sweep_points, write_sweep, register_sweep
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog, _entry_defaults
+
+        settings = toml.load(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "inst", "cnfg",
+                                          "install_RAMSES.config"))
+        settings["META"]["ic_file"]["v"] = "/ics/ic_2.dat"
+        points = sweep_points({"AMR_PARAMS.levelmax": ["10", "11"], "MOVIE_PARAMS.enabled": [True, False]})
+        assert len(points) == 4 and len(sweep_points({"AMR_PARAMS.levelmax": [10, 11, 12]}, mode="latin_hypercube",
+                                                     samples=6, seed=0)) == 6
+        levels = [point["AMR_PARAMS.levelmax"] for point in sweep_points({"AMR_PARAMS.levelmax": {"min": 10, "max": 12}},
+                                                                          mode="latin_hypercube", samples=6, seed=0)]
+        assert all(isinstance(level, int) for level in levels) and sorted(levels) == [10, 10, 11, 11, 12, 12]
+
+        nml_paths = write_sweep(settings, points, os.path.join(self.directory, "nmls"), "sweep")
+        with open(nml_paths[1], "r") as nml_file:
+            nml = nml_file.read()
+        assert "levelmax = 10" in nml and "&MOVIE_PARAMS" not in nml
+
+        simlog = SimulationLog(self.path, backend="json")
+        outputs = register_sweep(simlog, "/ics/ic_2.dat", nml_paths[1:], points[1:], "R-DICE", "/out", "sweep")
+        outputs = register_sweep(simlog, "/ics/ic_2.dat", nml_paths[:1], points[:1], "R-DICE", "/out", "sweep",
+                                 slurm_path="/slurm/sweep.SLURM") + outputs
+        reloaded = SimulationLog(self.path, backend="json")
+        assert reloaded.find_by_nml(nml_paths[2]).raw["meta"]["sweep"]["parameters"] == points[2]
+        assert reloaded.find_by_output(outputs[3]).name == nml_paths[3]
+        assert reloaded.find_by_nml(nml_paths[3]).raw["outputs"][outputs[3]]["meta"]["slurm_path"] == \
+               _entry_defaults["SimRec"][1]["slurm_path"]  # -> left to the log when the sweep has no script.
+        assert reloaded.find_by_nml(nml_paths[0]).raw["outputs"][outputs[0]]["meta"]["slurm_path"] == "/slurm/sweep.SLURM"
+
+    def test_job_chain(self):
+        """tests that chained jobs are submitted with their dependencies and logged with their job ids."""
+        pytest.importorskip("sshkeyboard")  # -> imported by io for its menus.
+        from PyHPC.PyHPC_System.io import JobChain
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        # - A fake sbatch which numbers the jobs and records its arguments -#
+        with open(os.path.join(self.directory, "sbatch"), "w") as f:
+            f.write("#!/bin/sh\necho \"$@\" >> %s/calls\necho $((1000 + $(wc -l < %s/calls)))\";cluster\"\n" % (
+                self.directory, self.directory))
+        os.chmod(os.path.join(self.directory, "sbatch"), 0o755)
+        path = os.environ["PATH"]
+        os.environ["PATH"] = "%s%s%s" % (self.directory, os.pathsep, path)
+
+        simlog = SimulationLog(self.path, backend="json")
+        simlog.ics["ic_1.dat"].add({"run.nml": {}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].add({"/out/run": {}})
+        try:
+            chain = JobChain()
+            chain.add("ic", "ic.SLURM", record=simlog.ics["ic_1.dat"])
+            chain.add("ramses", "run.SLURM", record=simlog.ics["ic_1.dat"].sims["run.nml"], object_rec="/out/run")
+            chain.add("images", "images.SLURM", array="0-3")
+            chain.add("other", "other.SLURM", after=[])
+            assert chain.submit() == {"ic": "1001", "ramses": "1002", "images": "1003", "other": "1004"}
+        finally:
+            os.environ["PATH"] = path
+
+        with open(os.path.join(self.directory, "calls"), "r") as f:
+            assert f.read().splitlines() == ["--parsable ic.SLURM", "--parsable --dependency=afterok:1001 run.SLURM",
+                                             "--parsable --dependency=afterok:1002 --array=0-3 images.SLURM",
+                                             "--parsable other.SLURM"]
+        output = SimulationLog(self.path, backend="json").ics["ic_1.dat"].sims["run.nml"].raw["outputs"]["/out/run"]
+        entry = list(output["action_log"].values())[-1]
+        assert entry["act"] == "SLURM-RUN" and entry["job_id"] == "1002" and entry["dependency"] == "afterok:1001"
+        assert entry["stage"] == "ramses" and output["meta"]["job_id"] == "1002"
+
+    def test_job_status(self):
+        """tests that the job states are fetched in a single squeue / sacct call, cached and written to the log."""
+        from PyHPC.PyHPC_System.job_status import JobStatusPoller, record_submission, recorded_jobs, sync_job_states
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        # - Fake squeue / sacct which record their arguments -#
+        for command, output in [("squeue", "2001|RUNNING\\n2003_[1-2]|PENDING"),
+                                ("sacct", "2002|COMPLETED\\n2002.batch|COMPLETED")]:
+            with open(os.path.join(self.directory, command), "w") as f:
+                f.write("#!/bin/sh\necho \"$0 $@\" >> %s/calls\nprintf '%s\\n'\n" % (self.directory, output))
+            os.chmod(os.path.join(self.directory, command), 0o755)
+        path = os.environ["PATH"]
+        os.environ["PATH"] = "%s%s%s" % (self.directory, os.pathsep, path)
+
+        simlog = SimulationLog(self.path, backend="json")
+        simlog.ics["ic_1.dat"].add({"run.nml": {}})
+        simrec = simlog.ics["ic_1.dat"].sims["run.nml"]
+        simrec.add({"/out/a": {}, "/out/b": {}})
+        for job_id, output in [("2001", "/out/a"), ("2002", "/out/b"), ("2003_1", None)]:
+            record_submission(simrec, job_id, "ramses", object_rec=output)
+        try:
+            poller = JobStatusPoller(ttl=3600)
+            assert sync_job_states(simlog, poller) == {("ic_1.dat", "run.nml", "/out/a"): (None, "RUNNING"),
+                                                       ("ic_1.dat", "run.nml", "/out/b"): (None, "COMPLETED"),
+                                                       ("ic_1.dat", "run.nml", None): (None, "PENDING")}
+            assert sync_job_states(simlog, poller) == {}  # -> cached.
+
+            # - Imaging the completed run doesn't replace the state of its RAMSES job -#
+            record_submission(simrec, "2004", "image", object_rec="/out/b")
+            assert recorded_jobs(simlog)[("ic_1.dat", "run.nml", "/out/b")] == "2002"
+            assert sync_job_states(simlog, JobStatusPoller(ttl=0)) == {}  # -> 2002 has completed, 2004 isn't tracked.
+        finally:
+            os.environ["PATH"] = path
+
+        with open(os.path.join(self.directory, "calls"), "r") as f:
+            calls = [call.split(" ", 1)[1] for call in f.read().splitlines()]
+        assert calls == ["--noheader --array --format=%i|%T --jobs=2003_1,2001,2002",
+                         "--parsable2 --noheader --allocations --format=JobID,State --jobs=2002",
+                         "--noheader --array --format=%i|%T --jobs=2003_1,2001"]
+
+        reloaded = SimulationLog(self.path, backend="json").ics["ic_1.dat"].sims["run.nml"]
+        assert reloaded.raw["outputs"]["/out/b"]["meta"]["job_state"] == "COMPLETED"
+        assert reloaded.raw["meta"]["job_id"] == "2003_1" and reloaded.raw["meta"]["job_state"] == "PENDING"
+        assert list(reloaded.raw["outputs"]["/out/a"]["action_log"].values())[-1]["act"] == "SLURM-STATE"
+
+    def test_software_registry(self):
+        """tests that the software handlers match the legacy ``ic_exec`` strings and that plugins can be registered."""
+        import toml
+        from PyHPC.PyHPC_System import software
+
+        settings = toml.load(os.path.join(pt.Path(__file__).parents[1], "PyHPC", "bin", "inst", "cnfg",
+                                          "install_RAMSES.config"))
+        legacy = software.compile_ic_exec("R-DICE", "settings['INIT_PARAMS']['initfile(1)']['v'] = \"'%s'\"%str("
+                                                    "pt.Path(ic_file).parents[0]); settings['DICE_PARAMS']['ic_file']["
+                                                    "'v'] = \"'%s'\"%str(pt.Path(ic_file).name)")
+        expected = json.loads(json.dumps(settings))
+        legacy(expected, "/ics/ic_1.dat")
+        expected["MOND_PARAMS"]["enabled"]["v"], expected["DICE_PARAMS"]["enabled"]["v"] = False, True
+
+        rdice = software.get_ramses_software("R-DICE")
+        assert rdice.apply(settings, "/ics/ic_1.dat") == expected and rdice.validate(settings) == []
+        assert software.get_ramses_software("R-DICE") is rdice and ".dat" in software.extensions("initial_conditions")
+        with pytest.raises(software.PyHPC_Error):
+            software.get_ramses_software("not-a-software")
+
+        try:
+            ryq = software.register_ramses_software(software.RamsesSoftware(
+                "RyQ", header_control={"NOT_A_HEADER": True}, array_template=("bin", "not_a_template")))
+            assert software.validate_registry(settings) == {
+                "RyQ": ["The template %s of RyQ doesn't exist." % ryq.array_template,
+                        "The header NOT_A_HEADER controlled by RyQ can't be enabled."]}
+        finally:
+            software.ramses_software().pop("RyQ", None)
+
+    def test_child_cache(self):
+        """tests that wrapper objects are reused until their entry changes."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="json")
+        ic = simlog.ics["ic_1.dat"]
+        assert simlog.ics["ic_1.dat"] is ic
+
+        ic.add({"run.nml": {"information": "test"}})
+        assert simlog.get_simulation_records()["run.nml"] is ic.sims["run.nml"]
+
+        simlog["ic_1.dat"] = {**ic.raw}
+        assert simlog.ics["ic_1.dat"] is not ic
+        assert "run.nml" in simlog.get_simulation_records()
+
+    def test_search(self):
+        """tests indexed and un-indexed searches with equality, membership and range predicates."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="json")
+        ic = simlog.ics["ic_1.dat"]
+        ic.add({"a.nml": {"information": "a", "meta": {"software": "RAMSES", "dateCreated": "01-01-2023_00-00-00"}},
+                "b.nml": {"information": "b", "meta": {"software": "GADGET", "dateCreated": "06-01-2023_00-00-00"}}})
+
+        assert [s.name for s in simlog.search({"meta.software": "RAMSES"})] == ["a.nml"]
+        assert len(simlog.search({"meta.software": ["RAMSES", "GADGET"]})) == 2
+        assert [s.name for s in simlog.search({"meta.dateCreated": ("03-01-2023_00-00-00", None)})] == ["b.nml"]
+        assert [s.name for s in simlog.search({"information": "b"})] == ["b.nml"]
+        assert [i.name for i in simlog.search({"meta.software": "GADGET"}, return_by="ic")] == ["ic_1.dat"]
+
+        # - The indexes follow edits -#
+        ic.sims["a.nml"][["meta", "software"]] = "GADGET"
+        assert len(simlog.search({"meta.software": "GADGET"})) == 2
+        del ic["b.nml"]
+        assert [s.name for s in simlog.search({"meta.software": "GADGET"})] == ["a.nml"]
+
+    def test_columnar_log(self):
+        """tests that the columnar projection of the log is updated incrementally as entries change."""
+        from PyHPC.PyHPC_System import simulation_tables
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="json")
+        ic = simlog.ics["ic_1.dat"]
+        ic.add({"a.nml": {}, "b.nml": {}})
+        ic.sims["a.nml"][["meta", "software"]] = "RAMSES"
+        ic.sims["b.nml"][["meta", "software"]] = "AREPO"
+        ic.sims["a.nml"].add({"out_a": {}})
+        ic.sims["a.nml"][["outputs", "out_a", "meta", "ncpu"]] = 64
+
+        sims = simlog.columns.children("ic_1.dat")
+        assert list(sims.index) == ["a.nml", "b.nml"] and list(sims["meta.software"]) == ["RAMSES", "AREPO"]
+        assert simlog.columns.frame("output").loc[("ic_1.dat", "a.nml", "out_a"), "meta.ncpu"] == 64
+
+        frames = simlog.columns._frames
+        ic.sims["b.nml"][["meta", "software"]] = "RAMSES"
+        del ic["a.nml"]
+        assert simlog.columns._frames is frames  # -> updated in place rather than rebuilt.
+        assert list(simlog.columns.children("ic_1.dat")["meta.software"]) == ["RAMSES"]
+        assert len(simlog.columns.frame("output")) == 0
+
+        if simulation_tables.pa is None:
+            with pytest.raises(simulation_tables.PyHPC_Error):
+                simlog.columns.to_parquet(self.directory)
+        else:
+            assert simlog.columns.to_arrow("sim").num_rows == 1
+
+    def test_reverse_index(self):
+        """tests that the simulation records are found by their .nml and output paths as entries change."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="json")
+        ic = simlog.ics["ic_1.dat"]
+        ic.add({"a.nml": {}})
+        ic.sims["a.nml"].add({"/out/a": {}})
+        assert simlog.find_by_nml("a.nml") is ic.sims["a.nml"] and simlog.find_by_output("/out/a").name == "a.nml"
+
+        ic.add({"b.nml": {}})
+        ic.sims["b.nml"].add({"/out/b": {}})
+        del ic.sims["a.nml"][["outputs", "/out/a"]]
+        assert simlog.find_by_output("/out/b").name == "b.nml" and simlog.find_by_output("/out/a") is None
+
+        del ic["b.nml"]
+        assert simlog.find_by_nml("b.nml") is None and simlog.find_by_output("/out/b") is None
+        assert simlog.find_by_nml("a.nml").parent.name == "ic_1.dat"
+
+    def test_batch(self):
+        """tests that batches write once on exit and roll back on an exception."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="journal")
+        with simlog.batch():
+            simlog.ics["ic_1.dat"].add({"run.nml": {"information": "test"}})
+            simlog.ics["ic_1.dat"].sims["run.nml"].log("Test message.", "TEST")
+            assert not os.path.exists(simlog.backend.journal_path)
+
+        with open(simlog.backend.journal_path, "r") as f:
+            assert len(f.readlines()) == 1
+        assert "run.nml" in SimulationLog(self.path, backend="journal").ics["ic_1.dat"].sims
+
+        try:
+            with simlog.transaction():
+                simlog.ics["ic_1.dat"].add({"other.nml": {"information": "test"}})
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert "other.nml" not in simlog.ics["ic_1.dat"].sims
+        assert "run.nml" in simlog.get_simulation_records()
+
+    def test_concurrent_writers(self):
+        """tests that two logs open on the same file merge each other's changes instead of overwriting them."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        for backend in ["json", "journal", "sqlite"]:
+            first, second = SimulationLog(self.path, backend=backend), SimulationLog(self.path, backend=backend)
+            first.ics["ic_1.dat"].add({"first_%s.nml" % backend: {"information": "first"}})
+            second.ics["ic_1.dat"].add({"second_%s.nml" % backend: {"information": "second"}})
+
+            sims = SimulationLog(self.path, backend=backend).ics["ic_1.dat"].sims
+            assert "first_%s.nml" % backend in sims and "second_%s.nml" % backend in sims
+            assert "first_%s.nml" % backend in second.ics["ic_1.dat"].sims
+
+    def test_concurrent_delete(self):
+        """tests that changes to a record deleted by another process are dropped rather than re-creating it."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        for backend in ["json", "journal", "sqlite"]:
+            with open(self.path, "w") as f:
+                json.dump(self.test_data["simlog"], f)
+            if os.path.exists(self.path + ".journal"):
+                os.remove(self.path + ".journal")  # -> left by the deletion of the journal backend.
+
+            first, second = SimulationLog(self.path, backend=backend), SimulationLog(self.path, backend=backend)
+            ic = first.ics["ic_1.dat"]
+            second.bulk_delete(["ic_1.dat"], remove_files=False)
+            with self.assertLogs("PyHPC.PyHPC_System.simulation_management", level="WARNING"):
+                ic.log("Test message.", "TEST")
+
+            assert "ic_1.dat" not in first.raw and "ic_1.dat" not in SimulationLog(self.path, backend=backend).raw
+
+    def test_bulk_add(self):
+        """tests that bulk additions are validated together and added all at once or not at all."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="json")
+        simlog.bulk_add({
+            "ic_2.dat"                          : {"information": "new"},
+            ("ic_2.dat", "run.nml")             : {"information": "new"},
+            **{("ic_2.dat", "run.nml", "output_%s" % i): {"information": "new"} for i in range(100)}
+        })
+        assert len(SimulationLog(self.path, backend="json").ics["ic_2.dat"].sims["run.nml"].outputs) == 100
+
+        with self.assertRaises(SyntaxError):
+            simlog.bulk_add({("ic_1.dat", "valid.nml"): {}, ("ic_1.dat", "invalid.nml"): {"information": 1}})
+        assert "valid.nml" not in simlog.ics["ic_1.dat"].sims
+
+    def test_bulk_delete(self):
+        """tests that bulk deletion accounts for the files in a dry run and removes the trees in a single write."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        nml, outputs = os.path.join(self.directory, "run.nml"), [os.path.join(self.directory, "out_%s" % i) for i in range(3)]
+        for output in outputs:
+            os.makedirs(os.path.join(output, "output_00001"))
+            for cpu in range(4):
+                with open(os.path.join(output, "output_00001", "amr_00001.out%05d" % cpu), "w") as f:
+                    f.write("data")
+        with open(nml, "w") as f:
+            f.write("&RUN_PARAMS\n/")
+
+        simlog = SimulationLog(self.path, backend="journal")
+        simlog.ics["ic_1.dat"].add({nml: {}})
+        simlog.ics["ic_1.dat"].sims[nml].add({output: {} for output in outputs})
+
+        report = simlog.bulk_delete([("ic_1.dat", nml), ("ic_1.dat", nml, outputs[0])], dry_run=True)
+        assert (report.files, report.directories, report.bytes) == (13, 6, 12 * 4 + 13)
+        assert all(os.path.exists(output) for output in outputs) and nml in simlog.ics["ic_1.dat"].sims
+
+        os.remove(self.path + ".journal")
+        simlog.save()
+        report = simlog.bulk_delete([("ic_1.dat", nml), ("ic_1.dat", nml, outputs[0])], max_workers=2)
+        assert report.files == 13 and not len(report.errors)
+        assert not any(os.path.exists(path) for path in outputs + [nml])
+        with open(self.path + ".journal") as journal:
+            assert len(journal.readlines()) == 1
+        assert nml not in SimulationLog(self.path, backend="journal").ics["ic_1.dat"].sims
+
+    def test_log_caller(self):
+        """tests that log entries record the caller of ``SimRec.log`` at both levels."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="json")
+        simlog.ics["ic_1.dat"].add({"run.nml": {}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].log("Test message.", "TEST")
+
+        for entry in [*simlog.ics["ic_1.dat"].raw["action_log"].values(),
+                      *simlog.ics["ic_1.dat"].sims["run.nml"].raw["action_log"].values()]:
+            assert entry["file"] == __file__
+
+    def test_action_log_archive(self):
+        """tests that action log keys are unique and that old entries are archived past the limit."""
+        from PyHPC.PyHPC_System import simulation_management
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        settings = simulation_management.CONFIG["System"]["SimulationLog"]
+        limit, settings["action_log_limit"] = settings["action_log_limit"], 3
+        try:
+            simlog = SimulationLog(self.path, backend="json")
+            for i in range(10):
+                simlog.ics["ic_1.dat"].log("Message %s." % i, "TEST")
+        finally:
+            settings["action_log_limit"] = limit
+
+        ic = SimulationLog(self.path, backend="json").ics["ic_1.dat"]
+        assert len(ic.raw["action_log"]) == 3
+        assert [entry["msg"] for entry in ic.get_action_log().values()] == ["Message %s." % i for i in range(10)]
+
+    def test_lazy_loading(self):
+        """tests that lazily loaded logs only parse the initial conditions which are accessed."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        simlog = SimulationLog(self.path, backend="journal", lazy=True)
+        assert "ic_1.dat" in simlog.ics and simlog.raw.loaded == []
+
+        simlog.bulk_add({"ic_%s.dat" % i: {"information": "new"} for i in range(2, 6)})
+        simlog.ics["ic_1.dat"].log("Test message.", "TEST")
+
+        simlog = SimulationLog(self.path, backend="journal", lazy=True)
+        assert len(simlog.ics) == 5 and len(simlog.raw.loaded) == 4  # -> the journal re-added ic_2 to ic_5.
+        assert len(simlog.ics["ic_1.dat"].raw["action_log"]) == 1
+
+        simlog.save()
+        simlog = SimulationLog(self.path, backend="json", lazy=True)
+        assert simlog.raw.loaded == [] and simlog.ics["ic_3.dat"].raw["information"] == "new"
+        assert simlog.raw.loaded == ["ic_3.dat"]
+
+    def test_serialization(self):
+        """tests that large arrays are stored in sidecars and that the format of the log is detected on load."""
+        import numpy as np
+        from PyHPC.PyHPC_System import simulation_storage
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        settings = simulation_storage.CONFIG["System"]["SimulationLog"]
+        threshold, settings["array_sidecar_threshold"] = settings["array_sidecar_threshold"], 100
+        try:
+            simlog = SimulationLog(self.path, backend="journal")
+            simlog.raw["ic_1.dat"]["core"] = {"masses": np.arange(1000.0), "center": np.array([0.5, 0.5, 0.5])}
+            simlog.save()
+        finally:
+            settings["array_sidecar_threshold"] = threshold
+
+        assert len(os.listdir(self.path + ".arrays")) == 1
+        core = SimulationLog(self.path, backend="json", lazy=True).ics["ic_1.dat"].raw["core"]
+        assert isinstance(core["masses"], simulation_storage.SidecarArray) and core["masses"].sum() == 499500.0
+        assert core["center"] == [0.5, 0.5, 0.5]
+
+        if simulation_storage.msgpack is None:
+            with pytest.raises(simulation_storage.PyHPC_Error):
+                simulation_storage.get_serializer("msgpack")
+        else:
+            SimulationLog(self.path, backend=simulation_storage.JSONBackend(self.path, serializer="msgpack")).save()
+            assert simulation_storage.detect_serializer(open(self.path, "rb").read(4)) == "msgpack"
+            assert SimulationLog(self.path, backend="json").ics["ic_1.dat"].raw["core"]["masses"].sum() == 499500.0
+
+    def test_snapshot_index(self):
+        """tests that the snapshot index only lists output directories which have changed."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        output = os.path.join(self.directory, "run")
+        for name in ["output_00001", "output_00002", "not_a_snapshot"]:
+            os.makedirs(os.path.join(output, name))
+        os.utime(output, ns=(1, 1))
+
+        simlog = SimulationLog(self.path, backend="json")
+        simlog.ics["ic_1.dat"].add({"run.nml": {}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].add({output: {}})
+        assert simlog.ics["ic_1.dat"].sims["run.nml"].get_snapshots() == {output: ["output_00001", "output_00002"]}
+
+        os.makedirs(os.path.join(output, "output_00003"))
+        os.utime(output, ns=(1, 1))  # -> unchanged mtime, so the stored index is used.
+        assert SimulationLog(self.path, backend="json").snapshots.refresh([output]) == []
+
+        os.utime(output, ns=(2, 2))
+        index = SimulationLog(self.path, backend="json").snapshots
+        assert index.refresh([output, os.path.join(self.directory, "missing")]) == [
+            output, os.path.join(self.directory, "missing")]
+        assert index.count(output) == 3 and not index.exists(os.path.join(self.directory, "missing"))
+
+    def test_disk_usage(self):
+        """tests that disk usage is rolled up from the output directories and only re-listed where it changed."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        outputs = [os.path.join(self.directory, "out_%s" % i) for i in range(2)]
+        for output in outputs:
+            os.makedirs(os.path.join(output, "output_00001"))
+            with open(os.path.join(output, "output_00001", "amr_00001.out00001"), "w") as f:
+                f.write("x" * 100)
+
+        simlog = SimulationLog(self.path, backend="json")
+        simlog.ics["ic_1.dat"].add({"run.nml": {}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].add({output: {} for output in outputs})
+        assert simlog.ics["ic_1.dat"].sims["run.nml"].get_disk_usage() == {output: (100, 3) for output in outputs}
+
+        with open(os.path.join(outputs[0], "output_00001", "hydro_00001.out00001"), "w") as f:
+            f.write("x" * 50)
+        simlog = SimulationLog(self.path, backend="json")
+        assert simlog.ics["ic_1.dat"].get_disk_usage(refresh=False) == {"run.nml": (200, 6)}
+        assert simlog.get_disk_usage() == {"ic_1.dat": (250, 7)}
+
+        shutil.rmtree(outputs[1])
+        assert simlog.disk_usage.refresh(outputs) == [outputs[1]]
+        assert simlog.ics["ic_1.dat"].get_disk_usage(refresh=False) == {"run.nml": (150, 4)}
+
+    def test_snapshot_catalog(self):
+        """tests that RAMSES snapshot metadata is read from the info file and file headers and can be queried."""
+        from PyHPC.PyHPC_System.simulation_management import SimulationLog
+
+        output = os.path.join(self.directory, "run")
+        os.makedirs(output)
+        os.symlink(os.path.join(pt.Path(__file__).parents[0], "test_core", "output_00001"),
+                   os.path.join(output, "output_00001"))
+
+        simlog = SimulationLog(self.path, backend="json")
+        simlog.ics["ic_1.dat"].add({"run.nml": {}})
+        simlog.ics["ic_1.dat"].sims["run.nml"].add({output: {}})
+
+        record = simlog.ics["ic_1.dat"].sims["run.nml"].get_catalog(output)["output_00001"]
+        assert record["info"]["ncpu"] == 24 and record["info"]["levelmax"] == 14
+        assert record["files"]["part"]["count"] == 24 and record["part"]["npart"] == 100000
+
+        index = SimulationLog(self.path, backend="json").snapshots  # -> served from the stored catalog.
+        assert index.select(output, time=(None, 1.0), levelmax=14) == ["output_00001"]
+        assert index.select(output, aexp=(2.0, None)) == []
+        assert index.closest(output, "time", 5.0) == "output_00001"